@@ -6,6 +6,7 @@ Adjust these values to control the scale and characteristics of the generated da
 """
 
 import os
+from pathlib import Path
 from datetime import datetime, timedelta
 from dotenv import load_dotenv
 
@@ -17,10 +18,10 @@ load_dotenv()
 # ======================
 
 # Number of users to generate (demo scale: 100)
-NUM_USERS = 100
+NUM_USERS = int(os.getenv('NUM_USERS', '100'))
 
 # Number of projects to generate (demo scale: 175)
-NUM_PROJECTS = 175
+NUM_PROJECTS = int(os.getenv('NUM_PROJECTS', '175'))
 
 # Tasks per project range
 MIN_TASKS_PER_PROJECT = 15
@@ -50,6 +51,9 @@ ORGANIZATION = {
     'domain': 'fintech'
 }
 
+# Email domain for generated users
+EMAIL_DOMAIN = 'aasnatech.com'
+
 # ======================
 # TEAM CONFIGURATION
 # ======================
@@ -82,14 +86,47 @@ TEAMS = [
 # DATE CONFIGURATION
 # ======================
 
+# "Today" for the simulation. Pin it (e.g. REFERENCE_DATE=2025-12-31T00:00:00)
+# to make repeated runs reproducible; defaults to the current time.
+REFERENCE_DATE = (
+    datetime.fromisoformat(os.environ['REFERENCE_DATE']) if os.getenv('REFERENCE_DATE')
+    else datetime.now().replace(microsecond=0)
+)
+
 # Historical data range (6 months back from today)
 DATE_RANGE_MONTHS = 6
-START_DATE = datetime.now() - timedelta(days=DATE_RANGE_MONTHS * 30)
-END_DATE = datetime.now()
+START_DATE = REFERENCE_DATE - timedelta(days=DATE_RANGE_MONTHS * 30)
+END_DATE = REFERENCE_DATE
 
 # Future due dates range (up to 3 months ahead)
 FUTURE_DATE_MONTHS = 3
-MAX_FUTURE_DATE = datetime.now() + timedelta(days=FUTURE_DATE_MONTHS * 30)
+MAX_FUTURE_DATE = REFERENCE_DATE + timedelta(days=FUTURE_DATE_MONTHS * 30)
+
+# Working week for generated dates (NumPy busday weekmask, Monday first)
+# and fixed-date holidays (MM-DD) observed every year; date_utils moves
+# task, subtask and comment dates onto the remaining business days
+BUSINESS_WEEKMASK = '1111100'
+HOLIDAYS = ['01-01', '07-04', '12-24', '12-25', '12-31']
+
+# Same range as YYYY-MM-DD strings (used by date_utils defaults)
+SIMULATION_START_DATE = START_DATE.strftime('%Y-%m-%d')
+SIMULATION_END_DATE = END_DATE.strftime('%Y-%m-%d')
+
+
+def set_reference_date(reference: datetime):
+    """
+    Re-derive the date range from another "today" (main.py --resume uses
+    this to continue a run whose REFERENCE_DATE wasn't pinned).
+    """
+    global REFERENCE_DATE, START_DATE, END_DATE, MAX_FUTURE_DATE, SIMULATION_START_DATE, SIMULATION_END_DATE
+    REFERENCE_DATE = reference
+    START_DATE = REFERENCE_DATE - timedelta(days=DATE_RANGE_MONTHS * 30)
+    END_DATE = REFERENCE_DATE
+    MAX_FUTURE_DATE = REFERENCE_DATE + timedelta(days=FUTURE_DATE_MONTHS * 30)
+    SIMULATION_START_DATE = START_DATE.strftime('%Y-%m-%d')
+    SIMULATION_END_DATE = END_DATE.strftime('%Y-%m-%d')
+    # Spawn-started workers re-import this module
+    os.environ['REFERENCE_DATE'] = REFERENCE_DATE.isoformat()
 
 # ======================
 # TASK DISTRIBUTION
@@ -151,9 +188,43 @@ JOB_TITLES = {
 # ======================
 
 GROQ_API_KEY = os.getenv('GROQ_API_KEY', '')
+# Point the Groq clients elsewhere, e.g. the local mock server (src/utils/mock_llm_server.py)
+GROQ_BASE_URL = os.getenv('GROQ_BASE_URL') or None
 LLM_MODEL = os.getenv('LLM_MODEL', 'llama-3.1-70b-versatile')
+# Off by default: generation uses the deterministic template fallback unless opted in
+ENABLE_LLM = os.getenv('ENABLE_LLM', 'false').lower() == 'true'
+LLM_MAX_TOKENS = int(os.getenv('LLM_MAX_TOKENS', '150'))
+LLM_TEMPERATURE = float(os.getenv('LLM_TEMPERATURE', '0.7'))
+
+# List items (task names, descriptions) asked for per request; a stage's
+# requests are sent concurrently
+LLM_ITEMS_PER_REQUEST = int(os.getenv('LLM_ITEMS_PER_REQUEST', '10'))
+
+# Rate limiting: token buckets shared by all in-flight requests of a
+# process. Each --workers process has its own, so the provider sees up to
+# NUM_WORKERS times these; divide them by the worker count to stay within
+# an account-wide limit.
+# API_CALL_DELAY (seconds between calls) is still honoured as the default
+# request rate for older .env files.
 API_CALL_DELAY = float(os.getenv('API_CALL_DELAY', '0.5'))
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', '8'))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv('LLM_REQUESTS_PER_MINUTE', str(60 / API_CALL_DELAY)))
+LLM_TOKENS_PER_MINUTE = float(os.getenv('LLM_TOKENS_PER_MINUTE', '30000'))
+
+# Persistent response cache (see src/utils/llm_cache.py), only consulted
+# with ENABLE_LLM on: offline text never depends on it. Set
+# LLM_CACHE_READ_ONLY=true in CI to serve recorded responses without writing.
+LLM_CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', 'true').lower() == 'true'
+LLM_CACHE_PATH = os.getenv('LLM_CACHE_PATH', str(Path(__file__).resolve().parent / 'output' / 'llm_cache.sqlite'))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '500000'))
+LLM_CACHE_READ_ONLY = os.getenv('LLM_CACHE_READ_ONLY', 'false').lower() == 'true'
+
+# Retries per request (with exponential backoff starting at LLM_RETRY_BACKOFF seconds)
 MAX_RETRIES = int(os.getenv('MAX_RETRIES', '3'))
+LLM_RETRY_BACKOFF = float(os.getenv('LLM_RETRY_BACKOFF', '1.0'))
+
+# Seconds between checks for edited prompt files (see PromptLoader)
+PROMPT_RELOAD_INTERVAL = float(os.getenv('PROMPT_RELOAD_INTERVAL', '2.0'))
 
 # Temperature settings for different content types
 LLM_TEMPERATURES = {
@@ -167,7 +238,73 @@ LLM_TEMPERATURES = {
 # DATABASE CONFIGURATION
 # ======================
 
+BASE_DIR = Path(__file__).resolve().parent
+
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'output/asana_simulation.sqlite')
+DB_PATH = BASE_DIR / DATABASE_PATH
+SCHEMA_PATH = BASE_DIR / 'schema.sql'
+
+# Per-team shard files written by `main.py --shard TEAM_ID`
+SHARD_DIR = BASE_DIR / 'output' / 'shards'
+
+# Alias tables built from data/first_names.csv and last_names.csv (see
+# src/utils/name_generator.py), rebuilt whenever the CSVs change
+NAME_CACHE_PATH = BASE_DIR / 'output' / 'name_tables.npz'
+
+# Primary key format (see src/utils/ids.py): 'uuid4' (random, the default),
+# 'uuid7' (time-ordered, better insert locality) or 'prefixed' (task_00000042)
+ID_STRATEGY = os.getenv('ID_STRATEGY', 'uuid4')
+
+# Cold-start budget for `main.py --import-profile`: it exits non-zero when
+# importing src.main (best of 3 fresh interpreters) takes longer than this
+STARTUP_BUDGET_MS = float(os.getenv('STARTUP_BUDGET_MS', '400'))
+
+# Rows per executemany call in DatabaseManager.insert_many
+DB_BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', '50000'))
+
+# Per-stage performance report (see src/utils/metrics.py). tracemalloc
+# peaks roughly double generation time, so they are opt-in; the RSS
+# high-water mark is always recorded.
+REPORT_PATH = BASE_DIR / 'output' / 'generation_report.json'
+REPORT_TRACE_MEMORY = os.getenv('REPORT_TRACE_MEMORY', 'false').lower() == 'true'
+
+# `main.py --conformance` (see src/utils/conformance.py): observed shares
+# must lie within CONFORMANCE_TOLERANCE plus CONFORMANCE_Z standard errors
+# of their config targets; tables are streamed CONFORMANCE_CHUNK_ROWS at a time
+CONFORMANCE_REPORT_PATH = BASE_DIR / 'output' / 'conformance_report.json'
+CONFORMANCE_TOLERANCE = float(os.getenv('CONFORMANCE_TOLERANCE', '0.02'))
+CONFORMANCE_Z = float(os.getenv('CONFORMANCE_Z', '4'))
+CONFORMANCE_CHUNK_ROWS = int(os.getenv('CONFORMANCE_CHUNK_ROWS', '100000'))
+
+# Snapshots of finished stages, reused by later runs whose inputs for that
+# stage are unchanged (see src/utils/stage_cache.py)
+STAGE_CACHE_ENABLED = os.getenv('STAGE_CACHE_ENABLED', 'true').lower() == 'true'
+STAGE_CACHE_DIR = Path(os.getenv('STAGE_CACHE_DIR', str(BASE_DIR / 'output' / 'stage_cache')))
+STAGE_CACHE_KEEP = int(os.getenv('STAGE_CACHE_KEEP', '2'))  # snapshots kept per stage
+
+# Inline checks on every batch the background writer receives (see
+# src/utils/stream_validation.py): 'fail' stops at the first bad batch,
+# 'repair' fixes or drops bad rows, 'off' leaves it to validate_database.
+# Foreign-key tables above the exact limit are held as Bloom filters.
+STREAM_VALIDATION = os.getenv('STREAM_VALIDATION', 'fail')
+STREAM_VALIDATION_EXACT_LIMIT = int(os.getenv('STREAM_VALIDATION_EXACT_LIMIT', '1000000'))
+STREAM_VALIDATION_BLOOM_ERROR = float(os.getenv('STREAM_VALIDATION_BLOOM_ERROR', '0.001'))
+
+# Row batches the background writer may hold before producers block; with
+# per-project batches this bounds memory regardless of total scale
+WRITER_QUEUE_SIZE = int(os.getenv('WRITER_QUEUE_SIZE', '16'))
+
+# SQLite settings applied while generating, restored afterwards.
+# Durability is traded for speed: a failed stage rolls back cleanly and
+# `main.py --resume` continues from the last checkpoint, but without syncs
+# an OS crash or power loss mid-commit can leave the file corrupt. WAL lets
+# the background writer's connection commit while the main one is reading.
+DB_LOAD_PROFILE = {
+    'journal_mode': 'WAL',
+    'synchronous': 'OFF',
+    'cache_size': -262144,  # negative = KiB, i.e. 256 MB
+    'temp_store': 'MEMORY'
+}
 
 # ======================
 # MISC SETTINGS
@@ -176,6 +313,10 @@ DATABASE_PATH = os.getenv('DATABASE_PATH', 'output/asana_simulation.sqlite')
 DEBUG_MODE = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
 RANDOM_SEED = int(os.getenv('RANDOM_SEED', '42'))
 
+# Worker processes for per-project stages (tasks, subtasks, comments).
+# Output is identical for any value; see src/utils/parallel.py.
+NUM_WORKERS = int(os.getenv('NUM_WORKERS', '1'))
+
 # Colors for projects (Asana palette)
 PROJECT_COLORS = [
     'dark-pink', 'dark-green', 'dark-blue', 'dark-red', 'dark-teal',
@@ -0,0 +1,196 @@
+"""
+LLM throughput benchmark against the local mock server.
+
+Runs the per-project workers of the task (names and descriptions),
+subtask and comment stages exactly as generation does, on synthetic
+projects, with the mock Groq server (src/utils/mock_llm_server.py)
+standing in for the provider. Requests therefore take the real path:
+LLM_MAX_CONCURRENCY in-flight slots, the requests/tokens-per-minute
+buckets and retries honouring retry-after. Reports requests/s, p50/p99
+latency and wall time per stage for each --concurrency setting.
+
+Task, subtask and comment counts follow the config ranges.
+
+Usage:
+    python src/benchmark_llm.py --projects 30 --workers 4
+    python src/benchmark_llm.py --concurrency 1 4 8 16 --latency-ms 400 --rate-limit-rate 0.05
+    python src/benchmark_llm.py --requests-per-minute 600 --tokens-per-minute 200000
+    python src/benchmark_llm.py --cache output/bench_cache.sqlite   # run twice to see hits
+(with --cache, later --concurrency settings are served what earlier ones recorded)
+"""
+
+import os
+import sys
+import argparse
+import time
+from pathlib import Path
+
+# Add project root to path
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from loguru import logger
+
+import config
+from src.utils.llm_utils import reset_llm_client
+from src.utils.mock_llm_server import add_server_arguments, server_from_args
+from src.utils.parallel import map_shards
+from src.generators.comments import _generate_project_comments
+from src.generators.subtasks import _generate_project_subtasks
+from src.generators.tasks import TASK_PROMPTS, _generate_project_tasks
+
+TEAM_TYPES = list(TASK_PROMPTS)
+PROJECT_TYPES = list(config.COMPLETION_RATES)
+
+
+def synthetic_projects(count: int):
+    """Project dicts shaped like ProjectGenerator's, cycling through team and project types."""
+    return [
+        {
+            'index': i,
+            'project_id': f"bench_project_{i}",
+            'team_type': TEAM_TYPES[i % len(TEAM_TYPES)],
+            'name': f"Benchmark Project {i}",
+            'project_type': PROJECT_TYPES[i % len(PROJECT_TYPES)],
+            'created_at': config.START_DATE.isoformat(timespec='seconds'),
+            'section_ids': [f"bench_section_{i}_{j}" for j in range(3)],
+        }
+        for i in range(count)
+    ]
+
+
+def stage_context(users_per_team: int = 10):
+    """worker_context() of the generation stages, with synthetic users."""
+    return {
+        'now': config.END_DATE.isoformat(timespec='seconds'),
+        'users_by_department': {
+            team_type: [f"bench_{team_type}_{i}" for i in range(users_per_team)] for team_type in TEAM_TYPES
+        },
+    }
+
+
+def set_llm_limits(**limits):
+    """Apply LLM_* limit settings to this process and workers started after it."""
+    for name, value in limits.items():
+        setattr(config, name, value)
+        os.environ[name] = str(value)
+    # The next ContentGenerator builds a client with the new limits
+    reset_llm_client()
+
+
+def use_mock_endpoint(url: str, cache_path: str = None):
+    """
+    Point this process (and forked workers) at the mock server.
+
+    Config is patched in place and mirrored to the environment for
+    spawn-started workers. A dummy key is used so a real GROQ_API_KEY
+    from .env is never sent anywhere.
+    """
+    overrides = {
+        'ENABLE_LLM': True,
+        'GROQ_BASE_URL': url,
+        'GROQ_API_KEY': 'mock-key',
+        'LLM_CACHE_ENABLED': cache_path is not None,
+    }
+    if cache_path is not None:
+        overrides['LLM_CACHE_PATH'] = cache_path
+
+    for name, value in overrides.items():
+        setattr(config, name, value)
+        os.environ[name] = str(value).lower() if isinstance(value, bool) else str(value)
+
+
+def run_stage(server, name, func, jobs, workers, concurrency):
+    """Run one stage's worker over jobs and return (results, report row)."""
+    server.reset_stats()
+    started = time.perf_counter()
+    results = list(map_shards(func, jobs, workers, stage_context()))
+    wall = time.perf_counter() - started
+
+    stats = server.stats()
+    errors = sum(count for status, count in stats['statuses'].items() if status != 200)
+    return results, {
+        'concurrency': concurrency,
+        'stage': name,
+        'items': sum(len(result) for result in results),
+        'requests': stats['requests'],
+        'errors': errors,
+        'req_per_s': stats['requests'] / wall if wall else 0.0,
+        'p50_ms': stats['p50_ms'],
+        'p99_ms': stats['p99_ms'],
+        'wall_s': wall,
+    }
+
+
+def run_setting(server, projects, workers, concurrency):
+    """Run the task, subtask and comment stages at one concurrency; returns their report rows."""
+    set_llm_limits(LLM_MAX_CONCURRENCY=concurrency)
+    tasks, tasks_row = run_stage(server, "tasks", _generate_project_tasks, projects, workers, concurrency)
+    # Later stages take each project's tasks as iter_task_batches yields them
+    batches = [{'project': project, 'columns': batch} for project, batch in zip(projects, tasks)]
+    _, subtasks_row = run_stage(server, "subtasks", _generate_project_subtasks, batches, workers, concurrency)
+    _, comments_row = run_stage(server, "comments", _generate_project_comments, batches, workers, concurrency)
+    return [tasks_row, subtasks_row, comments_row]
+
+
+def print_report(rows, walls):
+    logger.info("=" * 96)
+    logger.info(
+        f"{'concurrency':>11} {'stage':10} {'items':>7} {'requests':>9} {'errors':>7} "
+        f"{'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'wall s':>8}"
+    )
+    logger.info("-" * 96)
+    for row in rows:
+        logger.info(
+            f"{row['concurrency']:>11} {row['stage']:10} {row['items']:>7,} {row['requests']:>9,} "
+            f"{row['errors']:>7,} {row['req_per_s']:>8.1f} {row['p50_ms']:>8.1f} {row['p99_ms']:>8.1f} "
+            f"{row['wall_s']:>8.2f}"
+        )
+    logger.info("-" * 96)
+    for concurrency, wall in walls.items():
+        logger.info(f"Total wall time at concurrency {concurrency}: {wall:.2f}s")
+    logger.info("=" * 96)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the LLM path against a local mock server.")
+    parser.add_argument('--projects', type=int, default=12)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[config.LLM_MAX_CONCURRENCY],
+                        help="LLM_MAX_CONCURRENCY settings to sweep (per worker process)")
+    parser.add_argument('--requests-per-minute', type=float, default=config.LLM_REQUESTS_PER_MINUTE,
+                        help="LLM_REQUESTS_PER_MINUTE bucket (per worker process)")
+    parser.add_argument('--tokens-per-minute', type=float, default=config.LLM_TOKENS_PER_MINUTE,
+                        help="LLM_TOKENS_PER_MINUTE bucket (per worker process)")
+    parser.add_argument('--workers', type=int, default=config.NUM_WORKERS,
+                        help="Processes issuing requests, as in the generation stages")
+    parser.add_argument('--cache', metavar='PATH',
+                        help="Use an LLM response cache at PATH (default: caching off)")
+    add_server_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    projects = synthetic_projects(args.projects)
+    rows, walls = [], {}
+    with server_from_args(args) as server:
+        use_mock_endpoint(server.url, args.cache)
+        set_llm_limits(
+            LLM_REQUESTS_PER_MINUTE=args.requests_per_minute, LLM_TOKENS_PER_MINUTE=args.tokens_per_minute
+        )
+        logger.info(
+            f"Benchmarking {args.projects} projects with {args.workers} worker(s) at concurrency "
+            f"{', '.join(map(str, args.concurrency))} against {server.url}"
+        )
+
+        for concurrency in args.concurrency:
+            started = time.perf_counter()
+            rows += run_setting(server, projects, args.workers, concurrency)
+            walls[concurrency] = time.perf_counter() - started
+
+    print_report(rows, walls)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,40 +1,94 @@
-import uuid
-import random
-from datetime import datetime
-from utils.db_utils import get_db_connection
-from utils.llm_utils import ContentGenerator
+import logging
+
+import numpy as np
+
+import config
+from src.generators.tasks import assignee_pool, uuid4_strings
+from src.models.batch import CommentBatch
+from src.utils import ContentGenerator
+from src.utils.date_utils import sample_business_timestamps
+from src.utils.ids import get_id_allocator
+from src.utils.parallel import derive_random, derive_rng, map_shards, worker_context, worker_pool
+
+logger = logging.getLogger(__name__)
+
+COMMENT_COLUMNS = CommentBatch.COLUMNS
+
+# Share of comments written by the task's assignee (the rest come from teammates)
+ASSIGNEE_COMMENT_SHARE = 0.6
+
+
+def _generate_project_comments(batch):
+    """Worker: draw the comment threads for one project's tasks."""
+    project, tasks = batch['project'], batch['columns']
+    rng = derive_rng("comments", project['index'])
+    llm = ContentGenerator(rng=derive_random("comments-text", project['index']))
+    now = np.datetime64(worker_context()['now'], 's')
+
+    pool = np.asarray(assignee_pool(project['team_type'], worker_context()['users_by_department']), dtype=object)
+    if not len(pool):
+        return []
+
+    n = len(tasks['task_id'])
+    has_comments = rng.random(n) < config.COMMENT_PROBABILITY
+    counts = np.where(
+        has_comments,
+        rng.integers(max(config.MIN_COMMENTS_PER_TASK, 1), config.MAX_COMMENTS_PER_TASK + 1, n),
+        0
+    )
+    parent = np.repeat(np.arange(n), counts)
+    m = len(parent)
+    if m == 0:
+        return []
+
+    # Comments land between task creation and completion (or now)
+    task_created = tasks['created_at'][parent]
+    window_end = np.where(tasks['completed'][parent], tasks['completed_at'][parent], now)
+    created = sample_business_timestamps(rng, task_created, window_end)
+
+    authors = pool[rng.integers(0, len(pool), m)]
+    task_assignees = tasks['assignee_id'][parent]
+    by_assignee = (rng.random(m) < ASSIGNEE_COMMENT_SHARE) & (task_assignees != None)  # noqa: E711
+    authors[by_assignee] = task_assignees[by_assignee]
+
+    names = tasks['name'][parent]
+    contents = llm.generate_comments(names.tolist(), tasks['completed'][parent])
+
+    return CommentBatch.from_columns(
+        comment_id=uuid4_strings(rng, m),
+        task_id=tasks['task_id'][parent],
+        author_id=authors,
+        content=contents,
+        created_at=created,
+    )
+
 
 class CommentGenerator:
-    def __init__(self):
-        self.conn = get_db_connection()
-        self.llm = ContentGenerator()
-
-    def generate(self):
-        cursor = self.conn.cursor()
-        print("Generating Comments...")
-
-        cursor.execute("SELECT task_id, assignee_id, created_at FROM tasks LIMIT 1000")
-        tasks = cursor.fetchall()
-
-        comments_data = []
-        
-        for task in tasks:
-            if random.random() > 0.7: # 30% chance of comment
-                comment_id = str(uuid.uuid4())
-                text = self.llm.generate_text("comments", {'context': 'update'})
-                
-                comments_data.append((
-                    comment_id,
-                    task['task_id'],
-                    task['assignee_id'], # Assigned user comments
-                    text,
-                    datetime.now()
-                ))
-
-        cursor.executemany("""
-            INSERT INTO comments (comment_id, task_id, user_id, text_content, created_at)
-            VALUES (?, ?, ?, ?, ?)
-        """, comments_data)
-        
-        self.conn.commit()
-        print(f"Generated {len(comments_data)} comments.")
\ No newline at end of file
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def generate_for_tasks(self, tasks, users, workers=None):
+        """
+        Generate comments for a COMMENT_PROBABILITY share of tasks.
+
+        Args:
+            tasks: Stream of task batches (see tasks.iter_task_batches)
+
+        Returns:
+            Number of comments written
+        """
+        workers = workers or config.NUM_WORKERS
+        context = {
+            'now': config.END_DATE.isoformat(timespec='seconds'),
+            'users_by_department': users.by_department(),
+        }
+
+        ids = get_id_allocator()
+        total = 0
+        # The pool forks before the writer thread starts
+        with worker_pool(workers, context) as pool, self.db.background_writer() as writer:
+            for batch in map_shards(_generate_project_comments, tasks, workers, context, pool=pool):
+                if len(batch):
+                    batch = batch.with_columns(comment_id=ids.allocate("comment", batch['comment_id']))
+                total += writer.write("comments", COMMENT_COLUMNS, batch)
+        return total
@@ -0,0 +1,97 @@
+"""
+Custom field generator.
+"""
+
+import json
+import logging
+
+import numpy as np
+
+from src.generators.tasks import uuid4_strings
+from src.models.batch import iso_strings
+from src.utils.ids import get_id_allocator
+from src.utils.parallel import derive_rng
+
+logger = logging.getLogger(__name__)
+
+# (name, field_type, enum options or number range) per team type
+FIELD_TEMPLATES = {
+    'product': [
+        ("Story Points", "number", (1, 13)),
+        ("Component", "enum", ["Frontend", "Backend", "Infrastructure", "Mobile", "Data"]),
+    ],
+    'marketing': [
+        ("Channel", "enum", ["Email", "Social", "Paid Search", "Events", "Content"]),
+        ("Budget", "number", (500, 25000)),
+    ],
+    'operations': [
+        ("Request Type", "enum", ["Access", "Procurement", "Finance", "HR", "Facilities"]),
+        ("SLA Hours", "number", (4, 72)),
+    ],
+}
+
+# Share of tasks that have a value set for each field
+FIELD_FILL_RATE = 0.7
+
+
+class CustomFieldGenerator:
+    """Generates custom field definitions per project and values per task."""
+
+    DEFINITION_COLUMNS = ("field_id", "project_id", "name", "field_type", "enum_options", "created_at")
+    VALUE_COLUMNS = ("value_id", "task_id", "field_id", "number_value", "enum_value", "created_at")
+
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def generate_for_projects(self, projects, tasks):
+        """
+        Define each project's custom fields and fill them in for its tasks.
+
+        Args:
+            projects: Projects returned by ProjectGenerator.generate
+            tasks: Stream of task batches (see tasks.iter_task_batches)
+        """
+        ids = get_id_allocator()
+        definitions = []
+        fields_by_project = {}
+
+        for project in projects:
+            templates = FIELD_TEMPLATES.get(project['team_type'], FIELD_TEMPLATES['product'])
+            field_ids = ids.allocate("custom_field", uuid4_strings(derive_rng("custom_fields", project['index']), len(templates)))
+            fields_by_project[project['project_id']] = list(zip(field_ids, templates))
+            for field_id, (name, field_type, options) in zip(field_ids, templates):
+                enum_options = json.dumps(options) if field_type == "enum" else None
+                definitions.append((field_id, project['project_id'], name, field_type, enum_options, project['created_at']))
+
+        self.db.insert_many("custom_field_definitions", self.DEFINITION_COLUMNS, definitions)
+
+        total = 0
+        with self.db.background_writer() as writer:
+            for batch in tasks:
+                # Per-project stream, so a shard holding a subset of projects
+                # produces exactly the rows a full run would
+                rng = derive_rng("custom_field_values", batch['project']['index'])
+                columns = batch['columns']
+                n = len(columns['task_id'])
+                created = iso_strings(columns['created_at'], 's')
+
+                for field_id, (name, field_type, options) in fields_by_project[batch['project']['project_id']]:
+                    filled = np.flatnonzero(rng.random(n) < FIELD_FILL_RATE)
+                    k = len(filled)
+                    if field_type == "number":
+                        numbers = rng.integers(options[0], options[1] + 1, k).tolist()
+                        enums = [None] * k
+                    else:
+                        numbers = [None] * k
+                        enums = np.asarray(options, dtype=object)[rng.integers(0, len(options), k)].tolist()
+
+                    total += writer.write("custom_field_values", self.VALUE_COLUMNS, zip(
+                        ids.allocate("custom_field_value", uuid4_strings(rng, k)),
+                        columns['task_id'][filled].tolist(),
+                        [field_id] * k,
+                        numbers,
+                        enums,
+                        created[filled].tolist(),
+                    ))
+
+        logger.info(f"Created {len(definitions)} custom fields and {total} values")
@@ -68,52 +68,20 @@ class InitiativeGenerator:
     def __init__(self, db_manager):
         self.db = db_manager
     
+    COLUMNS = (
+        "initiative_id", "team_id", "initiative_name", "initiative_type", "objective",
+        "employee_capacity", "start_date", "end_date", "status", "created_at",
+    )
+    
     def generate(self):
         """Generate all initiative records."""
-        # Product Development Initiatives
-        for init in self.PD_INITIATIVES:
-            self.db.insert_one("product_development_initiatives", {
-                "initiative_id": init[0],
-                "team_id": init[1],
-                "initiative_name": init[2],
-                "initiative_type": init[3],
-                "objective": init[4],
-                "employee_capacity": 500,
-                "start_date": init[5],
-                "end_date": init[6],
-                "status": init[7],
-                "created_at": datetime.now().isoformat()
-            })
-        logger.info(f"Created {len(self.PD_INITIATIVES)} product development initiatives")
-        
-        # Marketing Initiatives
-        for init in self.MKT_INITIATIVES:
-            self.db.insert_one("marketing_initiatives", {
-                "initiative_id": init[0],
-                "team_id": init[1],
-                "initiative_name": init[2],
-                "initiative_type": init[3],
-                "objective": init[4],
-                "employee_capacity": 500,
-                "start_date": init[5],
-                "end_date": init[6],
-                "status": init[7],
-                "created_at": datetime.now().isoformat()
-            })
-        logger.info(f"Created {len(self.MKT_INITIATIVES)} marketing initiatives")
+        created_at = datetime.now().isoformat()
         
-        # Operations Initiatives
-        for init in self.OPS_INITIATIVES:
-            self.db.insert_one("operation_flow_initiatives", {
-                "initiative_id": init[0],
-                "team_id": init[1],
-                "initiative_name": init[2],
-                "initiative_type": init[3],
-                "objective": init[4],
-                "employee_capacity": 500,
-                "start_date": init[5],
-                "end_date": init[6],
-                "status": init[7],
-                "created_at": datetime.now().isoformat()
-            })
-        logger.info(f"Created {len(self.OPS_INITIATIVES)} operation initiatives")
\ No newline at end of file
+        for table, initiatives, label in (
+            ("product_development_initiatives", self.PD_INITIATIVES, "product development"),
+            ("marketing_initiatives", self.MKT_INITIATIVES, "marketing"),
+            ("operation_flow_initiatives", self.OPS_INITIATIVES, "operation"),
+        ):
+            rows = (init[:5] + (500,) + init[5:] + (created_at,) for init in initiatives)
+            self.db.insert_many(table, self.COLUMNS, rows)
+            logger.info(f"Created {len(initiatives)} {label} initiatives")
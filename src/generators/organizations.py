@@ -21,11 +21,10 @@ class OrganizationGenerator:
         """Generate the organization record."""
         org = config.ORGANIZATION
         
-        self.db.insert_one("organizations", {
-            "organization_id": org["id"],
-            "name": org["name"],
-            "domain": org["domain"],
-            "created_at": datetime.now().isoformat()
-        })
+        self.db.insert_many(
+            "organizations",
+            ("organization_id", "name", "domain", "created_at"),
+            [(org["id"], org["name"], org["domain"], datetime.now().isoformat())]
+        )
         
-        logger.info(f"Created organization: {org['name']}")
\ No newline at end of file
+        logger.info(f"Created organization: {org['name']}")
@@ -1,73 +1,148 @@
 import uuid
-import random
-from datetime import datetime
-from utils.db_utils import get_db_connection
-from generators.sections import SectionGenerator
-from config import NUM_PROJECTS
+import logging
+from datetime import timedelta
+
+import config
+from src.generators.sections import SectionGenerator
+from src.scrappers.asana_templates import get_project_templates, TASK_TEMPLATES
+from src.scrappers.yc_companies import get_feature_names, PRODUCT_PREFIXES, PRODUCT_DOMAINS
+from src.utils.ids import get_id_allocator
+from src.utils.parallel import derive_random
+
+logger = logging.getLogger(__name__)
+
+# Asana project layout -> COMPLETION_RATES bucket
+LAYOUT_COMPLETION_BUCKET = {
+    'sprint': 'sprint',
+    'kanban': 'ongoing',
+    'timeline': 'default',
+    'list': 'default',
+}
+
 
 class ProjectGenerator:
-    def __init__(self):
-        self.conn = get_db_connection()
-        self.section_gen = SectionGenerator(self.conn)
-        
+    COLUMNS = (
+        "project_id", "team_id", "workstream_id", "name", "description", "color",
+        "status", "owner_id", "start_date", "due_date", "created_at",
+    )
+
+    def __init__(self, db_manager, org_id, start=0):
+        """
+        Args:
+            start: Index of the first project to draw; a --grow run continues
+                after the existing projects with its own stream
+        """
+        self.db = db_manager
+        self.org_id = org_id
+        self.start = start
+        self.rng = derive_random("projects", start) if start else derive_random("projects")
+        self.ids = get_id_allocator()
+        self.section_gen = SectionGenerator(db_manager, self.rng)
+
         # Mapping your custom schema tables to Project Types
         self.strategy_tables = [
-            ('pd_core_platform_workstreams', 'engineering', 'team_pd'),
-            ('pd_feature_delivery_workstreams', 'engineering', 'team_pd'),
-            ('mkt_brand_awareness_workstreams', 'marketing', 'team_mkt'),
-            ('ops_process_optimization_workstreams', 'operations', 'team_ops')
+            ('pd_core_platform_workstreams', 'team_pd'),
+            ('pd_feature_delivery_workstreams', 'team_pd'),
+            ('mkt_brand_awareness_workstreams', 'team_mkt'),
+            ('ops_process_optimization_workstreams', 'team_ops')
             # Add other tables from your schema here
         ]
 
-    def generate(self):
-        cursor = self.conn.cursor()
-        projects_created = 0
-        
-        # Get potential owners
-        cursor.execute("SELECT user_id, department FROM users")
-        users = cursor.fetchall()
-        
-        print(f"Generating Projects from Strategy Workstreams...")
-
-        for table_name, proj_type, team_id in self.strategy_tables:
-            # 1. Fetch workstreams from your custom strategy tables
-            # We use try/except in case a specific table wasn't created in schema
-            try:
-                cursor.execute(f"SELECT workstream_id, workstream_name, status, lead_role FROM {table_name}")
-                workstreams = cursor.fetchall()
-            except Exception as e:
-                print(f"Skipping {table_name}: {e}")
+    def _load_workstreams(self):
+        """Workstreams per team from the strategy tables that have been populated."""
+        workstreams = {}
+        for table_name, team_id in self.strategy_tables:
+            rows = self.db.fetch_all(f"SELECT workstream_id, workstream_name, status, lead_role FROM {table_name}")
+            workstreams.setdefault(team_id, []).extend(rows)
+        return workstreams
+
+    def _template_name(self, team_type, layout):
+        values = {
+            'num': self.rng.randint(1, 40),
+            'quarter': self.rng.randint(1, 4),
+            'version': f"{self.rng.randint(1, 5)}.{self.rng.randint(0, 9)}",
+            'team': team_type.title(),
+            'feature': self.rng.choice(get_feature_names()),
+            'component': self.rng.choice(TASK_TEMPLATES['product']['components']),
+            'campaign': self.rng.choice(TASK_TEMPLATES['marketing']['campaigns']),
+            'product': f"{self.rng.choice(PRODUCT_PREFIXES)} {self.rng.choice(PRODUCT_DOMAINS)}",
+            'event': "Annual Customer Summit",
+        }
+        return self.rng.choice(get_project_templates(team_type)[layout]).format(**values)
+
+    def generate(self, count, users, team_ids=None):
+        """
+        Generate projects (and their sections) spread across teams by user share.
+
+        Projects are linked to a workstream of their team when one exists.
+        With team_ids set (shard mode) every project is still drawn, so RNG
+        state and project indexes match a full run, but only those teams'
+        projects are written and returned.
+
+        Returns:
+            List of project dicts, each carrying its section_ids
+        """
+        workstreams = self._load_workstreams()
+        owners_by_department = users.by_department()
+
+        teams = config.TEAMS
+        weights = [team['user_percentage'] for team in teams]
+        window = (config.END_DATE - config.START_DATE).days
+
+        projects = []
+        project_rows = []
+        section_rows = []
+
+        for i in range(self.start, count):
+            team = self.rng.choices(teams, weights=weights, k=1)[0]
+            layout = self.rng.choice(list(LAYOUT_COMPLETION_BUCKET))
+            owners = owners_by_department.get(team['type'])
+            owner = self.rng.choice(owners) if owners else None
+
+            team_workstreams = workstreams.get(team['id'])
+            if team_workstreams:
+                ws = team_workstreams[i % len(team_workstreams)]
+                workstream_id = ws['workstream_id']
+                name = ws['workstream_name']
+                description = f"Execution project for {ws['workstream_name']} ({ws['lead_role']})"
+                status = 'active' if ws['status'] == 'active' else 'on_hold'
+            else:
+                workstream_id = None
+                name = self._template_name(team['type'], layout)
+                description = f"{team['name']} {layout} project"
+                status = 'active'
+
+            created = config.START_DATE + timedelta(days=self.rng.randrange(max(window // 2, 1)))
+            created_at = created.isoformat(timespec='seconds')
+            project_id = self.ids.allocate("project", [str(uuid.UUID(int=self.rng.getrandbits(128), version=4))])[0]
+
+            project_row = (
+                project_id, team['id'], workstream_id, name, description,
+                self.rng.choice(config.PROJECT_COLORS), status, owner,
+                created.date().isoformat(),
+                (created + timedelta(days=self.rng.randint(60, 180))).date().isoformat(),
+                created_at,
+            )
+            sections = self.section_gen.build_sections(project_id, team['type'], created_at)
+
+            if team_ids is not None and team['id'] not in team_ids:
                 continue
 
-            for ws in workstreams:
-                if projects_created >= NUM_PROJECTS:
-                    break
-
-                # Find a suitable owner
-                dept_users = [u for u in users if u['department'] == ('product' if proj_type == 'engineering' else proj_type)]
-                owner = random.choice(dept_users)['user_id'] if dept_users else None
-
-                project_id = str(uuid.uuid4())
-                
-                # Insert Project linked to Workstream
-                cursor.execute("""
-                    INSERT INTO projects (project_id, workstream_id, team_id, owner_id, name, description, status, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    project_id,
-                    ws['workstream_id'], # THE LINK
-                    team_id,
-                    owner,
-                    ws['workstream_name'], # Project Name = Workstream Name
-                    f"Execution project for {ws['workstream_name']} ({ws['lead_role']})",
-                    'on_track' if ws['status'] == 'active' else 'on_hold',
-                    datetime.now()
-                ))
-                
-                # Create Sections for this project
-                self.section_gen.create_sections_for_project(project_id, proj_type)
-                
-                projects_created += 1
-
-        self.conn.commit()
-        print(f"Generated {projects_created} projects linked to strategy.")
\ No newline at end of file
+            project_rows.append(project_row)
+            section_rows.extend(sections)
+
+            projects.append({
+                'index': i,
+                'project_id': project_id,
+                'team_id': team['id'],
+                'team_type': team['type'],
+                'name': name,
+                'project_type': LAYOUT_COMPLETION_BUCKET[layout],
+                'created_at': created_at,
+                'section_ids': [row[0] for row in sections],
+            })
+
+        self.db.insert_many("projects", self.COLUMNS, project_rows)
+        self.section_gen.insert(section_rows)
+        logger.info(f"Generated {len(projects)} projects with {len(section_rows)} sections")
+        return projects
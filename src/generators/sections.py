@@ -1,28 +1,31 @@
 import uuid
-from datetime import datetime
+
+from src.utils.ids import get_id_allocator
+
 
 class SectionGenerator:
-    def __init__(self, conn):
-        self.conn = conn
+    COLUMNS = ("section_id", "project_id", "name", "position", "created_at")
+
+    def __init__(self, db_manager, rng):
+        self.db = db_manager
+        self.rng = rng
 
-    def create_sections_for_project(self, project_id, project_type):
-        """Creates standard Asana sections based on project type."""
-        cursor = self.conn.cursor()
-        
-        if project_type == 'engineering':
+    def build_sections(self, project_id, team_type, created_at):
+        """Builds standard Asana section rows for a project based on its team type."""
+        if team_type in ('product', 'engineering'):
             names = ["Backlog", "To Do", "In Progress", "Code Review", "Testing", "Done"]
-        elif project_type == 'marketing':
+        elif team_type == 'marketing':
             names = ["Briefing", "Asset Creation", "Review", "Publishing", "Distribution"]
         else:
             names = ["New Requests", "In Progress", "Blocked", "Completed"]
 
-        sections_data = []
-        section_ids = []
-        
-        for name in names:
-            sec_id = str(uuid.uuid4())
-            sections_data.append((sec_id, project_id, name, datetime.now()))
-            section_ids.append(sec_id)
+        section_ids = get_id_allocator().allocate(
+            "section", [str(uuid.UUID(int=self.rng.getrandbits(128), version=4)) for _ in names]
+        )
+        return [
+            (section_id, project_id, name, position, created_at)
+            for position, (section_id, name) in enumerate(zip(section_ids, names))
+        ]
 
-        cursor.executemany("INSERT INTO sections (section_id, project_id, name, created_at) VALUES (?, ?, ?, ?)", sections_data)
-        return section_ids # Return IDs so we can add tasks to them later
\ No newline at end of file
+    def insert(self, rows):
+        return self.db.insert_many("sections", self.COLUMNS, rows)
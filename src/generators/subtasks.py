@@ -1,30 +1,107 @@
-import uuid
-import random
-from utils.db_utils import get_db_connection
-from config import AVG_SUBTASKS_PER_TASK
+import logging
+
+import numpy as np
+
+import config
+from src.generators.tasks import TASK_PROMPTS, assignee_pool, uuid4_strings
+from src.models.batch import SubtaskBatch
+from src.utils import ContentGenerator
+from src.utils.date_utils import sample_business_timestamps
+from src.utils.ids import get_id_allocator
+from src.utils.parallel import derive_random, derive_rng, map_shards, worker_context, worker_pool
+
+logger = logging.getLogger(__name__)
+
+SUBTASK_COLUMNS = SubtaskBatch.COLUMNS
+
+# Chance a subtask is picked up by someone other than the parent's assignee
+REASSIGN_PROBABILITY = 0.3
+
+# Chance a subtask of a still-open parent is already done
+OPEN_PARENT_DONE_PROBABILITY = 0.3
+
+# Subtasks are created within this window after their parent
+CREATION_WINDOW = np.timedelta64(3 * 86400, 's')
+
+
+def _generate_project_subtasks(batch):
+    """Worker: draw the subtasks for one project's tasks."""
+    project, tasks = batch['project'], batch['columns']
+    rng = derive_rng("subtasks", project['index'])
+    llm = ContentGenerator(rng=derive_random("subtasks-text", project['index']))
+    now = np.datetime64(worker_context()['now'], 's')
+
+    n = len(tasks['task_id'])
+    has_subtasks = rng.random(n) < config.SUBTASK_PROBABILITY
+    counts = np.where(
+        has_subtasks,
+        rng.integers(max(config.MIN_SUBTASKS_PER_TASK, 1), config.MAX_SUBTASKS_PER_TASK + 1, n),
+        0
+    )
+    parent = np.repeat(np.arange(n), counts)
+    m = len(parent)
+    if m == 0:
+        return []
+
+    # Work on a subtask ends when the parent was completed, or now if it's open
+    parent_done = tasks['completed'][parent]
+    window_end = np.where(parent_done, tasks['completed_at'][parent], now)
+    parent_created = tasks['created_at'][parent]
+
+    span = np.minimum(window_end - parent_created, CREATION_WINDOW)
+    created = sample_business_timestamps(rng, parent_created, parent_created + span)
+
+    completed = parent_done | (rng.random(m) < OPEN_PARENT_DONE_PROBABILITY)
+    completed_at = sample_business_timestamps(rng, created, window_end)
+    completed_at[~completed] = np.datetime64('NaT')
+
+    assignees = tasks['assignee_id'][parent].copy()
+    pool = np.asarray(assignee_pool(project['team_type'], worker_context()['users_by_department']), dtype=object)
+    if len(pool):
+        reassign = rng.random(m) < REASSIGN_PROBABILITY
+        assignees[reassign] = pool[rng.integers(0, len(pool), int(reassign.sum()))]
+
+    prompt_file = TASK_PROMPTS.get(project['team_type'], 'tasks_operations')
+    names = llm.generate_items(prompt_file, {'project_name': project['name']}, m)
+
+    return SubtaskBatch.from_columns(
+        subtask_id=uuid4_strings(rng, m),
+        parent_task_id=tasks['task_id'][parent],
+        name=names,
+        assignee_id=assignees,
+        due_date=tasks['due_date'][parent],
+        completed=completed,
+        completed_at=completed_at,
+        created_at=created,
+    )
+
 
 class SubtaskGenerator:
-    def __init__(self):
-        self.conn = get_db_connection()
-
-    def generate(self):
-        cursor = self.conn.cursor()
-        print("Generating Subtasks...")
-        
-        # Get a subset of tasks to have subtasks (not all tasks need them)
-        cursor.execute("SELECT task_id, project_id, assignee_id FROM tasks WHERE completed = 0 LIMIT 500")
-        parent_tasks = cursor.fetchall()
-        
-        subtasks_data = []
-        
-        for parent in parent_tasks:
-            # Treat subtasks as tasks linked to a parent (Asana model usually links via parent_id, 
-            # but for this schema we can just add them as tasks or use a parent_id column if added.
-            # *Note: In the Schema provided in Part 1, we treated tasks flatly. 
-            # To strictly follow the "Tasks" table structure, we will insert them as standard tasks 
-            # but usually, there would be a 'parent_task_id' column. 
-            # For this Demo, we will skip complex recursion and just log that we generated them.*
-            pass 
-            
-        # (Placeholder: In a full implementation, you'd add a parent_id column to the tasks table)
-        print("Subtask generation logic skipped (requires parent_id schema update).")
\ No newline at end of file
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def generate_for_tasks(self, tasks, users, workers=None):
+        """
+        Generate subtasks for a SUBTASK_PROBABILITY share of tasks.
+
+        Args:
+            tasks: Stream of task batches (see tasks.iter_task_batches)
+
+        Returns:
+            Number of subtasks written
+        """
+        workers = workers or config.NUM_WORKERS
+        context = {
+            'now': config.END_DATE.isoformat(timespec='seconds'),
+            'users_by_department': users.by_department(),
+        }
+
+        ids = get_id_allocator()
+        total = 0
+        # The pool forks before the writer thread starts
+        with worker_pool(workers, context) as pool, self.db.background_writer() as writer:
+            for batch in map_shards(_generate_project_subtasks, tasks, workers, context, pool=pool):
+                if len(batch):
+                    batch = batch.with_columns(subtask_id=ids.allocate("subtask", batch['subtask_id']))
+                total += writer.write("subtasks", SUBTASK_COLUMNS, batch)
+        return total
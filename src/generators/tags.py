@@ -1,4 +1,80 @@
-# Simple placeholder for Tag generation logic if needed
+"""
+Tag generator.
+"""
+
+import logging
+
+import numpy as np
+
+import config
+from src.generators.tasks import uuid4_strings
+from src.models.batch import iso_strings
+from src.utils.ids import get_id_allocator
+from src.utils.parallel import derive_rng
+
+logger = logging.getLogger(__name__)
+
+TAG_NAMES = [
+    "urgent", "bug", "feature", "tech-debt", "customer-request", "blocked",
+    "quick-win", "needs-review", "documentation", "security", "compliance", "Q4",
+]
+
+# Probability of a task carrying 0, 1 or 2 tags
+TAGS_PER_TASK_WEIGHTS = [0.6, 0.3, 0.1]
+
+
 class TagGenerator:
-    def generate(self):
-        pass
\ No newline at end of file
+    """Generates organization tags and assigns them to tasks."""
+
+    def __init__(self, db_manager, org_id):
+        self.db = db_manager
+        self.org_id = org_id
+
+    def generate_and_assign(self, tasks):
+        """
+        Create the tag set, then tag tasks with up to two distinct tags each.
+
+        Args:
+            tasks: Stream of task batches (see tasks.iter_task_batches)
+        """
+        ids = get_id_allocator()
+        # A --grow run tags its new tasks with the existing tag set
+        existing = dict(self.db.fetch_all("SELECT name, tag_id FROM tags"))
+        if all(name in existing for name in TAG_NAMES):
+            tag_ids = np.array([existing[name] for name in TAG_NAMES], dtype=object)
+        else:
+            tag_ids = np.array(ids.allocate("tag", uuid4_strings(derive_rng("tags"), len(TAG_NAMES))), dtype=object)
+            colors = [config.TAG_COLORS[i % len(config.TAG_COLORS)] for i in range(len(TAG_NAMES))]
+            self.db.insert_many(
+                "tags", ("tag_id", "organization_id", "name", "color", "created_at"),
+                zip(tag_ids.tolist(), [self.org_id] * len(TAG_NAMES), TAG_NAMES, colors,
+                    [config.START_DATE.isoformat(timespec='seconds')] * len(TAG_NAMES))
+            )
+
+        total = 0
+        t = len(TAG_NAMES)
+        with self.db.background_writer() as writer:
+            for batch in tasks:
+                rng = derive_rng("task_tags", batch['project']['index'])
+                columns = batch['columns']
+                n = len(columns['task_id'])
+                counts = rng.choice(len(TAGS_PER_TASK_WEIGHTS), size=n, p=TAGS_PER_TASK_WEIGHTS)
+
+                # The second tag is offset from the first so the pair is always distinct
+                first = rng.integers(0, t, n)
+                second = (first + rng.integers(1, t, n)) % t
+                task_idx = np.concatenate([np.flatnonzero(counts >= 1), np.flatnonzero(counts >= 2)])
+                tag_idx = np.concatenate([first[counts >= 1], second[counts >= 2]])
+                k = len(task_idx)
+
+                total += writer.write(
+                    "task_tags", ("task_tag_id", "task_id", "tag_id", "created_at"),
+                    zip(
+                        ids.allocate("task_tag", uuid4_strings(rng, k)),
+                        columns['task_id'][task_idx].tolist(),
+                        tag_ids[tag_idx].tolist(),
+                        iso_strings(columns['created_at'][task_idx], 's').tolist(),
+                    )
+                )
+
+        logger.info(f"Created {t} tags and {total} task tags")
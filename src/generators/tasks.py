@@ -1,89 +1,195 @@
-import uuid
-import random
-from datetime import timedelta
-from utils.db_utils import get_db_connection
-from utils.llm_utils import ContentGenerator
-from utils.date_utils import get_random_date
-from config import AVG_TASKS_PER_PROJECT
+from itertools import groupby
+
+import numpy as np
+
+import config
+from src.models.batch import TaskBatch
+from src.utils import ContentGenerator
+from src.utils.date_utils import sample_business_timestamps, sample_completed_at, sample_due_dates
+from src.utils.ids import get_id_allocator
+from src.utils.parallel import derive_random, derive_rng, map_shards, worker_context, worker_pool
+
+TASK_COLUMNS = TaskBatch.COLUMNS
+
+PRIORITIES = np.array(["low", "medium", "high"], dtype=object)
+
+
+def uuid4_strings(rng, n):
+    """Draw n UUID4 strings from the seeded generator in one call."""
+    raw = rng.integers(0, 256, size=(n, 16), dtype=np.uint8)
+    raw[:, 6] = (raw[:, 6] & 0x0F) | 0x40  # version 4
+    raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80  # RFC 4122 variant
+    hexed = raw.tobytes().hex()
+    return [
+        f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
+        for h in (hexed[i:i + 32] for i in range(0, 32 * n, 32))
+    ]
+
+
+class TaskBatchEngine:
+    """
+    Draws every structural task field for a project in one vectorized pass.
+
+    Names and descriptions are left to the caller (they come from the LLM or
+    its fallback); everything else is sampled as NumPy arrays and honours
+    COMPLETION_RATES, DUE_DATE_DISTRIBUTION and UNASSIGNED_TASK_PERCENTAGE.
+    Dates come from date_utils and fall on business days.
+    """
+
+    def __init__(self, rng=None, now=None):
+        self.rng = rng if rng is not None else np.random.default_rng(config.RANDOM_SEED)
+        self.now = np.datetime64(now or config.END_DATE, 's')
+
+    def draw_count(self):
+        return int(self.rng.integers(config.MIN_TASKS_PER_PROJECT, config.MAX_TASKS_PER_PROJECT + 1))
+
+    def draw(self, n, project_id, section_ids, assignee_ids, project_type, created_at):
+        """
+        Sample n tasks for one project.
+
+        Returns:
+            TaskBatch with dates as datetime64 arrays; 'name' and
+            'description' are not filled in.
+        """
+        rng = self.rng
+        created = sample_business_timestamps(rng, np.datetime64(created_at, 's'), self.now, n)
+
+        sections = np.asarray(section_ids, dtype=object)
+        section_col = sections[rng.integers(0, len(sections), n)] if len(sections) else np.full(n, None, dtype=object)
+
+        assignees = np.asarray(assignee_ids, dtype=object)
+        if len(assignees):
+            assignee_col = assignees[rng.integers(0, len(assignees), n)]
+            assignee_col[rng.random(n) < config.UNASSIGNED_TASK_PERCENTAGE] = None
+        else:
+            assignee_col = np.full(n, None, dtype=object)
+
+        low, high = config.COMPLETION_RATES.get(project_type, config.COMPLETION_RATES['default'])
+        completed = rng.random(n) < rng.uniform(low, high)
+        completed_at = sample_completed_at(rng, created, completed, self.now)
+
+        return TaskBatch({
+            "task_id": np.array(uuid4_strings(rng, n), dtype=object),
+            "project_id": np.full(n, project_id, dtype=object),
+            "section_id": section_col,
+            "assignee_id": assignee_col,
+            "priority": PRIORITIES[rng.integers(0, len(PRIORITIES), n)],
+            "due_date": sample_due_dates(rng, created, self.now),
+            "completed": completed,
+            "completed_at": completed_at,
+            "created_at": created,
+        })
+
+
+# Prompt file used for task names, by team type
+TASK_PROMPTS = {
+    'product': 'tasks_engineering',
+    'marketing': 'tasks_marketing',
+    'operations': 'tasks_operations',
+}
+
+
+def assignee_pool(team_type, users_by_department):
+    """Potential assignees: users in the same department, plus product."""
+    pool = users_by_department.get(team_type, [])
+    if team_type != 'product':
+        pool = pool + users_by_department.get('product', [])
+    return pool
+
+
+def _generate_project_tasks(project):
+    """Worker: draw every task of one project from its own derived RNG stream."""
+    engine = TaskBatchEngine(derive_rng("tasks", project['index']), now=worker_context()['now'])
+    llm = ContentGenerator(rng=derive_random("tasks-text", project['index']))
+
+    n = engine.draw_count()
+    batch = engine.draw(
+        n, project['project_id'], project['section_ids'],
+        assignee_pool(project['team_type'], worker_context()['users_by_department']),
+        project['project_type'], project['created_at']
+    )
+
+    prompt_file = TASK_PROMPTS.get(project['team_type'], 'tasks_operations')
+    names = llm.generate_items(prompt_file, {'project_name': project['name']}, n)
+    descriptions = llm.generate_descriptions(names)
+
+    return batch.with_columns(name=names, description=descriptions)
+
 
 class TaskGenerator:
-    def __init__(self):
-        self.conn = get_db_connection()
-        self.llm = ContentGenerator()
-
-    def generate(self):
-        cursor = self.conn.cursor()
-        print("Generating Tasks (this may take a moment)...")
-
-        # 1. Get all projects with their details
-        cursor.execute("""
-            SELECT p.project_id, p.name, p.team_id, t.team_type, p.created_at
-            FROM projects p
-            JOIN teams t ON p.team_id = t.team_id
-        """)
-        projects = cursor.fetchall()
-
-        tasks_data = []
-        
-        for project in projects:
-            # Get sections for this project to distribute tasks
-            cursor.execute("SELECT section_id FROM sections WHERE project_id = ?", (project['project_id'],))
-            sections = [row['section_id'] for row in cursor.fetchall()]
-            
-            if not sections: continue
-
-            # Get potential assignees (users in the same team)
-            cursor.execute("""
-                SELECT user_id FROM users 
-                WHERE department = ? OR department = 'product'
-            """, (project['team_type'],))
-            team_users = [row['user_id'] for row in cursor.fetchall()]
-
-            # Determine Prompt Template based on Team Type
-            prompt_file = f"tasks_{project['team_type']}" if project['team_type'] in ['engineering', 'marketing'] else "tasks_operations"
-            
-            # Generate Raw Task Names (Simulation: requesting 5-10 tasks at once to save "calls")
-            # In a real LLM scenario, we'd read the file content here. 
-            # For the demo, the fallback in llm_utils handles the logic.
-            
-            num_tasks = random.randint(5, AVG_TASKS_PER_PROJECT)
-            
-            for _ in range(num_tasks):
-                task_id = str(uuid.uuid4())
-                
-                # Generate Name
-                task_name = self.llm.generate_text(prompt_file, {'project_name': project['name']})
-                
-                # Generate Description
-                desc = self.llm.generate_text("task_descriptions", {'task_name': task_name})
-                
-                # Dates
-                created_at = project['created_at'] # Simplified: Task created same time as project
-                due_date = get_random_date(str(created_at)[:10], "2026-01-01")
-                
-                # Status Logic
-                completed = random.choice([True, False])
-                completed_at = str(get_random_date(str(created_at)[:10], str(due_date))) if completed else None
-
-                tasks_data.append((
-                    task_id,
-                    project['project_id'],
-                    random.choice(sections), # Random section
-                    random.choice(team_users) if team_users else None,
-                    task_name,
-                    desc,
-                    random.choice(['low', 'medium', 'high']),
-                    due_date,
-                    completed,
-                    completed_at,
-                    created_at
-                ))
-
-        # Batch Insert
-        cursor.executemany("""
-            INSERT INTO tasks (task_id, project_id, section_id, assignee_id, name, description, priority, due_date, completed, completed_at, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, tasks_data)
-        
-        self.conn.commit()
-        print(f"Generated {len(tasks_data)} tasks across {len(projects)} projects.")
\ No newline at end of file
+    def __init__(self, db_manager):
+        self.db = db_manager
+
+    def generate_for_projects(self, projects, users, workers=None):
+        """
+        Generate tasks for every project, fanning projects out over a process pool.
+
+        Each project draws from an RNG stream derived from RANDOM_SEED and its
+        index, and batches are streamed in project order to one background
+        writer (task IDs are allocated here, in that order), so the database
+        is identical for any number of workers.
+        Downstream stages read the tasks back with iter_task_batches.
+
+        Returns:
+            Number of tasks written
+        """
+        workers = workers or config.NUM_WORKERS
+        context = {
+            'now': config.END_DATE.isoformat(timespec='seconds'),
+            'users_by_department': users.by_department(),
+        }
+        projects = [p for p in projects if p['section_ids']]
+
+        ids = get_id_allocator()
+        total = 0
+        # The pool forks before the writer thread starts
+        with worker_pool(workers, context) as pool, self.db.background_writer() as writer:
+            for batch in map_shards(_generate_project_tasks, projects, workers, context, pool=pool):
+                batch = batch.with_columns(task_id=ids.allocate("task", batch['task_id']))
+                total += writer.write("tasks", TASK_COLUMNS, batch)
+        return total
+
+
+# Task columns downstream stages need, as read back by iter_task_batches
+_STREAM_COLUMNS = (
+    "task_id", "project_id", "section_id", "assignee_id", "name", "priority",
+    "due_date", "completed", "completed_at", "created_at",
+)
+
+
+def iter_task_batches(db_manager, projects, fetch_size=1000, after_rowid=0):
+    """
+    Stream tasks back from the database one project at a time.
+
+    Tasks are written in project order, so a single rowid-ordered scan
+    yields each project's tasks contiguously; only one project's columns
+    are held at a time. Tasks of projects not in `projects` are skipped,
+    and with after_rowid set (a --grow run) so is every earlier row.
+
+    Yields:
+        {'project': project, 'columns': TaskBatch}, with dates as datetime64
+        arrays as produced by TaskBatchEngine.draw (no 'description')
+    """
+    by_id = {project['project_id']: project for project in projects}
+    cursor = db_manager.conn.execute(
+        f"SELECT {', '.join(_STREAM_COLUMNS)} FROM tasks WHERE rowid > ? ORDER BY rowid", (after_rowid,)
+    )
+
+    def rows():
+        while True:
+            chunk = cursor.fetchmany(fetch_size)
+            if not chunk:
+                return
+            yield from chunk
+
+    for project_id, group in groupby(rows(), key=lambda row: row[1]):
+        project = by_id.get(project_id)
+        if project is None:
+            continue
+        values = list(zip(*group))
+        columns = {name: np.array(col, dtype=object) for name, col in zip(_STREAM_COLUMNS, values)}
+        columns['due_date'] = np.array(values[6], dtype='datetime64[D]')
+        columns['completed'] = np.array(values[7], dtype=bool)
+        columns['completed_at'] = np.array(values[8], dtype='datetime64[s]')
+        columns['created_at'] = np.array(values[9], dtype='datetime64[s]')
+        yield {'project': project, 'columns': TaskBatch(columns)}
@@ -13,18 +13,51 @@ logger = logging.getLogger(__name__)
 class TeamGenerator:
     """Generates team data."""
     
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, org_id=None):
         self.db = db_manager
+        self.org_id = org_id or config.ORGANIZATION["id"]
     
     def generate(self):
         """Generate team records."""
+        created_at = datetime.now().isoformat()
+        self.db.insert_many(
+            "teams",
+            ("team_id", "organization_id", "name", "team_type", "employee_count", "created_at"),
+            ((team["id"], self.org_id, team["name"], team["type"],
+              team["employee_count"], created_at) for team in config.TEAMS)
+        )
         for team in config.TEAMS:
-            self.db.insert_one("teams", {
-                "team_id": team["id"],
-                "organization_id": config.ORGANIZATION["id"],
-                "name": team["name"],
-                "team_type": team["type"],
-                "employee_count": team["employee_count"],
-                "created_at": datetime.now().isoformat()
-            })
-            logger.info(f"Created team: {team['name']}")
\ No newline at end of file
+            logger.info(f"Created team: {team['name']}")
+    
+    def assign_users_to_teams(self, users, start=0):
+        """
+        Create one membership per user (a UserBatch) in the team matching their department.
+        
+        Args:
+            start: Users already in the database (main.py --grow), which
+                membership ids continue after; teams that have a lead keep it
+        """
+        team_by_type = {team["type"]: team["id"] for team in config.TEAMS}
+        leads = set()
+        if start:
+            leads.update(row[0] for row in self.db.fetch_all(
+                "SELECT DISTINCT team_id FROM team_memberships WHERE role = 'lead'"
+            ))
+        rows = []
+        
+        members = zip(users["department"].tolist(), users["user_id"].tolist(), users["created_at"].tolist())
+        for i, (department, user_id, created_at) in enumerate(members, start):
+            team_id = team_by_type.get(department)
+            if team_id is None:
+                continue
+            # First member of each team leads it
+            role = "member" if team_id in leads else "lead"
+            leads.add(team_id)
+            rows.append((f"tm_{i + 1}", team_id, user_id, role, created_at))
+        
+        self.db.insert_many(
+            "team_memberships",
+            ("membership_id", "team_id", "user_id", "role", "joined_at"),
+            rows
+        )
+        logger.info(f"Created {len(rows)} team memberships")
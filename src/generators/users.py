@@ -1,59 +1,76 @@
-import uuid
-import random
-from datetime import timedelta
-from utils.db_utils import get_db_connection
-from utils.name_generator import NameGenerator
-from utils.date_utils import get_random_date
-from config import NUM_USERS, DOMAIN
+import logging
+
+import numpy as np
+
+import config
+from src.generators.tasks import uuid4_strings
+from src.models.batch import UserBatch, iso_strings
+from src.utils.ids import get_id_allocator
+from src.utils.name_generator import NameGenerator
+from src.utils.parallel import derive_rng
+
+logger = logging.getLogger(__name__)
+
 
 class UserGenerator:
-    def __init__(self):
-        self.conn = get_db_connection()
+    COLUMNS = UserBatch.COLUMNS
+
+    def __init__(self, db_manager, org_id, start=0):
+        """
+        Args:
+            start: Users already in the database (main.py --grow); new users
+                draw from their own stream and avoid existing emails
+        """
+        self.db = db_manager
+        self.org_id = org_id
         self.name_gen = NameGenerator()
-        
-    def generate(self):
-        cursor = self.conn.cursor()
-        
-        # 1. Fetch Teams from DB to assign users correctly
-        cursor.execute("SELECT team_id, name, team_type FROM teams")
-        teams = cursor.fetchall()
-        
-        if not teams:
-            print("No teams found. Run schema setup first.")
-            return
-
-        users_data = []
-        print(f"Generating {NUM_USERS} users...")
-
-        for _ in range(NUM_USERS):
-            user_id = str(uuid.uuid4())
-            full_name = self.name_gen.generate_full_name()
-            first, last = full_name.split(" ", 1)
-            email = f"{first.lower()}.{last.lower()}@{DOMAIN}"
-            
-            # Weighted Random Team Assignment
-            # 50% Product, 10% Marketing, 40% Ops
-            weights = [0.5 if t['team_type'] == 'product' else 0.1 if t['team_type'] == 'marketing' else 0.4 for t in teams]
-            team = random.choices(teams, weights=weights, k=1)[0]
-            
-            job_titles = {
-                'product': ['Software Engineer', 'Product Manager', 'Designer', 'QA Engineer'],
-                'marketing': ['Marketing Specialist', 'Content Writer', 'SEO Analyst'],
-                'operations': ['Ops Analyst', 'Customer Support', 'Finance Associate']
-            }
-            title = random.choice(job_titles.get(team['team_type'], ['Employee']))
-            
-            joined_at = get_random_date("2024-01-01", "2025-01-01")
-
-            users_data.append((
-                user_id, 'org_1', email, full_name, title, team['team_type'], joined_at
-            ))
-
-        # Bulk Insert
-        cursor.executemany("""
-            INSERT INTO users (user_id, organization_id, email, full_name, job_title, department, created_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, users_data)
-        
-        self.conn.commit()
-        print("Users generated successfully.")
\ No newline at end of file
+        self.start = start
+        self.rng = derive_rng("users", start) if start else derive_rng("users")
+
+    def generate(self, count) -> UserBatch:
+        """Generate users, weighted across departments by TEAMS user_percentage."""
+        rng = self.rng
+        departments = np.array([team['type'] for team in config.TEAMS], dtype=object)
+        weights = np.array([team['user_percentage'] for team in config.TEAMS], dtype=np.float64)
+
+        first, last = self.name_gen.generate_names(count, rng)
+        department = departments[rng.choice(len(departments), size=count, p=weights / weights.sum())]
+
+        job_title = np.empty(count, dtype=object)
+        for name in departments:
+            titles = np.array(config.JOB_TITLES.get(name, ['Employee']), dtype=object)
+            mask = department == name
+            job_title[mask] = titles[rng.integers(0, len(titles), int(mask.sum()))]
+
+        # Users join before the simulated window so they predate any task
+        joined_days_ago = rng.integers(1, 730, count).astype('timedelta64[D]')
+        created_at = iso_strings(np.datetime64(config.START_DATE, 's') - joined_days_ago, 's')
+
+        # Common names collide quickly; suffix a counter to keep emails unique
+        taken = {row[0] for row in self.db.fetch_all("SELECT email FROM users")} if self.start else set()
+        seen_emails = {}
+        emails = []
+        for first_name, last_name in zip(first.tolist(), last.tolist()):
+            local = f"{first_name.lower()}.{last_name.lower()}".replace(" ", "")
+            n = seen_emails.get(local, 0) + 1
+            email = f"{local}{n if n > 1 else ''}@{config.EMAIL_DOMAIN}"
+            while email in taken:
+                n += 1
+                email = f"{local}{n}@{config.EMAIL_DOMAIN}"
+            seen_emails[local] = n
+            emails.append(email)
+
+        users = UserBatch.from_columns(
+            user_id=get_id_allocator().allocate("user", uuid4_strings(rng, count)),
+            organization_id=np.full(count, self.org_id, dtype=object),
+            email=emails,
+            first_name=first,
+            last_name=last,
+            full_name=first + " " + last,
+            job_title=job_title,
+            department=department,
+            created_at=created_at,
+        )
+        self.db.insert_many("users", self.COLUMNS, users.rows())
+        logger.info(f"Generated {len(users)} users")
+        return users
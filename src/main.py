@@ -2,43 +2,70 @@
 Main entry point for Asana Seed Data Generator.
 
 This script orchestrates the entire data generation process:
-1. Initialize database schema
+1. Initialize database tables (indexes deferred)
 2. Generate base data (organization, teams)
 3. Generate users and team memberships
 4. Generate initiatives and workstreams (from schema)
 5. Generate projects, sections, tasks
 6. Generate subtasks, comments
 7. Generate custom fields and tags
-8. Validate and export
+8. Build indexes over the loaded data
+9. Validate and export
 
 Usage:
-    python src/main.py
+    python src/main.py [--workers N]
+    python src/main.py --shard team_pd        # one team into output/shards/
+    python src/main.py --merge [SHARD ...]    # combine shards into the output DB
+    python src/main.py --resume               # continue an interrupted run
+    python src/main.py --grow                 # add rows up to raised NUM_USERS / NUM_PROJECTS
+    python src/main.py --import-profile       # per-module import times, startup budget check
 """
 
 import os
 import sys
+import argparse
 import sqlite3
+import re
+import time
 import random
 from datetime import datetime
 from pathlib import Path
+from typing import Dict, List
 
 # Add project root to path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from loguru import logger
-from tqdm import tqdm
 
 import config
+from src.utils.checkpoints import CHECKPOINT_TABLE, CheckpointError, CheckpointStore, config_fingerprint
 from src.utils.db_utils import DatabaseManager
-from src.generators.users import UserGenerator
-from src.generators.teams import TeamGenerator
-from src.generators.projects import ProjectGenerator
-from src.generators.tasks import TaskGenerator
-from src.generators.subtasks import SubtaskGenerator
-from src.generators.comments import CommentGenerator
-from src.generators.custom_fields import CustomFieldGenerator
-from src.generators.tags import TagGenerator
+from src.utils.generation_stats import HISTOGRAMS, STATS_TABLE, GenerationStats
+from src.utils.ids import KIND_TABLES, configure_ids
+from src.utils.metrics import GenerationReport
+from src.utils.validators import validate_database
+from src.utils.shards import merge_shards, shard_path
+from src.utils.stream_validation import StreamValidator
+from src.utils.stage_cache import StageCache, get_stage_cache
+from src.models import UserBatch
+
+# Generator modules are imported by the stages that use them, so runs that
+# restore or skip a stage (and --merge, --help) don't pay for its imports
+
+
+INDEX_STATEMENT_RE = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\b[^;]*;", re.IGNORECASE)
+INDEX_NAME_RE = re.compile(r"INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?(\w+)", re.IGNORECASE)
+
+INITIATIVE_COLUMNS = (
+    "initiative_id", "team_id", "initiative_name", "initiative_type", "objective",
+    "employee_capacity", "start_date", "end_date", "status",
+)
+
+WORKSTREAM_COLUMNS = (
+    "workstream_id", "initiative_id", "workstream_name", "focus_area", "employee_capacity",
+    "subgroups_count", "employees_per_subgroup", "lead_role", "priority", "status",
+)
 
 
 def setup_logging():
@@ -74,10 +101,13 @@ def ensure_output_directory():
     logger.info(f"Output directory ready: {output_dir}")
 
 
-def initialize_database(db_manager: DatabaseManager):
-    """Initialize database with schema."""
-    logger.info("Initializing database schema...")
+def load_schema():
+    """
+    Read schema.sql, split into (table script, CREATE INDEX statements).
     
+    The index statements are kept apart so the data stages insert into bare
+    tables and the indexes are built once at the end (see build_indexes).
+    """
     schema_path = project_root / 'schema.sql'
     if not schema_path.exists():
         raise FileNotFoundError(f"Schema file not found: {schema_path}")
@@ -85,8 +115,38 @@ def initialize_database(db_manager: DatabaseManager):
     with open(schema_path, 'r') as f:
         schema_sql = f.read()
     
-    db_manager.execute_script(schema_sql)
-    logger.success("Database schema initialized successfully")
+    return INDEX_STATEMENT_RE.sub('', schema_sql), INDEX_STATEMENT_RE.findall(schema_sql)
+
+
+def initialize_database(db_manager: DatabaseManager) -> List[str]:
+    """
+    Initialize database tables from the schema.
+    
+    CREATE INDEX statements are returned rather than executed; see load_schema.
+    """
+    logger.info("Initializing database schema...")
+    
+    table_sql, index_statements = load_schema()
+    db_manager.execute_script(table_sql)
+    # A fresh database has nothing to resume
+    db_manager.execute_script(f"DROP TABLE IF EXISTS {CHECKPOINT_TABLE}; DROP TABLE IF EXISTS {STATS_TABLE};")
+    logger.success(f"Database tables created ({len(index_statements)} indexes deferred)")
+    return index_statements
+
+
+def build_indexes(db_manager: DatabaseManager, index_statements: List[str]):
+    """Create the deferred schema indexes over the loaded data, timing each one."""
+    logger.info(f"Building {len(index_statements)} indexes...")
+    total_start = time.perf_counter()
+    
+    for statement in index_statements:
+        name = INDEX_NAME_RE.search(statement).group(1)
+        start = time.perf_counter()
+        with db_manager.transaction():
+            db_manager.execute(statement)
+        logger.info(f"  {name:40} {time.perf_counter() - start:8.3f}s")
+    
+    logger.success(f"Indexes built in {time.perf_counter() - total_start:.2f}s")
 
 
 def insert_seed_data(db_manager: DatabaseManager):
@@ -94,17 +154,19 @@ def insert_seed_data(db_manager: DatabaseManager):
     logger.info("Inserting seed data...")
     
     # Insert organization
-    db_manager.execute("""
-        INSERT OR REPLACE INTO organizations (organization_id, name, domain)
-        VALUES (?, ?, ?)
-    """, (config.ORGANIZATION['id'], config.ORGANIZATION['name'], config.ORGANIZATION['domain']))
+    db_manager.insert_many(
+        "organizations", ("organization_id", "name", "domain"),
+        [(config.ORGANIZATION['id'], config.ORGANIZATION['name'], config.ORGANIZATION['domain'])],
+        or_replace=True
+    )
     
     # Insert teams
-    for team in config.TEAMS:
-        db_manager.execute("""
-            INSERT OR REPLACE INTO teams (team_id, organization_id, name, team_type, employee_count)
-            VALUES (?, ?, ?, ?, ?)
-        """, (team['id'], config.ORGANIZATION['id'], team['name'], team['type'], team['employee_count']))
+    db_manager.insert_many(
+        "teams", ("team_id", "organization_id", "name", "team_type", "employee_count"),
+        ((team['id'], config.ORGANIZATION['id'], team['name'], team['type'], team['employee_count'])
+         for team in config.TEAMS),
+        or_replace=True
+    )
     
     # Insert Product Development Initiatives
     pd_initiatives = [
@@ -124,13 +186,7 @@ def insert_seed_data(db_manager: DatabaseManager):
          'Reduce build and deployment friction', 500, '2025-08-01', '2025-11-15', 'planned'),
     ]
     
-    for init in pd_initiatives:
-        db_manager.execute("""
-            INSERT OR REPLACE INTO product_development_initiatives 
-            (initiative_id, team_id, initiative_name, initiative_type, objective, 
-             employee_capacity, start_date, end_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, init)
+    db_manager.insert_many("product_development_initiatives", INITIATIVE_COLUMNS, pd_initiatives, or_replace=True)
     
     # Insert Marketing Initiatives
     mkt_initiatives = [
@@ -150,13 +206,7 @@ def insert_seed_data(db_manager: DatabaseManager):
          'Improve marketing systems and processes', 500, '2025-07-01', '2025-12-31', 'active'),
     ]
     
-    for init in mkt_initiatives:
-        db_manager.execute("""
-            INSERT OR REPLACE INTO marketing_initiatives 
-            (initiative_id, team_id, initiative_name, initiative_type, objective,
-             employee_capacity, start_date, end_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, init)
+    db_manager.insert_many("marketing_initiatives", INITIATIVE_COLUMNS, mkt_initiatives, or_replace=True)
     
     # Insert Operations Initiatives
     ops_initiatives = [
@@ -174,13 +224,7 @@ def insert_seed_data(db_manager: DatabaseManager):
          'Manage external vendors and partners', 500, '2025-07-01', '2025-12-31', 'active'),
     ]
     
-    for init in ops_initiatives:
-        db_manager.execute("""
-            INSERT OR REPLACE INTO operation_flow_initiatives 
-            (initiative_id, team_id, initiative_name, initiative_type, objective,
-             employee_capacity, start_date, end_date, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, init)
+    db_manager.insert_many("operation_flow_initiatives", INITIATIVE_COLUMNS, ops_initiatives, or_replace=True)
     
     # Insert all workstreams (condensed for brevity)
     insert_workstreams(db_manager)
@@ -200,13 +244,7 @@ def insert_workstreams(db_manager: DatabaseManager):
         ('cp_ws_4', 'pd_init_1', 'Performance Tuning', 'Latency & throughput', 100, 5, 20, 'Tech Lead', 'medium', 'planned'),
         ('cp_ws_5', 'pd_init_1', 'Reliability Engineering', 'Stability & uptime', 100, 5, 20, 'SRE Lead', 'high', 'active'),
     ]
-    for ws in cp_workstreams:
-        db_manager.execute("""
-            INSERT OR REPLACE INTO pd_core_platform_workstreams
-            (workstream_id, initiative_id, workstream_name, focus_area, employee_capacity,
-             subgroups_count, employees_per_subgroup, lead_role, priority, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, ws)
+    db_manager.insert_many("pd_core_platform_workstreams", WORKSTREAM_COLUMNS, cp_workstreams, or_replace=True)
     
     # PD Feature Delivery Workstreams
     fd_workstreams = [
@@ -216,13 +254,7 @@ def insert_workstreams(db_manager: DatabaseManager):
         ('fd_ws_4', 'pd_init_2', 'Feature Testing', 'QA', 100, 5, 20, 'QA Manager', 'medium', 'planned'),
         ('fd_ws_5', 'pd_init_2', 'Feature Rollout', 'Release', 100, 5, 20, 'Release Manager', 'high', 'planned'),
     ]
-    for ws in fd_workstreams:
-        db_manager.execute("""
-            INSERT OR REPLACE INTO pd_feature_delivery_workstreams
-            (workstream_id, initiative_id, workstream_name, focus_area, employee_capacity,
-             subgroups_count, employees_per_subgroup, lead_role, priority, status)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, ws)
+    db_manager.insert_many("pd_feature_delivery_workstreams", WORKSTREAM_COLUMNS, fd_workstreams, or_replace=True)
     
     # Continue with other workstreams...
     # (Similar pattern for remaining workstream tables)
@@ -230,67 +262,282 @@ def insert_workstreams(db_manager: DatabaseManager):
     logger.info("Workstreams inserted")
 
 
-def generate_all_data(db_manager: DatabaseManager):
-    """Generate all synthetic data."""
-    
-    # Set random seed for reproducibility
+# Generation stages in order: the tables each writes, the config settings
+# its output depends on and the upstream stages it reads. --resume clears
+# the tables of every stage without a checkpoint before regenerating it;
+# the stage cache keys snapshots by the settings and upstream keys.
+DATE_SETTINGS = ("REFERENCE_DATE", "DATE_RANGE_MONTHS", "BUSINESS_WEEKMASK", "HOLIDAYS")
+TEXT_SETTINGS = (
+    "ENABLE_LLM", "LLM_MODEL", "LLM_MAX_TOKENS", "LLM_TEMPERATURE", "LLM_TEMPERATURES", "LLM_ITEMS_PER_REQUEST",
+)
+
+STAGES = {
+    "users": {
+        "tables": ("users",),
+        "config": ("NUM_USERS", "ORGANIZATION", "TEAMS", "JOB_TITLES", "EMAIL_DOMAIN") + DATE_SETTINGS,
+        "after": (),
+    },
+    "memberships": {
+        "tables": ("team_memberships",),
+        "config": ("TEAMS",),
+        "after": ("users",),
+    },
+    "projects": {
+        "tables": ("projects", "sections"),
+        "config": ("NUM_PROJECTS", "TEAMS", "PROJECT_COLORS") + DATE_SETTINGS,
+        "after": ("users",),
+    },
+    "tasks": {
+        "tables": ("tasks",),
+        "config": (
+            "MIN_TASKS_PER_PROJECT", "MAX_TASKS_PER_PROJECT", "COMPLETION_RATES",
+            "DUE_DATE_DISTRIBUTION", "UNASSIGNED_TASK_PERCENTAGE",
+        ) + DATE_SETTINGS + TEXT_SETTINGS,
+        "after": ("users", "projects"),
+    },
+    "subtasks": {
+        "tables": ("subtasks",),
+        "config": ("MIN_SUBTASKS_PER_TASK", "MAX_SUBTASKS_PER_TASK", "SUBTASK_PROBABILITY")
+                  + DATE_SETTINGS + TEXT_SETTINGS,
+        "after": ("users", "tasks"),
+    },
+    "comments": {
+        "tables": ("comments",),
+        "config": ("MIN_COMMENTS_PER_TASK", "MAX_COMMENTS_PER_TASK", "COMMENT_PROBABILITY")
+                  + DATE_SETTINGS + TEXT_SETTINGS,
+        "after": ("users", "tasks"),
+    },
+    "custom_fields": {
+        "tables": ("custom_field_definitions", "custom_field_values"),
+        "config": (),
+        "after": ("projects", "tasks"),
+    },
+    "tags": {
+        "tables": ("tags", "task_tags"),
+        "config": ("TAG_COLORS",) + DATE_SETTINGS,
+        "after": ("tasks",),
+    },
+}
+
+
+# Every table a stage writes
+STAGES_TABLES = tuple(table for spec in STAGES.values() for table in spec["tables"])
+
+
+def stage_keys(team_ids: List[str] = None) -> Dict[str, str]:
+    """Stage cache key of every stage; each folds in its upstream stages' keys."""
+    keys = {}
+    for name, spec in STAGES.items():
+        extra = sorted(team_ids) if name == "projects" and team_ids else None
+        # Every stage mints primary keys
+        keys[name] = StageCache.key(name, spec["config"] + ("ID_STRATEGY",), [keys[up] for up in spec["after"]], extra)
+    return keys
+
+
+class StageRunner:
+    """
+    Runs generation stages: timed in the report, checkpointed, and restored
+    from the stage cache instead of regenerated when their inputs are unchanged.
+    """
+    
+    def __init__(
+        self,
+        report: GenerationReport,
+        checkpoints: CheckpointStore = None,
+        stage_cache: StageCache = None,
+        team_ids: List[str] = None,
+        stats: GenerationStats = None
+    ):
+        self.report = report
+        self.checkpoints = checkpoints
+        self.stage_cache = stage_cache
+        self.stats = stats
+        self.keys = stage_keys(team_ids) if stage_cache is not None else {}
+    
+    def run(self, name: str, func, keep_result: bool = False):
+        """
+        Run func() as stage `name` and return its result.
+        
+        A stage with a checkpoint (--resume) is skipped and one with a
+        cached snapshot is restored; either way a kept result comes back
+        from the stored payload (None when keep_result is off).
+        """
+        if self.checkpoints is not None and self.checkpoints.is_complete(name):
+            logger.info(f"Skipping {name}: already completed (checkpoint)")
+            return self.checkpoints.payload(name)
+        
+        key = self.keys.get(name)
+        with self.report.stage(name):
+            result = StageCache.MISS
+            if key is not None:
+                result = self.stage_cache.restore(name, key, STAGES[name]["tables"])
+                if result is not StageCache.MISS:
+                    logger.info(f"Restored {name} from the stage cache")
+                    if self.stats is not None:
+                        self.stats.recount(STAGES[name]["tables"])
+            if result is StageCache.MISS:
+                result = func()
+                if not keep_result:
+                    result = None
+                if key is not None:
+                    self.stage_cache.save(name, key, STAGES[name]["tables"], result)
+        
+        if self.stats is not None:
+            self.stats.flush()
+        if self.checkpoints is not None:
+            self.checkpoints.record(name, result)
+        return result
+
+
+def generate_all_data(
+    db_manager: DatabaseManager,
+    workers: int = 1,
+    team_ids: List[str] = None,
+    runner: StageRunner = None
+):
+    """
+    Generate all synthetic data.
+    
+    The per-project stages (tasks, subtasks, comments) run on `workers`
+    processes; every stage draws from RNG streams derived from RANDOM_SEED,
+    so the output is the same for any worker count. With team_ids set only
+    those teams' projects (and everything under them) are generated.
+    Each step runs through `runner` (see StageRunner), which may skip it
+    or restore it from a snapshot.
+    """
+    runner = runner or StageRunner(GenerationReport(db_manager))
+    
+    # Set random seed for reproducibility (then fast-forward past completed stages)
     random.seed(config.RANDOM_SEED)
+    if runner.checkpoints is not None:
+        runner.checkpoints.restore_rng()
     
     # Get organization and teams from database
     org_id = config.ORGANIZATION['id']
     
     # Step 1: Generate Users
-    logger.info("Step 1: Generating users...")
-    user_generator = UserGenerator(db_manager, org_id)
-    users = user_generator.generate(config.NUM_USERS)
-    logger.success(f"Generated {len(users)} users")
+    def users_stage():
+        from src.generators.users import UserGenerator
+
+        logger.info("Step 1: Generating users...")
+        user_generator = UserGenerator(db_manager, org_id)
+        users = user_generator.generate(config.NUM_USERS)
+        logger.success(f"Generated {len(users)} users")
+        return users.to_dict()
+    
+    users = UserBatch.from_dict(runner.run("users", users_stage, keep_result=True))
     
     # Step 2: Generate Team Memberships
-    logger.info("Step 2: Generating team memberships...")
-    team_generator = TeamGenerator(db_manager, org_id)
-    team_generator.assign_users_to_teams(users)
-    logger.success("Team memberships created")
+    def memberships_stage():
+        from src.generators.teams import TeamGenerator
+
+        logger.info("Step 2: Generating team memberships...")
+        team_generator = TeamGenerator(db_manager, org_id)
+        team_generator.assign_users_to_teams(users)
+        logger.success("Team memberships created")
+    
+    runner.run("memberships", memberships_stage)
     
     # Step 3: Generate Projects
-    logger.info("Step 3: Generating projects...")
-    project_generator = ProjectGenerator(db_manager, org_id)
-    projects = project_generator.generate(config.NUM_PROJECTS, users)
-    logger.success(f"Generated {len(projects)} projects")
+    def projects_stage():
+        from src.generators.projects import ProjectGenerator
+
+        logger.info("Step 3: Generating projects...")
+        project_generator = ProjectGenerator(db_manager, org_id)
+        projects = project_generator.generate(config.NUM_PROJECTS, users, team_ids)
+        logger.success(f"Generated {len(projects)} projects")
+        return projects
+    
+    projects = runner.run("projects", projects_stage, keep_result=True)
     
     # Step 4: Generate Tasks
-    logger.info("Step 4: Generating tasks...")
-    task_generator = TaskGenerator(db_manager)
-    tasks = task_generator.generate_for_projects(projects, users)
-    logger.success(f"Generated {len(tasks)} tasks")
+    def tasks_stage():
+        from src.generators.tasks import TaskGenerator
+
+        logger.info(f"Step 4: Generating tasks ({workers} worker(s))...")
+        task_generator = TaskGenerator(db_manager)
+        task_count = task_generator.generate_for_projects(projects, users, workers)
+        logger.success(f"Generated {task_count} tasks")
+    
+    runner.run("tasks", tasks_stage)
+    
+    # Step 5: Generate Subtasks (this and later stages stream tasks back
+    # from the database one project at a time)
+    def subtasks_stage():
+        from src.generators.subtasks import SubtaskGenerator
+        from src.generators.tasks import iter_task_batches
+
+        logger.info("Step 5: Generating subtasks...")
+        subtask_generator = SubtaskGenerator(db_manager)
+        subtask_count = subtask_generator.generate_for_tasks(iter_task_batches(db_manager, projects), users, workers)
+        logger.success(f"Generated {subtask_count} subtasks")
     
-    # Step 5: Generate Subtasks
-    logger.info("Step 5: Generating subtasks...")
-    subtask_generator = SubtaskGenerator(db_manager)
-    subtasks = subtask_generator.generate_for_tasks(tasks, users)
-    logger.success(f"Generated {len(subtasks)} subtasks")
+    runner.run("subtasks", subtasks_stage)
     
     # Step 6: Generate Comments
-    logger.info("Step 6: Generating comments...")
-    comment_generator = CommentGenerator(db_manager)
-    comments = comment_generator.generate_for_tasks(tasks, users)
-    logger.success(f"Generated {len(comments)} comments")
+    def comments_stage():
+        from src.generators.comments import CommentGenerator
+        from src.generators.tasks import iter_task_batches
+
+        logger.info("Step 6: Generating comments...")
+        comment_generator = CommentGenerator(db_manager)
+        comment_count = comment_generator.generate_for_tasks(iter_task_batches(db_manager, projects), users, workers)
+        logger.success(f"Generated {comment_count} comments")
+    
+    runner.run("comments", comments_stage)
     
     # Step 7: Generate Custom Fields
-    logger.info("Step 7: Generating custom fields...")
-    custom_field_generator = CustomFieldGenerator(db_manager)
-    custom_field_generator.generate_for_projects(projects, tasks)
-    logger.success("Custom fields generated")
+    def custom_fields_stage():
+        from src.generators.custom_fields import CustomFieldGenerator
+        from src.generators.tasks import iter_task_batches
+
+        logger.info("Step 7: Generating custom fields...")
+        custom_field_generator = CustomFieldGenerator(db_manager)
+        custom_field_generator.generate_for_projects(projects, iter_task_batches(db_manager, projects))
+        logger.success("Custom fields generated")
+    
+    runner.run("custom_fields", custom_fields_stage)
     
     # Step 8: Generate Tags
-    logger.info("Step 8: Generating tags...")
-    tag_generator = TagGenerator(db_manager, org_id)
-    tag_generator.generate_and_assign(tasks)
-    logger.success("Tags generated and assigned")
+    def tags_stage():
+        from src.generators.tags import TagGenerator
+        from src.generators.tasks import iter_task_batches
+
+        logger.info("Step 8: Generating tags...")
+        tag_generator = TagGenerator(db_manager, org_id)
+        tag_generator.generate_and_assign(iter_task_batches(db_manager, projects))
+        logger.success("Tags generated and assigned")
+    
+    runner.run("tags", tags_stage)
     
     # Commit all changes
     db_manager.commit()
 
 
+def discard_incomplete_stages(db_manager: DatabaseManager, checkpoints: CheckpointStore, index_statements: List[str]):
+    """
+    Remove what an interrupted run left behind, before --resume continues it.
+    
+    Rows of stages without a checkpoint (the one that was running may have
+    committed part of its output) are deleted, and indexes are dropped
+    unless the index build itself completed.
+    """
+    for stage, spec in STAGES.items():
+        if checkpoints.is_complete(stage):
+            continue
+        for table in spec["tables"]:
+            deleted = db_manager.execute(f"DELETE FROM {table}").rowcount
+            if deleted:
+                logger.info(f"Discarded {deleted:,} rows from {table} (stage {stage} incomplete)")
+        if db_manager.stats is not None:
+            db_manager.stats.forget(spec["tables"])
+    
+    if not checkpoints.is_complete("indexes"):
+        for statement in index_statements:
+            db_manager.execute(f"DROP INDEX IF EXISTS {INDEX_NAME_RE.search(statement).group(1)}")
+    db_manager.commit()
+
+
 def print_summary(db_manager: DatabaseManager):
     """Print summary of generated data."""
     
@@ -305,17 +552,318 @@ def print_summary(db_manager: DatabaseManager):
     ]
     
     for table in tables:
-        count = db_manager.fetch_one(f"SELECT COUNT(*) FROM {table}")[0]
-        logger.info(f"{table:30} : {count:,} records")
+        logger.info(f"{table:30} : {db_manager.row_count(table):,} records")
+    
+    if db_manager.stats is not None:
+        for name in HISTOGRAMS:
+            summary = db_manager.stats.describe(name)
+            if summary:
+                logger.info(
+                    f"{name:30} : mean {summary['mean']:.1f} "
+                    f"(min {summary['min']:,}, max {summary['max']:,}, {summary['parents']:,} parents)"
+                )
     
     logger.info("=" * 60)
 
 
-def main():
-    """Main entry point."""
+def print_stage_report(report: GenerationReport):
+    """Print per-stage timings from the generation report."""
+    
+    logger.info("\n" + "=" * 105)
+    logger.info("STAGE REPORT")
+    logger.info("=" * 105)
+    logger.info(
+        f"{'stage':14} {'wall s':>8} {'cpu s':>8} {'rows':>10} {'rows/s':>10} "
+        f"{'RSS MB':>8} {'peak MB':>8} {'LLM calls':>9} {'hits':>6} {'DB +MB':>7}"
+    )
+    
+    for stage in report.stages + [dict(report.totals(), stage='total')]:
+        peak = f"{stage['py_peak_mb']:>8.1f}" if stage['py_peak_mb'] is not None else f"{'-':>8}"
+        logger.info(
+            f"{stage['stage']:14} {stage['wall_s']:>8.2f} {stage['cpu_s']:>8.2f} "
+            f"{stage['rows_written']:>10,} {stage['rows_per_s']:>10,.0f} {stage['rss_peak_mb']:>8.1f} {peak} "
+            f"{stage['llm_calls']:>9,} {stage['llm_cache_hits']:>6,} {stage['db_growth_bytes'] / 2**20:>7.1f}"
+        )
+    
+    logger.info("=" * 105)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the Asana seed database.")
+    parser.add_argument(
+        '--workers', type=int, default=config.NUM_WORKERS,
+        help="Processes for the per-project stages (output is identical for any value)"
+    )
+    parser.add_argument(
+        '--shard', choices=[team['id'] for team in config.TEAMS],
+        help="Generate only this team's projects into output/shards/<team>.sqlite"
+    )
+    parser.add_argument(
+        '--merge', nargs='*', metavar='SHARD',
+        help="Merge shard files (default: all in output/shards) into the output database"
+    )
+    parser.add_argument(
+        '--resume', action='store_true',
+        help="Continue an interrupted run from its last completed stage (same settings required)"
+    )
+    parser.add_argument(
+        '--grow', action='store_true',
+        help="Extend the output database of a completed run to the current NUM_USERS / NUM_PROJECTS, "
+             "keeping its rows (other settings must match)"
+    )
+    parser.add_argument(
+        '--import-profile', action='store_true',
+        help="Print per-module import times and exit (non-zero if startup exceeds STARTUP_BUDGET_MS)"
+    )
+    parser.add_argument(
+        '--conformance', nargs='?', const='', metavar='DB',
+        help="Check a generated database (default: the output database) against the config "
+             "distributions, write the conformance report and exit (non-zero if any metric fails)"
+    )
+    args = parser.parse_args(argv)
+    if args.grow and (args.shard or args.merge is not None or args.resume):
+        parser.error("--grow can't be combined with --shard, --merge or --resume")
+    return args
+
+
+def run_merge(db_manager: DatabaseManager, shard_paths: List[str]):
+    """Build the output database from shard files instead of generating it."""
+    shard_paths = shard_paths or sorted(str(p) for p in config.SHARD_DIR.glob("*.sqlite"))
+    if not shard_paths:
+        raise FileNotFoundError(f"No shard files found in {config.SHARD_DIR}")
+    
+    index_statements = initialize_database(db_manager)
+    db_manager.stats = GenerationStats(db_manager)
+    db_manager.stats.track_new_tables()
+    with db_manager.load_profile():
+        copied = merge_shards(db_manager, shard_paths)
+        db_manager.stats.merge_shards(shard_paths, copied)
+        db_manager.stats.flush()
+        build_indexes(db_manager, index_statements)
+    
+    logger.success(f"Merged {len(shard_paths)} shards ({sum(copied.values()):,} rows)")
+
+
+def resume_checkpoints(db_manager: DatabaseManager, team_ids: List[str] = None):
+    """
+    Open the checkpoints of an earlier run for --resume.
+    
+    An unpinned REFERENCE_DATE is taken from the checkpoints, so a run that
+    defaulted to "now" continues with the same dates.
+    
+    Returns:
+        The validated CheckpointStore, or None if there is nothing to resume
+    """
+    reference_date = CheckpointStore.stored_reference_date(db_manager)
+    if reference_date is None:
+        logger.warning("No checkpoints found; starting a fresh run")
+        return None
+    if not os.getenv('REFERENCE_DATE') and reference_date != config.REFERENCE_DATE:
+        logger.info(f"Using the interrupted run's reference date {reference_date.isoformat()}")
+        config.set_reference_date(reference_date)
+    
+    checkpoints = CheckpointStore(db_manager, config_fingerprint(team_ids))
+    checkpoints.validate()
+    return checkpoints
+
+
+def grow_data(db_manager: DatabaseManager, checkpoints: CheckpointStore, workers: int, runner: StageRunner):
+    """
+    Generate the users and projects (with everything under them) between
+    the existing counts and NUM_USERS / NUM_PROJECTS.
+    
+    New users and projects continue the indexes of the existing ones, so
+    their per-index RNG streams are ones the database hasn't drawn from;
+    only rows of new projects are generated, against all users.
+    
+    Returns:
+        All users (a UserBatch) and projects, for the checkpoint payloads
+    """
+    from src.generators.tasks import iter_task_batches
+    
+    org_id = config.ORGANIZATION['id']
+    old_users = UserBatch.from_dict(checkpoints.payload("users"))
+    old_projects = checkpoints.payload("projects")
+    
+    def users_stage():
+        from src.generators.teams import TeamGenerator
+        from src.generators.users import UserGenerator
+        
+        new_users = UserGenerator(db_manager, org_id, start=len(old_users)).generate(
+            config.NUM_USERS - len(old_users)
+        )
+        TeamGenerator(db_manager, org_id).assign_users_to_teams(new_users, start=len(old_users))
+        return UserBatch.concat([old_users, new_users])
+    
+    users = runner.run("users", users_stage, keep_result=True) if config.NUM_USERS > len(old_users) else old_users
+    
+    def projects_stage():
+        from src.generators.projects import ProjectGenerator
+        
+        return ProjectGenerator(db_manager, org_id, start=len(old_projects)).generate(config.NUM_PROJECTS, users)
+    
+    projects = runner.run("projects", projects_stage, keep_result=True) if config.NUM_PROJECTS > len(old_projects) else []
+    if not projects:
+        return users, old_projects
+    
+    # Later stages read back only the tasks written from here on
+    after_rowid = db_manager.fetch_one("SELECT COALESCE(MAX(rowid), 0) FROM tasks")[0]
+    
+    def tasks_stage():
+        from src.generators.tasks import TaskGenerator
+        
+        TaskGenerator(db_manager).generate_for_projects(projects, users, workers)
+    
+    def subtasks_stage():
+        from src.generators.subtasks import SubtaskGenerator
+        
+        tasks = iter_task_batches(db_manager, projects, after_rowid=after_rowid)
+        SubtaskGenerator(db_manager).generate_for_tasks(tasks, users, workers)
+    
+    def comments_stage():
+        from src.generators.comments import CommentGenerator
+        
+        tasks = iter_task_batches(db_manager, projects, after_rowid=after_rowid)
+        CommentGenerator(db_manager).generate_for_tasks(tasks, users, workers)
+    
+    def custom_fields_stage():
+        from src.generators.custom_fields import CustomFieldGenerator
+        
+        tasks = iter_task_batches(db_manager, projects, after_rowid=after_rowid)
+        CustomFieldGenerator(db_manager).generate_for_projects(projects, tasks)
+    
+    def tags_stage():
+        from src.generators.tags import TagGenerator
+        
+        TagGenerator(db_manager, org_id).generate_and_assign(
+            iter_task_batches(db_manager, projects, after_rowid=after_rowid)
+        )
+    
+    for name, stage in (
+        ("tasks", tasks_stage), ("subtasks", subtasks_stage), ("comments", comments_stage),
+        ("custom_fields", custom_fields_stage), ("tags", tags_stage),
+    ):
+        runner.run(name, stage)
+    db_manager.commit()
+    return users, old_projects + projects
+
+
+def run_grow(db_manager: DatabaseManager, workers: int) -> GenerationReport:
+    """
+    Extend the database of a completed run to the configured NUM_USERS and
+    NUM_PROJECTS (--grow) without regenerating what it holds.
+    
+    The run's checkpoints must all be present and match the current
+    settings apart from the two counts; afterwards they are re-recorded
+    for the grown database, so it can be grown again. Rows are checked by
+    the stream validator as they are written (looking up existing keys
+    on demand), which stands in for the full validate_database scan
+    unless STREAM_VALIDATION is off.
+    
+    Raises:
+        CheckpointError: If the database isn't a complete run with these settings
+        ValueError: If NUM_USERS or NUM_PROJECTS is below the existing count
+    """
+    reference_date = CheckpointStore.stored_reference_date(db_manager)
+    if reference_date is None:
+        raise CheckpointError("No checkpoints found; --grow needs the database of a completed run")
+    if not os.getenv('REFERENCE_DATE') and reference_date != config.REFERENCE_DATE:
+        logger.info(f"Using the existing run's reference date {reference_date.isoformat()}")
+        config.set_reference_date(reference_date)
+    
+    counts = {kind: db_manager.get_count(table) for kind, table in KIND_TABLES.items()}
+    checkpoints = CheckpointStore(
+        db_manager, config_fingerprint(overrides={"NUM_USERS": counts["user"], "NUM_PROJECTS": counts["project"]})
+    )
+    checkpoints.validate("only NUM_USERS and NUM_PROJECTS may change for --grow")
+    missing = [stage for stage in list(STAGES) + ["indexes"] if not checkpoints.is_complete(stage)]
+    if missing:
+        raise CheckpointError(f"The run is incomplete (no checkpoint for {', '.join(missing)}); finish it with --resume")
+    if config.NUM_USERS < counts["user"] or config.NUM_PROJECTS < counts["project"]:
+        raise ValueError(
+            f"--grow can't shrink the database ({counts['user']} users, {counts['project']} projects); "
+            f"set NUM_USERS / NUM_PROJECTS to at least those"
+        )
+    logger.info(
+        f"Growing {counts['user']:,} -> {config.NUM_USERS:,} users, "
+        f"{counts['project']:,} -> {config.NUM_PROJECTS:,} projects"
+    )
+    
+    random.seed(config.RANDOM_SEED)
+    checkpoints.restore_rng()
+    configure_ids(config.ID_STRATEGY).continue_after(counts)
+    
+    stats = db_manager.stats = GenerationStats(db_manager)
+    # Databases from before the stats table get theirs from SQL
+    stats.recount([table for table in STAGES_TABLES if stats.row_count(table) is None])
+    stats.seed_key_counts()
+    if config.STREAM_VALIDATION != "off":
+        db_manager.stream_validator = StreamValidator(db_manager, preload=False)
+    
+    report = GenerationReport(db_manager)
+    runner = StageRunner(report, stats=stats)
+    with db_manager.load_profile():
+        users, projects = grow_data(db_manager, checkpoints, workers, runner)
+        if db_manager.stream_validator is None:
+            with report.stage("validation"):
+                validate_database(db_manager)
+    if db_manager.stream_validator is not None and db_manager.stream_validator.summary():
+        logger.warning(f"Stream validation repaired rows: {db_manager.stream_validator.summary()}")
+    
+    checkpoints.clear()
+    checkpoints.fingerprint = config_fingerprint()
+    for stage in list(STAGES) + ["indexes"]:
+        payload = {"users": users.to_dict(), "projects": projects}.get(stage)
+        checkpoints.record(stage, payload)
+    stats.flush()
+    return report
+
+
+def run_import_profile() -> int:
+    """Log the import profile; returns the exit status for the startup budget check."""
+    from src.utils.import_profile import import_profile_lines, startup_ms
+    
+    for line in import_profile_lines():
+        logger.info(line)
+    
+    startup = startup_ms()
+    if startup > config.STARTUP_BUDGET_MS:
+        logger.error(f"Startup imports took {startup:.1f} ms, over the {config.STARTUP_BUDGET_MS:.0f} ms budget")
+        return 1
+    logger.success(f"Startup imports took {startup:.1f} ms (budget {config.STARTUP_BUDGET_MS:.0f} ms)")
+    return 0
+
+
+def run_conformance(db_path: Path) -> int:
+    """Log the conformance report of db_path; returns 1 if any metric is out of band."""
+    from src.utils.conformance import check_conformance, conformance_lines
+    
+    if not db_path.exists():
+        logger.error(f"No database at {db_path}")
+        return 1
+    report = check_conformance(str(db_path))
+    for line in conformance_lines(report):
+        logger.info(line)
+    logger.info(f"Conformance report written to {report['report_path']}")
+    if not report["passed"]:
+        logger.error(f"{len(report['failed'])} metrics out of tolerance: {', '.join(report['failed'])}")
+        return 1
+    logger.success(f"All {len(report['metrics'])} metrics within tolerance")
+    return 0
+
+
+def main(argv=None):
+    """Main entry point; returns the process exit status."""
+    args = parse_args(argv)
     
     # Setup
     logger = setup_logging()
+    if args.import_profile:
+        return run_import_profile()
+    if args.conformance is not None:
+        default_path = shard_path(args.shard) if args.shard else project_root / config.DATABASE_PATH
+        return run_conformance(Path(args.conformance) if args.conformance else default_path)
+    
     logger.info("=" * 60)
     logger.info("ASANA SEED DATA GENERATOR")
     logger.info(f"Started at: {datetime.now().isoformat()}")
@@ -325,22 +873,68 @@ def main():
     
     # Database path
     db_path = project_root / config.DATABASE_PATH
-    
+    if args.shard:
+        db_path = shard_path(args.shard)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
     try:
         # Initialize database manager
         db_manager = DatabaseManager(str(db_path))
         
-        # Initialize schema
-        initialize_database(db_manager)
+        if args.merge is not None:
+            run_merge(db_manager, args.merge)
+            print_summary(db_manager)
+            logger.success(f"\nDatabase saved to: {db_path}")
+            return
+        
+        if args.grow:
+            report = run_grow(db_manager, args.workers)
+            print_summary(db_manager)
+            print_stage_report(report)
+            logger.info(f"Stage report written to {report.write(config.REPORT_PATH)}")
+            logger.success(f"\nDatabase saved to: {db_path}")
+            return
+        
+        team_ids = [args.shard] if args.shard else None
+        configure_ids(config.ID_STRATEGY, args.shard)
+        if args.resume:
+            checkpoints = resume_checkpoints(db_manager, team_ids)
+        else:
+            checkpoints = None
         
-        # Insert seed data
-        insert_seed_data(db_manager)
+        if checkpoints is not None and checkpoints.completed_stages:
+            logger.info(f"Resuming after: {', '.join(checkpoints.completed_stages)}")
+            index_statements = load_schema()[1]
+            db_manager.stats = GenerationStats(db_manager)
+            discard_incomplete_stages(db_manager, checkpoints, index_statements)
+        else:
+            # Initialize schema (tables only; indexes are built after the load)
+            index_statements = initialize_database(db_manager)
+            db_manager.stats = GenerationStats(db_manager)
+            db_manager.stats.track_new_tables()
+            
+            # Insert seed data
+            insert_seed_data(db_manager)
+            
+            checkpoints = CheckpointStore(db_manager, config_fingerprint(team_ids))
         
-        # Generate all data
-        generate_all_data(db_manager)
+        # Generate all data with bulk-load PRAGMAs; restored before the summary
+        report = GenerationReport(db_manager)
+        if config.STREAM_VALIDATION != "off":
+            db_manager.stream_validator = StreamValidator(db_manager)
+        runner = StageRunner(report, checkpoints, get_stage_cache(db_manager), team_ids, db_manager.stats)
+        with db_manager.load_profile():
+            generate_all_data(db_manager, args.workers, team_ids, runner)
+            runner.run("indexes", lambda: build_indexes(db_manager, index_statements))
+            with report.stage("validation"):
+                validate_database(db_manager)
+        if db_manager.stream_validator is not None and db_manager.stream_validator.summary():
+            logger.warning(f"Stream validation repaired rows: {db_manager.stream_validator.summary()}")
         
         # Print summary
         print_summary(db_manager)
+        print_stage_report(report)
+        report_path = db_path.with_suffix('.report.json') if args.shard else config.REPORT_PATH
+        logger.info(f"Stage report written to {report.write(report_path)}")
         
         logger.success(f"\nDatabase saved to: {db_path}")
         logger.info(f"Completed at: {datetime.now().isoformat()}")
@@ -355,4 +949,4 @@ def main():
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
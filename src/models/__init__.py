@@ -2,4 +2,6 @@
 from .user import User
 from .team import Team
 from .project import Project
-from .task import Task
\ No newline at end of file
+from .task import Task
+from .comment import Comment
+from .batch import ColumnBatch, TaskBatch, SubtaskBatch, CommentBatch, UserBatch
\ No newline at end of file
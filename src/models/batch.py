@@ -0,0 +1,155 @@
+"""
+Columnar batches of generated rows.
+
+A batch keeps one array per column (dates as datetime64, flags as bool)
+instead of one object per row: a project's tasks are a handful of arrays
+rather than thousands of tuples, dicts or dataclass instances. Slicing
+returns views, and rows() renders the columns into the tuples executemany
+wants only when the batch is written.
+"""
+
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .task import Task
+from .user import User
+
+
+def iso_strings(values, unit):
+    """Render a datetime64 array as ISO strings, mapping NaT to None."""
+    strings = np.datetime_as_string(values, unit=unit).astype(object)
+    strings[np.isnat(values)] = None
+    return strings
+
+
+class ColumnBatch:
+    """
+    Base for columnar batches; subclasses declare their columns.
+
+    batch['name'] returns a column array, batch[i:j] a batch of views and
+    batch.take(indices) a batch of the selected rows.
+    """
+
+    __slots__ = ("columns",)
+
+    # Table columns, in insert order
+    COLUMNS: Tuple[str, ...] = ()
+    # datetime64 columns rendered as ISO strings at this unit ('D' or 's')
+    DATE_UNITS: Dict[str, str] = {}
+    # bool columns rendered as 0/1
+    FLAG_COLUMNS: Tuple[str, ...] = ()
+    # Row dataclass with the same fields as COLUMNS, for records()
+    ROW_TYPE = None
+
+    def __init__(self, columns: Dict[str, np.ndarray]):
+        self.columns = columns
+
+    @classmethod
+    def from_columns(cls, **columns) -> "ColumnBatch":
+        return cls({name: np.asarray(values, dtype=object) if isinstance(values, list) else values
+                    for name, values in columns.items()})
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()))) if self.columns else 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.columns
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return type(self)({name: values[key] for name, values in self.columns.items()})
+        return self.columns[key]
+
+    def take(self, indices) -> "ColumnBatch":
+        """Batch of the rows at `indices` (an index array or boolean mask)."""
+        return type(self)({name: values[indices] for name, values in self.columns.items()})
+
+    @classmethod
+    def concat(cls, batches: Sequence["ColumnBatch"]) -> "ColumnBatch":
+        """One batch with the rows of `batches` (which share their columns), in order."""
+        names = list(batches[0].columns)
+        return cls({name: np.concatenate([batch.columns[name] for batch in batches]) for name in names})
+
+    def with_columns(self, **columns) -> "ColumnBatch":
+        """Batch sharing these arrays, with columns added or replaced."""
+        merged = dict(self.columns)
+        merged.update(self.from_columns(**columns).columns)
+        return type(self)(merged)
+
+    def _render(self, name: str) -> List[Any]:
+        values = self.columns[name]
+        if name in self.DATE_UNITS:
+            return iso_strings(values, self.DATE_UNITS[name]).tolist()
+        if name in self.FLAG_COLUMNS:
+            return values.astype(np.int8).tolist()
+        return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+    def rows(self, columns: Optional[Sequence[str]] = None) -> Iterator[tuple]:
+        """Row tuples for executemany, one column rendered at a time."""
+        return zip(*(self._render(name) for name in columns or self.COLUMNS))
+
+    def records(self) -> Iterator[Any]:
+        """ROW_TYPE instances, for code that wants one object per row."""
+        fields = [name for name in self.COLUMNS if name in self.columns]
+        for values in zip(*(self.columns[name].tolist() for name in fields)):
+            yield self.ROW_TYPE(**dict(zip(fields, values)))
+
+    def to_dict(self) -> Dict[str, list]:
+        """Plain column lists (JSON-serializable when the columns are)."""
+        return {name: self._render(name) for name in self.columns}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, list]) -> "ColumnBatch":
+        return cls.from_columns(**data)
+
+
+class TaskBatch(ColumnBatch):
+    """Tasks of one project, as drawn by TaskBatchEngine or read back by iter_task_batches."""
+
+    __slots__ = ()
+
+    COLUMNS = (
+        "task_id", "project_id", "section_id", "assignee_id", "name", "description",
+        "priority", "due_date", "completed", "completed_at", "created_at",
+    )
+    DATE_UNITS = {"due_date": "D", "completed_at": "s", "created_at": "s"}
+    FLAG_COLUMNS = ("completed",)
+    ROW_TYPE = Task
+
+
+class SubtaskBatch(ColumnBatch):
+    __slots__ = ()
+
+    COLUMNS = (
+        "subtask_id", "parent_task_id", "name", "assignee_id", "due_date",
+        "completed", "completed_at", "created_at",
+    )
+    DATE_UNITS = {"due_date": "D", "completed_at": "s", "created_at": "s"}
+    FLAG_COLUMNS = ("completed",)
+
+
+class CommentBatch(ColumnBatch):
+    __slots__ = ()
+
+    COLUMNS = ("comment_id", "task_id", "author_id", "content", "created_at")
+    DATE_UNITS = {"created_at": "s"}
+
+
+class UserBatch(ColumnBatch):
+    """Generated users; created_at is kept as ISO strings."""
+
+    __slots__ = ()
+
+    COLUMNS = (
+        "user_id", "organization_id", "email", "first_name", "last_name",
+        "full_name", "job_title", "department", "created_at",
+    )
+    ROW_TYPE = User
+
+    def by_department(self) -> Dict[str, List[str]]:
+        """user_ids grouped by department, in generation order."""
+        grouped: Dict[str, List[str]] = {}
+        for department, user_id in zip(self.columns["department"].tolist(), self.columns["user_id"].tolist()):
+            grouped.setdefault(department, []).append(user_id)
+        return grouped
@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class Project:
     project_id: str
     team_id: str
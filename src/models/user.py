@@ -1,7 +1,8 @@
 from dataclasses import dataclass
 from datetime import datetime
+from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class User:
     user_id: str
     organization_id: str
@@ -10,4 +11,6 @@ class User:
     job_title: str
     department: str
     created_at: datetime
-    avatar_url: str = None
\ No newline at end of file
+    avatar_url: str = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
\ No newline at end of file
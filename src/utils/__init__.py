@@ -1,43 +1,125 @@
 import os
 import random
 import logging
-# from groq import Groq  # Uncomment if using Groq
+import numpy as np
+import config
 from config import BASE_DIR
+from src.utils.prompt_loader import PromptLoader
+from src.utils.text_synth import TASK_PROMPT_TEAMS, get_text_synthesizer
 
 logger = logging.getLogger(__name__)
 
+_prompts = None
+
+
+def _prompt_loader():
+    global _prompts
+    if _prompts is None:
+        _prompts = PromptLoader(str(BASE_DIR / "prompts"))
+    return _prompts
+
+
+def _render_prompt(prompt_template, context):
+    """Rendered prompt text for a template (FileNotFoundError if there's no such prompt)."""
+    rendered = _prompt_loader().render(prompt_template, context)
+    if rendered is None:
+        raise FileNotFoundError(f"Prompt template not found: {BASE_DIR / 'prompts' / prompt_template}.txt")
+    return rendered
+
+
 class ContentGenerator:
-    def __init__(self):
+    def __init__(self, rng=None):
+        # Per-shard generators pass their own random.Random so text choices
+        # are reproducible and don't disturb the global random state.
+        self.rng = rng or random
         self.api_key = os.getenv("GROQ_API_KEY")
         self.client = None
-        if self.api_key:
-            # self.client = Groq(api_key=self.api_key) # Uncomment to use real API
-            pass
+        self._np_rng = None
+        if self.api_key and config.ENABLE_LLM:
+            # Deferred: the Groq SDK is only needed when the LLM is on
+            from src.utils.llm_utils import get_llm_client
+            client = get_llm_client()
+            self.client = client.fork() if client.enabled else None
         
     def generate_text(self, prompt_template, context, max_tokens=100):
         """
         Generates text using LLM or falls back to templates if no key/client.
+        With a client, cached LLM responses are served first (see LLMClient);
+        offline text comes from the synthesizer alone, so it depends only on
+        the seed and settings.
         """
         if self.client:
-            try:
-                # Placeholder for actual API call
-                # chat_completion = self.client.chat.completions.create(...)
-                # return chat_completion.choices[0].message.content
-                pass
-            except Exception as e:
-                logger.error(f"LLM Error: {e}")
-        
-        # Fallback Logic (Deterministic generation for Demo)
+            return self.client.generate(_render_prompt(prompt_template, context), max_tokens=max_tokens)
+
+        # Fallback Logic (offline synthesizer)
         return self._fallback_generator(prompt_template, context)
 
+    @property
+    def np_rng(self):
+        """NumPy generator for the synthesizer, seeded from self.rng."""
+        if self._np_rng is None:
+            self._np_rng = np.random.default_rng(self.rng.getrandbits(64))
+        return self._np_rng
+
+    def generate_items(self, prompt_template, context, count, max_tokens=30):
+        """
+        Generates `count` list items (e.g. task names) from a list prompt.
+
+        The template takes a {count} variable; with a client, each request
+        returns several items (the requests run concurrently) and only
+        missing ones are re-requested.
+        Without one, task names come from the offline synthesizer in one batch.
+        """
+        if not self.client:
+            if prompt_template in TASK_PROMPT_TEAMS:
+                return get_text_synthesizer().task_names(self.np_rng, count, TASK_PROMPT_TEAMS[prompt_template])
+            return [self.generate_text(prompt_template, {**context, 'count': 1}, max_tokens) for _ in range(count)]
+
+        def render(offset, n):
+            return _render_prompt(prompt_template, {**context, 'count': n})
+
+        return self.client.generate_items(render, count, max_tokens=max_tokens)
+
+    def generate_descriptions(self, task_names, max_tokens=100):
+        """Generates one description per task name, several names per request."""
+        if not self.client:
+            return get_text_synthesizer().descriptions(self.np_rng, len(task_names))
+
+        def render(offset, n):
+            listed = "\n".join(f"{i + 1}. {name}" for i, name in enumerate(task_names[offset:offset + n]))
+            return _render_prompt("task_descriptions_batch", {'count': n, 'task_names': listed})
+
+        return self.client.generate_items(render, len(task_names), max_tokens=max_tokens)
+
+    def generate_comments(self, task_names, completed=None, max_tokens=100):
+        """
+        Generates one comment per task name (names repeat for multi-comment threads).
+
+        With a client, several comments are requested per prompt, the way
+        descriptions are; completed tasks are marked so theirs read as
+        wrap-ups. Offline, comments come from the synthesizer in one batch.
+        """
+        if not self.client:
+            return get_text_synthesizer().comments(self.np_rng, len(task_names), completed)
+
+        done = [False] * len(task_names) if completed is None else completed
+
+        def render(offset, n):
+            listed = "\n".join(
+                f"{i + 1}. {name}" + (" (completed)" if done[offset + i] else "")
+                for i, name in enumerate(task_names[offset:offset + n])
+            )
+            return _render_prompt("comments_batch", {'count': n, 'task_names': listed})
+
+        return self.client.generate_items(render, len(task_names), max_tokens=max_tokens)
+
     def _fallback_generator(self, template_name, context):
-        """Simple template-based generator for demo purposes."""
-        if "task" in template_name:
-            actions = ["Update", "Fix", "Refactor", "Design", "Implement", "Test"]
-            nouns = ["API", "Button", "Database", "Login", "Header", "Cache"]
-            return f"{random.choice(actions)} {random.choice(nouns)} for {context.get('project_name', 'Project')}"
-        
+        """Single item from the offline synthesizer."""
+        synthesizer = get_text_synthesizer()
+        if template_name in TASK_PROMPT_TEAMS:
+            return synthesizer.task_names(self.np_rng, 1, TASK_PROMPT_TEAMS[template_name])[0]
         if "description" in template_name:
-            return f"This is a simulated description for {context.get('item_name', 'item')}. Please ensure this is completed by EOD."
-            
-        return "Generated Content"
\ No newline at end of file
+            return synthesizer.descriptions(self.np_rng, 1)[0]
+        if "comment" in template_name:
+            return synthesizer.comments(self.np_rng, 1)[0]
+        return "Generated Content"
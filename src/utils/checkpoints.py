@@ -0,0 +1,169 @@
+"""
+Stage checkpoints for resumable generation.
+
+Each completed stage leaves a row in the output database's _checkpoints
+table: the config fingerprint and seed it ran with, the process-global RNG
+state at completion and (for stages whose results later stages need, e.g.
+users and projects) a JSON payload. `main.py --resume` skips stages that
+have a row and restores the last RNG state, so the finished database is the
+same as an uninterrupted run.
+"""
+
+import hashlib
+import json
+import logging
+import random
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_TABLE = "_checkpoints"
+
+# Settings that change what is generated; paths, worker counts, API keys,
+# rate limits and cache options don't
+FINGERPRINT_SETTINGS = (
+    "NUM_USERS", "NUM_PROJECTS", "MIN_TASKS_PER_PROJECT", "MAX_TASKS_PER_PROJECT",
+    "MIN_SUBTASKS_PER_TASK", "MAX_SUBTASKS_PER_TASK", "SUBTASK_PROBABILITY",
+    "MIN_COMMENTS_PER_TASK", "MAX_COMMENTS_PER_TASK", "COMMENT_PROBABILITY",
+    "MIN_SECTIONS_PER_PROJECT", "MAX_SECTIONS_PER_PROJECT",
+    "ORGANIZATION", "EMAIL_DOMAIN", "TEAMS", "REFERENCE_DATE", "DATE_RANGE_MONTHS", "FUTURE_DATE_MONTHS",
+    "BUSINESS_WEEKMASK", "HOLIDAYS",
+    "DUE_DATE_DISTRIBUTION", "COMPLETION_RATES", "UNASSIGNED_TASK_PERCENTAGE", "JOB_TITLES",
+    "ENABLE_LLM", "LLM_MODEL", "LLM_MAX_TOKENS", "LLM_TEMPERATURE", "LLM_TEMPERATURES", "LLM_ITEMS_PER_REQUEST",
+    "RANDOM_SEED", "PROJECT_COLORS", "TAG_COLORS", "SECTION_TEMPLATES", "ID_STRATEGY",
+)
+
+
+class CheckpointError(Exception):
+    """Raised when checkpoints can't be resumed (e.g. the config changed)."""
+
+
+def config_fingerprint(team_ids: Optional[Iterable[str]] = None, overrides: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Hash of the generation settings (and shard team filter) of this run.
+
+    Args:
+        overrides: Settings to hash in place of the configured ones, e.g.
+            the NUM_* a database was made with (main.py --grow)
+    """
+    settings = {name: getattr(config, name) for name in FINGERPRINT_SETTINGS}
+    settings.update(overrides or {})
+    settings["team_ids"] = sorted(team_ids) if team_ids else None
+    payload = json.dumps(settings, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def capture_rng_state() -> Dict[str, Any]:
+    """JSON-serializable state of the global random and NumPy generators."""
+    version, internal, gauss_next = random.getstate()
+    name, keys, pos, has_gauss, cached_gaussian = np.random.get_state()
+    return {
+        "random": [version, list(internal), gauss_next],
+        "numpy": [name, keys.tolist(), pos, has_gauss, cached_gaussian],
+    }
+
+
+def restore_rng_state(state: Dict[str, Any]):
+    version, internal, gauss_next = state["random"]
+    random.setstate((version, tuple(internal), gauss_next))
+    name, keys, pos, has_gauss, cached_gaussian = state["numpy"]
+    np.random.set_state((name, np.asarray(keys, dtype=np.uint32), pos, has_gauss, cached_gaussian))
+
+
+class CheckpointStore:
+    """Reads and writes stage checkpoints in the database behind db_manager."""
+
+    def __init__(self, db_manager, fingerprint: str):
+        self.db = db_manager
+        self.fingerprint = fingerprint
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {CHECKPOINT_TABLE} (
+                stage TEXT PRIMARY KEY,
+                position INTEGER NOT NULL,
+                config_hash TEXT NOT NULL,
+                seed INTEGER NOT NULL,
+                reference_date TEXT NOT NULL,
+                rng_state TEXT NOT NULL,
+                payload TEXT,
+                completed_at TEXT NOT NULL
+            )
+        """)
+        self.db.commit()
+        self._rows: Dict[str, Any] = {
+            row["stage"]: row
+            for row in self.db.fetch_all(f"SELECT * FROM {CHECKPOINT_TABLE} ORDER BY position")
+        }
+
+    @staticmethod
+    def stored_reference_date(db_manager) -> Optional[datetime]:
+        """REFERENCE_DATE the existing checkpoints were made with, if any."""
+        exists = db_manager.fetch_one(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (CHECKPOINT_TABLE,)
+        )
+        if not exists:
+            return None
+        row = db_manager.fetch_one(f"SELECT reference_date FROM {CHECKPOINT_TABLE} LIMIT 1")
+        return datetime.fromisoformat(row[0]) if row else None
+
+    @property
+    def completed_stages(self) -> List[str]:
+        return list(self._rows)
+
+    def validate(self, remedy: str = "run without --resume to start over"):
+        """
+        Check the stored checkpoints belong to this configuration.
+
+        Args:
+            remedy: What the error message tells the user to do instead
+
+        Raises:
+            CheckpointError: If any checkpoint was made with other settings
+                or another seed
+        """
+        for stage, row in self._rows.items():
+            if row["config_hash"] != self.fingerprint or row["seed"] != config.RANDOM_SEED:
+                raise CheckpointError(
+                    f"Checkpoint '{stage}' was made with different settings "
+                    f"(seed {row['seed']}, reference date {row['reference_date']}); {remedy}"
+                )
+
+    def is_complete(self, stage: str) -> bool:
+        return stage in self._rows
+
+    def payload(self, stage: str) -> Any:
+        payload = self._rows[stage]["payload"]
+        return json.loads(payload) if payload is not None else None
+
+    def record(self, stage: str, payload: Any = None):
+        """Mark a stage complete; call once its rows are committed."""
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {CHECKPOINT_TABLE} "
+            f"(stage, position, config_hash, seed, reference_date, rng_state, payload, completed_at) "
+            f"VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                stage, len(self._rows), self.fingerprint, config.RANDOM_SEED,
+                config.REFERENCE_DATE.isoformat(), json.dumps(capture_rng_state()),
+                json.dumps(payload) if payload is not None else None,
+                datetime.now().isoformat(timespec='seconds'),
+            )
+        )
+        self.db.commit()
+        self._rows[stage] = self.db.fetch_one(f"SELECT * FROM {CHECKPOINT_TABLE} WHERE stage = ?", (stage,))
+        logger.debug(f"Checkpoint recorded: {stage}")
+
+    def clear(self):
+        """Delete every checkpoint (before re-recording them, e.g. after --grow)."""
+        self.db.execute(f"DELETE FROM {CHECKPOINT_TABLE}")
+        self.db.commit()
+        self._rows = {}
+
+    def restore_rng(self):
+        """Restore the global RNG state recorded by the last completed stage."""
+        if self._rows:
+            last = list(self._rows.values())[-1]
+            restore_rng_state(json.loads(last["rng_state"]))
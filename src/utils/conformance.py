@@ -0,0 +1,334 @@
+"""
+Statistical conformance of a generated database to its config targets.
+
+`main.py --conformance` streams the output tables in chunks of
+CONFORMANCE_CHUNK_ROWS rows and folds each chunk into NumPy histograms
+and counters, so memory is bounded by the number of projects (for
+per-project completion rates), not by the number of rows. Per-parent
+counts (subtasks and comments per task) come from scans in index order,
+where each parent's children are adjacent and are counted as runs.
+
+Every observed share is compared with its target from config.py:
+a point (UNASSIGNED_TASK_PERCENTAGE) or a range (COMPLETION_RATES). The
+tolerance band around a target is CONFORMANCE_TOLERANCE plus
+CONFORMANCE_Z standard errors of a sample of that size. Small datasets
+therefore get wide bands, and large ones are held close to the target.
+The report is a JSON file (CONFORMANCE_REPORT_PATH) listing every metric
+with its target, observed value, band and status, plus the raw
+histograms.
+"""
+
+import json
+import logging
+import math
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import config
+from src.utils.checkpoints import CHECKPOINT_TABLE
+from src.utils.date_utils import DUE_DATE_BUCKETS
+
+logger = logging.getLogger(__name__)
+
+# Dated DUE_DATE_BUCKETS by day offset from the reference day, and the bin
+# edges (due date - reference day) that separate them
+DUE_DATE_BUCKET_ORDER = tuple(sorted(
+    (bucket for bucket, bounds in DUE_DATE_BUCKETS.items() if bounds), key=lambda b: DUE_DATE_BUCKETS[b][0]
+))
+DUE_DATE_EDGES = tuple(DUE_DATE_BUCKETS[b][0] for b in DUE_DATE_BUCKET_ORDER) + (
+    DUE_DATE_BUCKETS[DUE_DATE_BUCKET_ORDER[-1]][1] + 1,
+)
+
+
+class Histogram:
+    """Counts of values in fixed bins [edges[i], edges[i+1]), plus under/overflow."""
+
+    def __init__(self, edges: Sequence[float]):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.counts = np.zeros(len(self.edges) + 1, dtype=np.int64)
+
+    def add(self, values):
+        bins = np.searchsorted(self.edges, np.asarray(values, dtype=np.float64), side="right")
+        self.counts += np.bincount(bins, minlength=len(self.counts))
+
+    def merge(self, other: "Histogram") -> "Histogram":
+        self.counts += other.counts
+        return self
+
+    @property
+    def total(self) -> int:
+        return int(self.counts.sum())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"edges": self.edges.tolist(), "counts": self.counts.tolist()}
+
+
+class CategoryCounts:
+    """Counts per category value (None included), mergeable across chunks."""
+
+    def __init__(self):
+        self.counts: Dict[Any, int] = {}
+
+    def add(self, values):
+        keys, counts = np.unique(np.asarray(values, dtype=object).astype(str), return_counts=True)
+        for key, count in zip(keys.tolist(), counts.tolist()):
+            self.counts[key] = self.counts.get(key, 0) + count
+
+    def merge(self, other: "CategoryCounts") -> "CategoryCounts":
+        for key, count in other.counts.items():
+            self.counts[key] = self.counts.get(key, 0) + count
+        return self
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+
+def tolerance_band(low: float, high: float, n: int) -> Tuple[float, float]:
+    """Accepted range for a share with target [low, high] observed over n rows."""
+    def margin(p):
+        return config.CONFORMANCE_TOLERANCE + config.CONFORMANCE_Z * math.sqrt(p * (1 - p) / max(n, 1))
+    return max(low - margin(low), 0.0), min(high + margin(high), 1.0)
+
+
+def share_metric(name: str, observed: int, n: int, target, note: str = None) -> Dict[str, Any]:
+    """
+    Metric entry for `observed` hits out of n rows.
+
+    Args:
+        target: A share, or a (low, high) range of shares
+    """
+    low, high = target if isinstance(target, (tuple, list)) else (target, target)
+    value = observed / n if n else None
+    band = tolerance_band(low, high, n)
+    metric = {
+        "metric": name,
+        "target": target if isinstance(target, float) else [low, high],
+        "observed": round(value, 6) if value is not None else None,
+        "n": n,
+        "band": [round(band[0], 6), round(band[1], 6)],
+        "status": "skipped" if value is None else ("pass" if band[0] <= value <= band[1] else "fail"),
+    }
+    if note:
+        metric["note"] = note
+    return metric
+
+
+def range_metric(name: str, histogram: Histogram, low: int, high: int) -> Dict[str, Any]:
+    """Metric entry checking every counted value lies within [low, high]."""
+    counts = histogram.counts[1:-1]
+    present = np.flatnonzero(counts)
+    observed = [float(histogram.edges[present[0]]), float(histogram.edges[present[-1]])] if len(present) else None
+    outside = int(histogram.counts[0] + histogram.counts[-1])
+    if observed is not None:
+        outside += int(counts[(histogram.edges[:-1] < low) | (histogram.edges[:-1] > high)].sum())
+    return {
+        "metric": name,
+        "target": [low, high],
+        "observed": observed,
+        "n": histogram.total,
+        "band": [low, high],
+        "status": "skipped" if observed is None else ("pass" if outside == 0 else "fail"),
+    }
+
+
+class ConformanceChecker:
+    """Streams a generated database and scores it against the config targets."""
+
+    def __init__(self, db_path: str, chunk_rows: int = None):
+        self.db_path = str(db_path)
+        self.chunk_rows = chunk_rows or config.CONFORMANCE_CHUNK_ROWS
+        self.conn = sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True)
+
+    def close(self):
+        self.conn.close()
+
+    def _chunks(self, sql: str, params: Sequence[Any] = ()) -> Iterator[List[tuple]]:
+        cursor = self.conn.execute(sql, params)
+        while True:
+            rows = cursor.fetchmany(self.chunk_rows)
+            if not rows:
+                return
+            yield rows
+
+    def _columns(self, sql: str, params: Sequence[Any] = ()) -> Iterator[List[np.ndarray]]:
+        """Chunks of `sql` as one object array per selected column."""
+        for rows in self._chunks(sql, params):
+            yield [np.array(column, dtype=object) for column in zip(*rows)]
+
+    def _table_exists(self, table: str) -> bool:
+        return self.conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+        ).fetchone() is not None
+
+    def _reference_day(self) -> np.datetime64:
+        """'Today' of the run that generated the database (due dates are relative to it)."""
+        if self._table_exists(CHECKPOINT_TABLE):
+            row = self.conn.execute(f"SELECT reference_date FROM {CHECKPOINT_TABLE} LIMIT 1").fetchone()
+            if row:
+                return np.datetime64(datetime.fromisoformat(row[0]).date(), "D")
+        return np.datetime64(config.END_DATE.date(), "D")
+
+    def _project_types(self) -> Dict[str, str]:
+        """project_id -> COMPLETION_RATES bucket, from the projects checkpoint payload."""
+        if not self._table_exists(CHECKPOINT_TABLE):
+            return {}
+        return dict(self.conn.execute(
+            f"SELECT json_extract(p.value, '$.project_id'), json_extract(p.value, '$.project_type') "
+            f"FROM {CHECKPOINT_TABLE} c, json_each(c.payload) p WHERE c.stage = 'projects'"
+        ).fetchall())
+
+    def _run_lengths(self, table: str, column: str) -> Tuple[Histogram, int]:
+        """
+        Histogram of rows per distinct `column` value, and the number of
+        distinct values, from a scan in `column` order (index order when
+        indexed). Runs spanning a chunk boundary are carried over.
+        """
+        histogram = Histogram(np.arange(0, 1001))
+        carry_key, carry_count, distinct = None, 0, 0
+        for (keys,) in self._columns(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column}"):
+            starts = np.flatnonzero(np.concatenate(([True], keys[1:] != keys[:-1])))
+            lengths = np.diff(np.append(starts, len(keys)))
+            if keys[0] == carry_key:
+                lengths[0] += carry_count
+            elif carry_count:
+                histogram.add([carry_count])
+                distinct += 1
+            histogram.add(lengths[:-1])
+            distinct += len(lengths) - 1
+            carry_key, carry_count = keys[-1], int(lengths[-1])
+        if carry_count:
+            histogram.add([carry_count])
+            distinct += 1
+        return histogram, distinct
+
+    def check(self) -> Dict[str, Any]:
+        """Score the database; returns the report dict (see module docstring)."""
+        metrics: List[Dict[str, Any]] = []
+        histograms: Dict[str, Any] = {}
+
+        # Users per team (department)
+        departments = CategoryCounts()
+        for (department,) in self._columns("SELECT department FROM users"):
+            departments.add(department)
+        for team in config.TEAMS:
+            metrics.append(share_metric(
+                f"user_share.{team['id']}", departments.counts.get(team['type'], 0), departments.total,
+                float(team['user_percentage']),
+            ))
+
+        # Tasks: due-date buckets, assignees and completion per project
+        today = self._reference_day()
+        due_offsets = Histogram(DUE_DATE_EDGES)
+        no_due = unassigned = tasks = 0
+        per_project: Dict[str, List[int]] = {}
+        for project_ids, due_dates, assignees, completed in self._columns(
+            "SELECT project_id, due_date, assignee_id, completed FROM tasks"
+        ):
+            tasks += len(project_ids)
+            has_due = due_dates != None  # noqa: E711
+            no_due += int((~has_due).sum())
+            offsets = (due_dates[has_due].astype("datetime64[D]") - today).astype(np.int64)
+            due_offsets.add(offsets)
+            unassigned += int((assignees == None).sum())  # noqa: E711
+
+            keys, inverse = np.unique(project_ids.astype(str), return_inverse=True)
+            done = np.bincount(inverse, weights=completed.astype(np.int64), minlength=len(keys))
+            total = np.bincount(inverse, minlength=len(keys))
+            for key, d, t in zip(keys.tolist(), done.tolist(), total.tolist()):
+                counts = per_project.setdefault(key, [0, 0])
+                counts[0] += int(d)
+                counts[1] += int(t)
+
+        bucket_counts = dict(zip(DUE_DATE_BUCKET_ORDER, due_offsets.counts[1:-1].tolist()))
+        bucket_counts["no_due_date"] = no_due
+        # Outside every bucket (e.g. overdue tasks created before the window)
+        bucket_counts["other"] = int(due_offsets.counts[0] + due_offsets.counts[-1])
+        for bucket in DUE_DATE_BUCKETS:
+            target = config.DUE_DATE_DISTRIBUTION.get(bucket, 0.0)
+            metrics.append(share_metric(f"due_date.{bucket}", bucket_counts[bucket], tasks, float(target)))
+        histograms["due_date_buckets"] = bucket_counts
+        metrics.append(share_metric("unassigned_tasks", unassigned, tasks, float(config.UNASSIGNED_TASK_PERCENTAGE)))
+
+        project_types = self._project_types()
+        by_type: Dict[str, List[int]] = {}
+        tasks_per_project = Histogram(np.arange(0, 1001))
+        tasks_per_project.add([total for _, total in per_project.values()])
+        for project_id, (done, total) in per_project.items():
+            counts = by_type.setdefault(project_types.get(project_id, "unknown"), [0, 0])
+            counts[0] += done
+            counts[1] += total
+        for project_type, (done, total) in sorted(by_type.items()):
+            if project_type in config.COMPLETION_RATES:
+                target = config.COMPLETION_RATES[project_type]
+                note = None
+            else:
+                # No project types recorded (e.g. a merged database): any configured rate
+                target = (min(r[0] for r in config.COMPLETION_RATES.values()),
+                          max(r[1] for r in config.COMPLETION_RATES.values()))
+                note = "project types unavailable; checked against the range of all COMPLETION_RATES"
+            metrics.append(share_metric(f"completion_rate.{project_type}", done, total, target, note))
+        metrics.append(range_metric(
+            "tasks_per_project", tasks_per_project, config.MIN_TASKS_PER_PROJECT, config.MAX_TASKS_PER_PROJECT,
+        ))
+        histograms["tasks_per_project"] = tasks_per_project.to_dict()
+
+        # Share of tasks with subtasks / comments, and how many each has
+        for kind, table, column, probability, low, high in (
+            ("subtasks", "subtasks", "parent_task_id", config.SUBTASK_PROBABILITY,
+             config.MIN_SUBTASKS_PER_TASK, config.MAX_SUBTASKS_PER_TASK),
+            ("comments", "comments", "task_id", config.COMMENT_PROBABILITY,
+             config.MIN_COMMENTS_PER_TASK, config.MAX_COMMENTS_PER_TASK),
+        ):
+            per_task, with_any = self._run_lengths(table, column)
+            metrics.append(share_metric(f"tasks_with_{kind}", with_any, tasks, float(probability)))
+            metrics.append(range_metric(f"{kind}_per_task", per_task, max(low, 1), high))
+            histograms[f"{kind}_per_task"] = per_task.to_dict()
+
+        failed = [m["metric"] for m in metrics if m["status"] == "fail"]
+        return {
+            "database": self.db_path,
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "reference_date": str(today),
+            "tolerance": config.CONFORMANCE_TOLERANCE,
+            "z": config.CONFORMANCE_Z,
+            "passed": not failed,
+            "failed": failed,
+            "metrics": metrics,
+            "histograms": histograms,
+        }
+
+
+def check_conformance(db_path: str, report_path: Optional[Path] = None) -> Dict[str, Any]:
+    """Score `db_path` and write the JSON report (default CONFORMANCE_REPORT_PATH)."""
+    checker = ConformanceChecker(db_path)
+    try:
+        report = checker.check()
+    finally:
+        checker.close()
+
+    report_path = Path(report_path or config.CONFORMANCE_REPORT_PATH)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report_path.write_text(json.dumps(report, indent=2))
+    report["report_path"] = str(report_path)
+    return report
+
+
+def conformance_lines(report: Dict[str, Any]) -> List[str]:
+    """Human-readable table of the report's metrics."""
+    lines = [f"{'metric':<34} {'target':>13} {'observed':>9} {'band':>17} {'n':>10}  status", "-" * 96]
+    for m in report["metrics"]:
+        target = m["target"]
+        target = f"{target[0]:g}-{target[1]:g}" if isinstance(target, list) else f"{target:g}"
+        observed = m["observed"]
+        if isinstance(observed, list):
+            observed = f"{observed[0]:g}-{observed[1]:g}"
+        elif observed is not None:
+            observed = f"{observed:.4f}"
+        band = f"{m['band'][0]:.4g}-{m['band'][1]:.4g}"
+        lines.append(f"{m['metric']:<34} {target:>13} {observed or '-':>9} {band:>17} {m['n']:>10,}  {m['status']}")
+    return lines
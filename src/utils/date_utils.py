@@ -1,23 +1,181 @@
-from datetime import datetime, timedelta
+"""
+Date sampling for the generators.
+
+The array functions draw a whole column of dates at once from a NumPy
+Generator and return datetime64 arrays ('s' for timestamps, 'D' for due
+dates) that TaskBatch and friends render at write time. BusinessCalendar
+moves dates off weekends and HOLIDAYS while keeping the time of day and
+the ordering the caller asks for (e.g. completed_at >= created_at).
+
+The scalar helpers at the bottom are kept for one-off use.
+"""
+
 import random
-from config import SIMULATION_START_DATE, SIMULATION_END_DATE
-
-def get_random_date(start_date_str=SIMULATION_START_DATE, end_date_str=SIMULATION_END_DATE):
-    """Generates a random date between start and end."""
-    start = datetime.strptime(start_date_str, "%Y-%m-%d")
-    end = datetime.strptime(end_date_str, "%Y-%m-%d")
-    
-    delta = end - start
-    random_days = random.randrange(delta.days)
-    return (start + timedelta(days=random_days)).date()
-
-def get_timestamp_in_range(start_date, end_date):
-    """Generates a random timestamp between two dates."""
-    delta = end_date - start_date
-    int_delta = (delta.days * 24 * 60 * 60) + delta.seconds
-    random_second = random.randrange(int_delta)
-    return start_date + timedelta(seconds=random_second)
-
-def is_business_day(date_obj):
-    """Returns True if date is Mon-Fri."""
-    return date_obj.weekday() < 5
\ No newline at end of file
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+
+import numpy as np
+
+import config
+
+# (min_days, max_days) offset from "now" for each DUE_DATE_DISTRIBUTION
+# bucket, inclusive and non-overlapping so a due date has exactly one bucket
+DUE_DATE_BUCKETS = {
+    'within_1_week': (0, 7),
+    'within_1_month': (8, 30),
+    'within_3_months': (31, 90),
+    'overdue': (-30, -1),
+    'no_due_date': None,
+}
+
+_SECOND = np.timedelta64(1, 's')
+
+
+class BusinessCalendar:
+    """Working days: BUSINESS_WEEKMASK days that aren't HOLIDAYS."""
+
+    def __init__(self, weekmask: str = None, holidays=None, years=None):
+        """
+        Args:
+            weekmask: Seven 0/1 flags, Monday first (default BUSINESS_WEEKMASK)
+            holidays: 'MM-DD' dates observed every year (default HOLIDAYS)
+            years: Years to expand holidays over (default the simulation
+                range, one year either side)
+        """
+        holidays = config.HOLIDAYS if holidays is None else holidays
+        if years is None:
+            years = range(config.START_DATE.year - 1, config.MAX_FUTURE_DATE.year + 2)
+        self.calendar = np.busdaycalendar(
+            weekmask=weekmask or config.BUSINESS_WEEKMASK,
+            holidays=[f"{year}-{day}" for year in years for day in holidays],
+        )
+
+    def is_business_day(self, dates) -> np.ndarray:
+        """Boolean array; NaT counts as not a business day."""
+        days = np.asarray(dates).astype('datetime64[D]')
+        result = np.zeros(days.shape, dtype=bool)
+        valid = ~np.isnat(days)
+        result[valid] = np.is_busday(days[valid], busdaycal=self.calendar)
+        return result
+
+    def roll(self, dates, direction: str = 'forward') -> np.ndarray:
+        """
+        Move dates on non-business days to the next ('forward') or previous
+        ('backward') business day, keeping the time of day. NaT stays NaT.
+        """
+        dates = np.asarray(dates)
+        days = dates.astype('datetime64[D]')
+        rolled = np.busday_offset(days, 0, roll=direction, busdaycal=self.calendar)
+        return dates + (rolled - days)
+
+    def snap(self, timestamps, lower, upper, direction: str = 'backward') -> np.ndarray:
+        """
+        Move timestamps in [lower, upper] onto business days without leaving
+        that range: to the previous business day if that's still >= lower,
+        else forward if that's still <= upper, else unchanged (the range has
+        no business day). direction='forward' tries the next business day
+        first instead.
+        """
+        backward = self.roll(timestamps, 'backward')
+        forward = self.roll(timestamps, 'forward')
+        if direction == 'forward':
+            return np.where(forward <= upper, forward, np.where(backward >= lower, backward, timestamps))
+        return np.where(backward >= lower, backward, np.where(forward <= upper, forward, timestamps))
+
+
+@lru_cache(maxsize=None)
+def get_business_calendar() -> BusinessCalendar:
+    """BusinessCalendar for the configured week and holidays (one per process)."""
+    return BusinessCalendar()
+
+
+def sample_timestamps(rng, start, end, size=None) -> np.ndarray:
+    """
+    Uniform datetime64[s] timestamps in [start, end).
+
+    start and end may be scalars or arrays (per-row windows); an empty
+    window yields start.
+    """
+    start = np.asarray(start, dtype='datetime64[s]')
+    end = np.asarray(end, dtype='datetime64[s]')
+    span = np.maximum((end - start) / _SECOND, 0)
+    if size is None:
+        size = np.broadcast(start, end).shape
+    return start + (rng.random(size) * span).astype(np.int64).astype('timedelta64[s]')
+
+
+def sample_business_timestamps(rng, start, end, size=None, calendar: BusinessCalendar = None) -> np.ndarray:
+    """
+    Uniform timestamps in [start, end) moved onto business days without
+    leaving [start, end] (see BusinessCalendar.snap).
+    """
+    calendar = calendar or get_business_calendar()
+    start = np.asarray(start, dtype='datetime64[s]')
+    end = np.asarray(end, dtype='datetime64[s]')
+    return calendar.snap(sample_timestamps(rng, start, end, size), start, end)
+
+
+def sample_completed_at(rng, created, completed, now, calendar: BusinessCalendar = None) -> np.ndarray:
+    """
+    Completion timestamps between created and now for rows where `completed`
+    is set, NaT elsewhere. Always completed_at >= created.
+    """
+    completed_at = sample_business_timestamps(rng, created, np.datetime64(now, 's'), calendar=calendar)
+    completed_at[~completed] = np.datetime64('NaT')
+    return completed_at
+
+
+def sample_due_dates(rng, created, now, distribution=None, calendar: BusinessCalendar = None) -> np.ndarray:
+    """
+    Due dates (datetime64[D]) drawn from the DUE_DATE_DISTRIBUTION buckets.
+
+    Overdue dates roll back and upcoming ones forward to a business day
+    (the other way where that would leave the bucket), so each date stays
+    in its bucket; no task is due before the day it was created.
+    'no_due_date' rows are NaT.
+    """
+    calendar = calendar or get_business_calendar()
+    distribution = distribution or config.DUE_DATE_DISTRIBUTION
+    buckets = list(DUE_DATE_BUCKETS)
+    weights = np.array([distribution.get(bucket, 0.0) for bucket in buckets])
+
+    n = len(created)
+    bucket_idx = rng.choice(len(buckets), size=n, p=weights / weights.sum())
+    today = np.datetime64(now, 'D')
+    due = np.full(n, np.datetime64('NaT'), dtype='datetime64[D]')
+
+    for i, bucket in enumerate(buckets):
+        bounds = DUE_DATE_BUCKETS[bucket]
+        mask = bucket_idx == i
+        if bounds is None or not mask.any():
+            continue
+        days = today + rng.integers(bounds[0], bounds[1] + 1, int(mask.sum())).astype('timedelta64[D]')
+        lower, upper = today + np.timedelta64(bounds[0], 'D'), today + np.timedelta64(bounds[1], 'D')
+        due[mask] = calendar.snap(days, lower, upper, 'backward' if bounds[1] < 0 else 'forward')
+
+    has_due = ~np.isnat(due)
+    created_day = np.asarray(created).astype('datetime64[D]')
+    due[has_due] = calendar.roll(np.maximum(due[has_due], created_day[has_due]))
+    return due
+
+
+@lru_cache(maxsize=None)
+def _parse_day(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+def get_random_date(start_date_str=None, end_date_str=None):
+    """Generates a random date between start and end (YYYY-MM-DD strings)."""
+    start = _parse_day(start_date_str or config.SIMULATION_START_DATE)
+    end = _parse_day(end_date_str or config.SIMULATION_END_DATE)
+    return start + timedelta(days=random.randrange((end - start).days))
+
+
+def get_timestamp_in_range(start_date: datetime, end_date: datetime) -> datetime:
+    """Generates a random timestamp between two datetimes."""
+    return start_date + timedelta(seconds=random.randrange(int((end_date - start_date).total_seconds())))
+
+
+def is_business_day(date_obj) -> bool:
+    """Returns True if date is a working day (BUSINESS_WEEKMASK, not a holiday)."""
+    return bool(get_business_calendar().is_business_day(np.datetime64(date_obj, 'D')))
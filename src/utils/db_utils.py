@@ -1,9 +1,360 @@
 import sqlite3
 import logging
+import queue
+import threading
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+import config
 from config import DB_PATH, SCHEMA_PATH
+from src.models.batch import ColumnBatch
 
 logger = logging.getLogger(__name__)
 
+
+class DatabaseManager:
+    """
+    Thin wrapper around a SQLite connection with a bulk-load write path.
+
+    Row-at-a-time helpers (execute, insert_one) are kept for small lookup
+    tables; generators that write thousands of rows should go through
+    insert_many, ideally inside load_profile().
+    """
+
+    # PRAGMAs touched by the load profile, in the order they are applied
+    PROFILE_PRAGMAS = ("journal_mode", "synchronous", "cache_size", "temp_store")
+    # Those set per connection (journal_mode belongs to the file), which
+    # BackgroundWriter connections copy
+    CONNECTION_PRAGMAS = ("synchronous", "cache_size", "temp_store")
+
+    def __init__(self, db_path: str = str(DB_PATH), batch_size: int = None):
+        """
+        Open (or create) the database.
+
+        Args:
+            db_path: Path to the SQLite file
+            batch_size: Rows per executemany call in insert_many
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size or config.DB_BATCH_SIZE
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.cursor = self.conn.cursor()
+        self._insert_sql: Dict[tuple, str] = {}
+        # Rows changed by BackgroundWriters, which have their own connections
+        self._writer_changes = 0
+        # Optional StreamValidator that BackgroundWriter batches pass through
+        self.stream_validator = None
+        # Optional GenerationStats fed by insert_many and BackgroundWriter
+        self.stats = None
+
+    # ----------------------
+    # Statement helpers
+    # ----------------------
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> sqlite3.Cursor:
+        """Execute a single statement; the cursor is returned for fetching."""
+        return self.cursor.execute(sql, params)
+
+    def execute_script(self, script: str):
+        """Execute a multi-statement SQL script (e.g. schema.sql)."""
+        self.conn.executescript(script)
+
+    def fetch_one(self, sql: str, params: Sequence[Any] = ()) -> Optional[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchone()
+
+    def fetch_all(self, sql: str, params: Sequence[Any] = ()) -> List[sqlite3.Row]:
+        return self.conn.execute(sql, params).fetchall()
+
+    def get_count(self, table: str) -> int:
+        return self.fetch_one(f"SELECT COUNT(*) FROM {table}")[0]
+
+    @property
+    def total_changes(self) -> int:
+        """Rows changed through this manager, background writers included."""
+        return self.conn.total_changes + self._writer_changes
+
+    def row_count(self, table: str) -> int:
+        """Rows in table from the generation stats, or COUNT(*) if it isn't tracked."""
+        count = self.stats.row_count(table) if self.stats is not None else None
+        return count if count is not None else self.get_count(table)
+
+    def commit(self):
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+    # ----------------------
+    # Inserts
+    # ----------------------
+
+    def _prepare_insert(self, table: str, columns: Sequence[str], or_replace: bool) -> str:
+        """Build (and memoize) the INSERT statement for a table/column list."""
+        key = (table, tuple(columns), or_replace)
+        sql = self._insert_sql.get(key)
+        if sql is None:
+            verb = "INSERT OR REPLACE" if or_replace else "INSERT"
+            sql = (
+                f"{verb} INTO {table} ({', '.join(columns)}) "
+                f"VALUES ({', '.join('?' * len(columns))})"
+            )
+            self._insert_sql[key] = sql
+        return sql
+
+    def insert_one(self, table: str, row: Dict[str, Any], or_replace: bool = False):
+        """Insert a single row given as a column -> value dict."""
+        columns = list(row)
+        self.cursor.execute(self._prepare_insert(table, columns, or_replace), [row[c] for c in columns])
+
+    def insert_many(
+        self,
+        table: str,
+        columns: Sequence[str],
+        rows: Iterable[Sequence[Any]],
+        or_replace: bool = False,
+        batch_size: int = None,
+    ) -> int:
+        """
+        Bulk-insert rows in large executemany chunks inside one transaction.
+
+        Args:
+            table: Target table
+            columns: Column names, in the same order as each row tuple
+            rows: Any iterable of row tuples; consumed lazily chunk by chunk
+            or_replace: Use INSERT OR REPLACE instead of INSERT
+            batch_size: Rows per executemany call (defaults to self.batch_size)
+
+        Returns:
+            Number of rows inserted
+        """
+        sql = self._prepare_insert(table, columns, or_replace)
+        batch_size = batch_size or self.batch_size
+        total = 0
+
+        with self.transaction():
+            for chunk in _chunked(rows, batch_size):
+                self.cursor.executemany(sql, chunk)
+                total += len(chunk)
+
+        # Bookkeeping tables (_checkpoints, _generation_stats) aren't counted
+        if self.stats is not None and not table.startswith("_"):
+            self.stats.count_rows(table, total, exact=not or_replace)
+        logger.debug(f"Inserted {total} rows into {table}")
+        return total
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group writes into one transaction.
+
+        Nested use joins the outer transaction; only the outermost block
+        commits (or rolls back on error).
+        """
+        if self.conn.in_transaction:
+            yield
+            return
+
+        self.conn.execute("BEGIN")
+        try:
+            yield
+        except Exception:
+            self.conn.rollback()
+            raise
+        else:
+            self.conn.commit()
+
+    @contextmanager
+    def background_writer(self, max_batches: int = None):
+        """
+        Stream row batches to a writer thread for the duration of the block.
+
+        Yields a BackgroundWriter; on exit every queued batch is committed
+        (or the writer's error re-raised) before control returns.
+
+        The writer commits through its own connection while this one keeps
+        reading (task streams, key lookups), which needs the database in
+        WAL mode: the load profile sets it, and otherwise it is switched
+        for the block. Don't write through this connection meanwhile.
+        """
+        if self.db_path in ("", ":memory:"):
+            raise ValueError("A background writer needs a database file, not an in-memory database")
+
+        self.commit()
+        previous = self._read_pragma("journal_mode")
+        if previous != "wal":
+            self.conn.execute("PRAGMA journal_mode = WAL")
+        writer = BackgroundWriter(self, max_batches)
+        writer.start()
+        try:
+            yield writer
+        finally:
+            try:
+                writer.close()
+            finally:
+                self._writer_changes += writer.changes
+                if previous != "wal":
+                    self.conn.execute(f"PRAGMA journal_mode = {previous}")
+
+    # ----------------------
+    # Load profile
+    # ----------------------
+
+    def _read_pragma(self, name: str):
+        return self.conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def _set_pragmas(self, pragmas: Dict[str, Any]):
+        for name in self.PROFILE_PRAGMAS:
+            if name in pragmas:
+                self.conn.execute(f"PRAGMA {name} = {pragmas[name]}")
+
+    @contextmanager
+    def load_profile(self, profile: Dict[str, Any] = None):
+        """
+        Switch the connection to bulk-load settings for the duration of the block.
+
+        The previous journal_mode, synchronous, cache_size and temp_store
+        values are read up front and restored afterwards, so the finished
+        database is left with its normal durability settings.
+        """
+        profile = profile or config.DB_LOAD_PROFILE
+        self.commit()  # journal_mode can't change inside a transaction
+        previous = {name: self._read_pragma(name) for name in self.PROFILE_PRAGMAS if name in profile}
+
+        self._set_pragmas(profile)
+        logger.info(f"Bulk-load profile enabled: {profile}")
+        try:
+            yield self
+        finally:
+            self.commit()
+            self._set_pragmas(previous)
+            logger.info("Bulk-load profile restored")
+
+
+class BackgroundWriter:
+    """
+    Dedicated thread committing row batches from a bounded queue.
+
+    Producers call write() and block once max_batches are waiting, so
+    memory stays bounded by the queue rather than the size of the run.
+    The thread opens its own connection (with the manager's per-connection
+    PRAGMAs); batches share one transaction, committed every batch_size rows.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db_manager: DatabaseManager, max_batches: int = None):
+        self.db = db_manager
+        self.queue: queue.Queue = queue.Queue(maxsize=max_batches or config.WRITER_QUEUE_SIZE)
+        self.rows_written = 0
+        self.changes = 0
+        self.error: Optional[BaseException] = None
+        # Read here: the manager's connection belongs to the calling thread
+        self._pragmas = {name: db_manager._read_pragma(name) for name in DatabaseManager.CONNECTION_PRAGMAS}
+        self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def write(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Queue rows for insertion; returns the number of rows queued.
+
+        A ColumnBatch is queued as is and rendered into row tuples by the
+        writer thread, so waiting batches stay columnar. With a
+        stream_validator set, rows are checked (or repaired) first; with
+        stats set, they are added to the generation stats histograms.
+        """
+        if self.error is not None:
+            raise self.error
+        if not isinstance(rows, (list, ColumnBatch)):
+            rows = list(rows)
+        if self.db.stream_validator is not None:
+            rows = self.db.stream_validator.check(table, columns, rows)
+        if self.db.stats is not None:
+            self.db.stats.observe(table, columns, rows)
+        if len(rows):
+            self.queue.put((table, columns, rows))
+        return len(rows)
+
+    def close(self):
+        """Wait for every queued batch to be committed."""
+        self.queue.put(self._STOP)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db.db_path)
+        for name, value in self._pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
+
+    def _insert(self, conn: sqlite3.Connection, table: str, columns: Sequence[str], rows) -> int:
+        """insert_many's chunked executemany, on the writer's connection."""
+        sql = self.db._prepare_insert(table, columns, False)
+        total = 0
+        for chunk in _chunked(rows, self.db.batch_size):
+            conn.executemany(sql, chunk)
+            total += len(chunk)
+        if self.db.stats is not None:
+            self.db.stats.count_rows(table, total)
+        logger.debug(f"Inserted {total} rows into {table}")
+        return total
+
+    def _run(self):
+        try:
+            conn = self._connect()
+        except BaseException as e:
+            logger.error(f"Background writer failed to connect: {e}")
+            self.error = e
+            conn = None
+
+        # One open transaction, committed every batch_size rows and at the end
+        uncommitted = 0
+        while True:
+            item = self.queue.get()
+            if item is self._STOP:
+                break
+            if self.error is not None:
+                continue  # drain so producers don't block; the error surfaces in write/close
+
+            table, columns, rows = item
+            try:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                if isinstance(rows, ColumnBatch):
+                    rows = rows.rows(columns)
+                uncommitted += self._insert(conn, table, columns, rows)
+                if uncommitted >= self.db.batch_size:
+                    conn.commit()
+                    self.rows_written += uncommitted
+                    uncommitted = 0
+            except BaseException as e:
+                logger.error(f"Background writer failed: {e}")
+                self.error = e
+                conn.rollback()
+
+        if conn is None:
+            return
+        if self.error is None and conn.in_transaction:
+            conn.commit()
+            self.rows_written += uncommitted
+        self.changes = conn.total_changes
+        conn.close()
+
+
+def _chunked(rows: Iterable[Sequence[Any]], size: int) -> Iterator[List[Sequence[Any]]]:
+    """Yield lists of up to `size` rows from any iterable."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def get_db_connection():
     """Establishes a connection to the SQLite database."""
     try:
@@ -17,17 +368,17 @@ def get_db_connection():
 def setup_database():
     """Initializes the database using schema.sql."""
     logger.info(f"Setting up database at {DB_PATH}...")
-    
+
     # Ensure directory exists
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    
+
     conn = get_db_connection()
     cursor = conn.cursor()
-    
+
     try:
         with open(SCHEMA_PATH, 'r') as f:
             schema_script = f.read()
-        
+
         # execute_script executes multiple SQL statements
         cursor.executescript(schema_script)
         conn.commit()
@@ -37,4 +388,4 @@ def setup_database():
         conn.rollback()
         raise
     finally:
-        conn.close()
\ No newline at end of file
+        conn.close()
@@ -0,0 +1,270 @@
+"""
+Row counts and small histograms maintained while the database is written.
+
+DatabaseManager.insert_many counts every inserted row, and
+BackgroundWriter.write feeds each batch's key columns to the HISTOGRAMS,
+so the summary and validate_database read finished numbers from the
+_generation_stats table instead of scanning every table with COUNT(*).
+
+A histogram maps a child count to the number of parents with that many
+children, e.g. tasks_per_project {15: 290, 16: 301, ...}. Grouped
+histograms rely on every child of a parent arriving in the same batch
+(true of the per-project batches), so each batch is counted on its own.
+Other histograms (tasks per assignee) keep a count per key until they
+are flushed.
+
+Stats are flushed to the table when each stage finishes. Tables filled
+by other means (stage cache restores, INSERT OR REPLACE seed rows) are
+recounted with SQL, and a merge adds up the shards' stats.
+"""
+
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import numpy as np
+
+from src.models.batch import ColumnBatch
+
+logger = logging.getLogger(__name__)
+
+STATS_TABLE = "_generation_stats"
+
+# Histogram name -> (table, key column, grouped)
+HISTOGRAMS = {
+    "tasks_per_project": ("tasks", "project_id", True),
+    "tasks_per_assignee": ("tasks", "assignee_id", False),
+    "comments_per_task": ("comments", "task_id", True),
+}
+
+ROWS_STAT = "rows"
+
+
+class GenerationStats:
+    """In-memory stats for one database, persisted to STATS_TABLE by flush()."""
+
+    def __init__(self, db_manager):
+        """Open (creating if needed) the stats table and load what it holds."""
+        self.db = db_manager
+        self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+                stat TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value INTEGER NOT NULL,
+                PRIMARY KEY (stat, key)
+            )
+        """)
+        self.db.commit()
+
+        self.rows: Dict[str, int] = {}
+        self.histograms: Dict[str, Dict[int, int]] = {name: {} for name in HISTOGRAMS}
+        for stat, key, value in self.db.fetch_all(f"SELECT stat, key, value FROM {STATS_TABLE}"):
+            if stat == ROWS_STAT:
+                self.rows[key] = value
+            elif stat in self.histograms:
+                self.histograms[stat][int(key)] = value
+
+        # Per-key counts of the histograms that aren't grouped, until flushed
+        self._key_counts: Dict[str, Dict[Any, int]] = {
+            name: {} for name, (_, _, grouped) in HISTOGRAMS.items() if not grouped
+        }
+        self._dirty = set()
+        self._stale = set()  # tables to recount with SQL at the next flush
+        self._lock = threading.Lock()
+
+    # ----------------------
+    # Updates
+    # ----------------------
+
+    def track_new_tables(self):
+        """Record every (just created, empty) table at 0 rows, so none needs a COUNT(*)."""
+        tables = [
+            row[0] for row in self.db.fetch_all(
+                "SELECT name FROM sqlite_master "
+                "WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE '\\_%' ESCAPE '\\'"
+            )
+        ]
+        with self._lock:
+            for table in tables:
+                self.rows.setdefault(table, 0)
+            self._dirty.add(ROWS_STAT)
+
+    def count_rows(self, table: str, count: int, exact: bool = True):
+        """Record rows inserted into table (exact=False: recount it at flush)."""
+        with self._lock:
+            self.rows[table] = self.rows.get(table, 0) + count
+            self._dirty.add(ROWS_STAT)
+            if not exact:
+                self._stale.add(table)
+
+    def observe(self, table: str, columns: Sequence[str], rows):
+        """Add a batch bound for table (a ColumnBatch or row tuples) to its histograms."""
+        for name, (hist_table, column, grouped) in HISTOGRAMS.items():
+            if hist_table != table or not len(rows):
+                continue
+            if isinstance(rows, ColumnBatch):
+                values = rows[column]
+            else:
+                index = list(columns).index(column)
+                values = np.array([row[index] for row in rows], dtype=object)
+            values = values[values != None]  # noqa: E711
+            if not len(values):
+                continue
+
+            keys, counts = np.unique(values, return_counts=True)
+            with self._lock:
+                if grouped:
+                    histogram = self.histograms[name]
+                    sizes, parents = np.unique(counts, return_counts=True)
+                    for size, parent_count in zip(sizes.tolist(), parents.tolist()):
+                        histogram[size] = histogram.get(size, 0) + parent_count
+                else:
+                    key_counts = self._key_counts[name]
+                    for key, count in zip(keys.tolist(), counts.tolist()):
+                        key_counts[key] = key_counts.get(key, 0) + count
+                self._dirty.add(name)
+
+    def forget(self, tables: Iterable[str]):
+        """Drop the stats of tables whose rows were deleted (e.g. --resume discards)."""
+        with self._lock:
+            for table in tables:
+                self.rows.pop(table, None)
+                for name, (hist_table, _, _) in HISTOGRAMS.items():
+                    if hist_table == table:
+                        self.histograms[name] = {}
+                        self._key_counts.get(name, {}).clear()
+                        self._dirty.add(name)
+            self._dirty.add(ROWS_STAT)
+
+    def recount(self, tables: Iterable[str]):
+        """Recompute the stats of tables from their rows (for tables not filled by insert_many)."""
+        tables = set(tables)
+        with self._lock:
+            for table in tables:
+                self.rows[table] = self.db.get_count(table)
+            for name, (hist_table, column, _) in HISTOGRAMS.items():
+                if hist_table in tables:
+                    self.histograms[name] = dict(self.db.fetch_all(
+                        f"SELECT n, COUNT(*) FROM (SELECT COUNT(*) AS n FROM {hist_table} "
+                        f"WHERE {column} IS NOT NULL GROUP BY {column}) GROUP BY n"
+                    ))
+                    self._key_counts.get(name, {}).clear()
+                    self._dirty.add(name)
+            self._stale -= tables
+            self._dirty.add(ROWS_STAT)
+
+    def seed_key_counts(self):
+        """
+        Load the per-key counts of the histograms that aren't grouped from
+        the rows already written (main.py --grow), so rows added to an
+        existing key (a new task for an old assignee) move it to a new bin.
+        """
+        with self._lock:
+            for name, key_counts in self._key_counts.items():
+                table, column, _ = HISTOGRAMS[name]
+                key_counts.update(self.db.fetch_all(
+                    f"SELECT {column}, COUNT(*) FROM {table} WHERE {column} IS NOT NULL GROUP BY {column}"
+                ))
+
+    def merge_shards(self, shard_paths: Sequence[str], copied: Dict[str, int]):
+        """
+        Stats of a database merged from shards.
+
+        Row counts are the rows merge_shards copied. Grouped histograms are
+        the sum of the shards' (each parent lives in one shard); the others
+        and any a shard lacks are recounted.
+        """
+        for table, count in copied.items():
+            self.count_rows(table, count)
+
+        recount = set()
+        merged = {name: {} for name, (_, _, grouped) in HISTOGRAMS.items() if grouped}
+        for path in shard_paths:
+            shard = load_stats(path)
+            for name, histogram in merged.items():
+                if shard is None or name not in shard["histograms"]:
+                    recount.add(HISTOGRAMS[name][0])
+                    continue
+                for size, parents in shard["histograms"][name].items():
+                    histogram[size] = histogram.get(size, 0) + parents
+
+        with self._lock:
+            for name, histogram in merged.items():
+                self.histograms[name] = histogram
+                self._dirty.add(name)
+        recount.update(table for name, (table, _, grouped) in HISTOGRAMS.items() if not grouped)
+        self.recount(recount)
+
+    # ----------------------
+    # Persistence
+    # ----------------------
+
+    def flush(self):
+        """Write changed stats to STATS_TABLE (after recounting stale tables)."""
+        if self._stale:
+            self.recount(list(self._stale))
+        with self._lock:
+            for name, key_counts in self._key_counts.items():
+                # Empty after a recount, which sets the histogram itself
+                if name in self._dirty and key_counts:
+                    histogram = {}
+                    for count in key_counts.values():
+                        histogram[count] = histogram.get(count, 0) + 1
+                    self.histograms[name] = histogram
+
+            rows = []
+            for stat in self._dirty:
+                values = self.rows if stat == ROWS_STAT else self.histograms[stat]
+                rows += [(stat, str(key), value) for key, value in values.items()]
+            dirty, self._dirty = self._dirty, set()
+
+        with self.db.transaction():
+            for stat in dirty:
+                self.db.execute(f"DELETE FROM {STATS_TABLE} WHERE stat = ?", (stat,))
+            self.db.insert_many(STATS_TABLE, ("stat", "key", "value"), rows)
+        logger.debug(f"Flushed generation stats: {', '.join(sorted(dirty)) or 'unchanged'}")
+
+    # ----------------------
+    # Reads
+    # ----------------------
+
+    def row_count(self, table: str) -> Optional[int]:
+        """Rows in table, or None if it isn't tracked."""
+        return self.rows.get(table)
+
+    def describe(self, name: str) -> Optional[Dict[str, float]]:
+        """Parents, mean, min and max children of a histogram (None if empty)."""
+        histogram = self.histograms.get(name)
+        if not histogram:
+            return None
+        sizes = np.array(list(histogram), dtype=np.int64)
+        parents = np.array(list(histogram.values()), dtype=np.int64)
+        return {
+            "parents": int(parents.sum()),
+            "mean": float((sizes * parents).sum() / parents.sum()),
+            "min": int(sizes.min()),
+            "max": int(sizes.max()),
+        }
+
+
+def load_stats(db_path: str) -> Optional[Dict[str, Any]]:
+    """Row counts and histograms stored in a database file (None if it has none)."""
+    if not Path(db_path).exists():
+        return None
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(f"SELECT stat, key, value FROM {STATS_TABLE}").fetchall()
+    except sqlite3.OperationalError:
+        return None
+    finally:
+        conn.close()
+
+    stats = {"rows": {}, "histograms": {}}
+    for stat, key, value in rows:
+        if stat == ROWS_STAT:
+            stats["rows"][key] = value
+        else:
+            stats["histograms"].setdefault(stat, {})[int(key)] = value
+    return stats
@@ -0,0 +1,124 @@
+"""
+Primary key allocation with selectable ID strategies.
+
+Generators keep drawing a UUID4 per new row from their seeded stream and
+pass the drawn IDs through the run's IdAllocator, which maps them to
+ID_STRATEGY:
+
+- uuid4: the drawn IDs unchanged (the default, same as older output)
+- uuid7: time-ordered UUIDs (RFC 9562) sharing one timestamp
+  (REFERENCE_DATE) with a per-kind counter in the next 42 bits and the
+  drawn ID's low 32 bits as the random part, so keys increase in insert
+  order and land on the right edge of the primary key B-tree
+- prefixed: short sequential keys such as task_00000042
+
+Allocation runs in the parent process in write order, which is the same
+for any worker count, and every other column is drawn exactly as before,
+so each strategy is reproducible and only the key values differ.
+"""
+
+import calendar
+import uuid
+from typing import Dict, Optional, Sequence
+
+import config
+
+ID_STRATEGIES = ("uuid4", "uuid7", "prefixed")
+
+# Kinds whose rows are split across team shards: in shard mode their
+# sequential IDs include the shard's team, so shards merge without
+# collisions. Users, tags, projects and sections are numbered the same
+# in every shard (projects and sections are drawn for all teams).
+SHARDED_KINDS = {"task", "subtask", "comment", "custom_field", "custom_field_value", "task_tag"}
+
+# Table holding each kind's rows, to continue numbering an existing database
+KIND_TABLES = {
+    "user": "users", "project": "projects", "section": "sections", "task": "tasks",
+    "subtask": "subtasks", "comment": "comments", "custom_field": "custom_field_definitions",
+    "custom_field_value": "custom_field_values", "tag": "tags", "task_tag": "task_tags",
+}
+
+# Zero padding keeps prefixed IDs in numeric order when compared as text
+PREFIXED_DIGITS = 8
+
+
+class IdAllocator:
+    """Maps drawn UUID4s to the configured strategy, numbering each kind separately."""
+
+    def __init__(self, strategy: str = None, namespace: Optional[str] = None):
+        """
+        Args:
+            strategy: One of ID_STRATEGIES (default ID_STRATEGY)
+            namespace: Shard team id when generating one team's shard
+        """
+        self.strategy = strategy or config.ID_STRATEGY
+        if self.strategy not in ID_STRATEGIES:
+            raise ValueError(f"Unknown ID strategy: {self.strategy} (expected one of {', '.join(ID_STRATEGIES)})")
+        self.namespace = namespace
+        self._counters: Dict[str, int] = {}
+
+        # uuid7: 48-bit millisecond timestamp (naive REFERENCE_DATE read as UTC)
+        self._timestamp_ms = calendar.timegm(config.REFERENCE_DATE.timetuple()) * 1000
+        # uuid7: a shard's counters start in their own 2**36 block
+        team_ids = [team['id'] for team in config.TEAMS]
+        self._shard_block = team_ids.index(namespace) + 1 if namespace in team_ids else 0
+
+    def continue_after(self, counts: Dict[str, int]):
+        """Number new IDs after `counts` existing rows per kind (main.py --grow)."""
+        for kind, count in counts.items():
+            self._counters[kind] = max(self._counters.get(kind, 0), count)
+
+    def _reserve(self, kind: str, n: int) -> int:
+        """First counter value of n consecutive IDs for kind."""
+        start = self._counters.get(kind, 0)
+        self._counters[kind] = start + n
+        return start
+
+    def allocate(self, kind: str, drawn: Sequence[str]):
+        """
+        IDs for new rows of `kind`, given the UUID4s drawn for them.
+
+        Returns:
+            `drawn` itself under uuid4, else a list of strings
+        """
+        if self.strategy == "uuid4":
+            return drawn
+
+        n = len(drawn)
+        start = self._reserve(kind, n)
+        sharded = self.namespace is not None and kind in SHARDED_KINDS
+
+        if self.strategy == "prefixed":
+            prefix = f"{kind}_{self.namespace}_" if sharded else f"{kind}_"
+            return [f"{prefix}{i:0{PREFIXED_DIGITS}d}" for i in range(start + 1, start + n + 1)]
+
+        counter_base = (self._shard_block << 36) if sharded else 0
+        high = self._timestamp_ms << 80 | 0x7 << 76
+        return [
+            str(uuid.UUID(int=(
+                high
+                | (counter >> 30) << 64          # rand_a: counter high 12 bits
+                | 0b10 << 62                     # RFC 9562 variant
+                | (counter & 0x3FFFFFFF) << 32   # rand_b: counter low 30 bits
+                | int(drawn_id[-8:], 16)         # rand_b: drawn random bits
+            )))
+            for counter, drawn_id in zip(range(counter_base + start, counter_base + start + n), drawn)
+        ]
+
+
+_allocator: Optional[IdAllocator] = None
+
+
+def configure_ids(strategy: str = None, namespace: Optional[str] = None) -> IdAllocator:
+    """Install the run's allocator (main.py calls this before generating)."""
+    global _allocator
+    _allocator = IdAllocator(strategy, namespace)
+    return _allocator
+
+
+def get_id_allocator() -> IdAllocator:
+    """The run's allocator, created with ID_STRATEGY on first use."""
+    global _allocator
+    if _allocator is None:
+        _allocator = IdAllocator()
+    return _allocator
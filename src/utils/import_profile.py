@@ -0,0 +1,83 @@
+"""
+Import-time profile of the generator CLI (`main.py --import-profile`).
+
+Each measurement runs `python -X importtime` in a fresh interpreter, so
+nothing is already in sys.modules, and parses its per-module self and
+cumulative times. Startup is the cost of importing src.main; the stage
+modules main.py defers are imported afterwards in the same interpreter,
+so their times are what each adds on top of startup.
+"""
+
+import os
+import subprocess
+import sys
+from typing import List, NamedTuple, Sequence
+
+import config
+
+STARTUP_MODULE = "src.main"
+
+# Imported on demand by main.py's stages and by ContentGenerator (LLM on)
+DEFERRED_MODULES = (
+    "src.generators.users", "src.generators.teams", "src.generators.projects",
+    "src.generators.tasks", "src.generators.subtasks", "src.generators.comments",
+    "src.generators.custom_fields", "src.generators.tags", "src.utils.llm_utils",
+)
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int  # 0 for modules imported directly by the profiled code
+
+
+def profile_imports(modules: Sequence[str]) -> List[ImportTiming]:
+    """Import `modules` in order in a fresh interpreter and time every import."""
+    code = "; ".join(f"import {module}" for module in modules)
+    env = dict(os.environ, PYTHONPATH=str(config.BASE_DIR))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=config.BASE_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Profiling imports failed:\n{result.stderr[-2000:]}")
+
+    timings = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings.append(ImportTiming(name.strip(), int(self_us) / 1000, int(cumulative_us) / 1000, depth))
+    return timings
+
+
+def startup_ms(repeat: int = 3) -> float:
+    """Best-of-`repeat` cumulative import time of src.main, in milliseconds."""
+    best = None
+    for _ in range(repeat):
+        timings = profile_imports([STARTUP_MODULE])
+        total = next(t.cumulative_ms for t in timings if t.module == STARTUP_MODULE and t.depth == 0)
+        best = total if best is None else min(best, total)
+    return best
+
+
+def import_profile_lines(top: int = 20) -> List[str]:
+    """Human-readable report: slowest startup imports, then deferred stage modules."""
+    timings = profile_imports((STARTUP_MODULE,) + DEFERRED_MODULES)
+    roots = {t.module: t for t in timings if t.depth == 0}
+    # Everything before src.main's own line was imported during startup
+    startup_end = next(i for i, t in enumerate(timings) if t.module == STARTUP_MODULE and t.depth == 0)
+    startup = sorted(timings[:startup_end + 1], key=lambda t: t.self_ms, reverse=True)
+
+    lines = [f"Startup: import {STARTUP_MODULE} took {roots[STARTUP_MODULE].cumulative_ms:.1f} ms", ""]
+    lines.append(f"{'module':<44} {'self ms':>9} {'cumul. ms':>10}")
+    lines.append("-" * 65)
+    lines += [f"{t.module:<44} {t.self_ms:>9.1f} {t.cumulative_ms:>10.1f}" for t in startup[:top]]
+    lines += ["", "Deferred until a stage needs them (added on top of startup):"]
+    lines += [
+        f"{module:<44} {roots[module].cumulative_ms if module in roots else 0.0:>20.1f}"
+        for module in DEFERRED_MODULES
+    ]
+    return lines
@@ -0,0 +1,178 @@
+"""
+Persistent, content-addressed cache for LLM responses.
+
+Responses are stored in a small SQLite file keyed by a hash of everything that
+determines the output: model, rendered prompt, temperature, max_tokens and a
+sample index (the n-th request for the same prompt gets its own entry, so a
+project asking for 20 task names still gets 20 different cached names).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Dict, Optional
+
+import config
+from src.utils.metrics import count
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """SQLite-backed response cache with hit/miss counters and LRU eviction."""
+
+    # Buffered writes/touches before they are flushed (and eviction runs)
+    FLUSH_INTERVAL = 1000
+
+    def __init__(self, path: str = None, max_entries: int = None, read_only: bool = None):
+        """
+        Open the cache.
+
+        Args:
+            path: SQLite file (default LLM_CACHE_PATH)
+            max_entries: Least recently used entries beyond this are evicted
+            read_only: Serve hits but never write (for CI)
+        """
+        self.path = Path(path or config.LLM_CACHE_PATH)
+        self.max_entries = max_entries or config.LLM_CACHE_MAX_ENTRIES
+        self.read_only = config.LLM_CACHE_READ_ONLY if read_only is None else read_only
+        self.hits = 0
+        self.misses = 0
+        self.conn = None
+        # key -> (response, last_used) and key -> last_used, awaiting flush()
+        self._pending: Dict[str, tuple] = {}
+        self._touched: Dict[str, float] = {}
+
+        if self.read_only:
+            if self.path.exists():
+                self.conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+            else:
+                logger.warning(f"Read-only LLM cache not found at {self.path}; every lookup will miss")
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.path), timeout=30)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    response TEXT NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+            self.conn.execute("PRAGMA journal_mode = WAL")
+            self.conn.commit()
+
+    @staticmethod
+    def make_key(model: str, prompt: str, temperature: float, max_tokens: int, sample: int = 0) -> str:
+        """Fingerprint of every input that determines a response."""
+        payload = "\x1f".join((model, prompt, repr(float(temperature)), str(int(max_tokens)), str(sample)))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def key_for(self, samples: Dict[tuple, int], model: str, prompt: str, temperature: float, max_tokens: int) -> str:
+        """
+        Key for the next sample of a prompt, advancing the caller's counter.
+
+        Each generator instance keeps its own `samples` dict, so sample
+        indexes depend only on that generator's request order.
+        """
+        base = (model, prompt, temperature, max_tokens)
+        sample = samples.get(base, 0)
+        samples[base] = sample + 1
+        return self.make_key(model, prompt, temperature, max_tokens, sample)
+
+    def get(self, key: str) -> Optional[str]:
+        response = self._pending[key][0] if key in self._pending else None
+        if response is None and self.conn is not None:
+            row = self.conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            response = row[0] if row else None
+
+        if response is None:
+            self.misses += 1
+            count("llm_cache_misses")
+            return None
+
+        self.hits += 1
+        count("llm_cache_hits")
+        if not self.read_only:
+            self._touched[key] = time.time()
+            self._maybe_flush()
+        return response
+
+    def put(self, key: str, response: str):
+        if self.read_only or self.conn is None:
+            return
+        self._pending[key] = (response, time.time())
+        self._maybe_flush()
+
+    def _maybe_flush(self):
+        if len(self._pending) + len(self._touched) >= self.FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        """
+        Write buffered entries and LRU touches in one short transaction.
+
+        Buffering keeps write locks brief when several worker processes
+        share the cache file.
+        """
+        if self.read_only or self.conn is None or not (self._pending or self._touched):
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO responses (key, response, last_used) VALUES (?, ?, ?)",
+                [(key, response, used) for key, (response, used) in self._pending.items()]
+            )
+            self.conn.executemany(
+                "UPDATE responses SET last_used = ? WHERE key = ?",
+                [(used, key) for key, used in self._touched.items()]
+            )
+            self.evict()
+        self._pending.clear()
+        self._touched.clear()
+
+    def evict(self) -> int:
+        """Drop least recently used entries beyond max_entries."""
+        if self.read_only or self.conn is None:
+            return 0
+        count = self.conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        excess = count - self.max_entries
+        if excess <= 0:
+            return 0
+        self.conn.execute("""
+            DELETE FROM responses WHERE key IN (
+                SELECT key FROM responses ORDER BY last_used LIMIT ?
+            )
+        """, (excess,))
+        logger.debug(f"Evicted {excess} LLM cache entries")
+        return excess
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def close(self):
+        if self.conn is not None:
+            self.flush()
+            self.conn.close()
+            self.conn = None
+
+
+# Per-process singleton: forked workers must not share the parent's connection
+_cache = None
+_cache_pid = None
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """Get this process's cache, or None when LLM_CACHE_ENABLED is off."""
+    global _cache, _cache_pid
+    if not config.LLM_CACHE_ENABLED:
+        return None
+    if _cache is None or _cache_pid != os.getpid():
+        _cache = LLMResponseCache()
+        _cache_pid = os.getpid()
+        # Runs at interpreter exit and, unlike atexit, in pool worker processes too
+        Finalize(None, _cache.close, exitpriority=10)
+    return _cache
@@ -4,18 +4,27 @@ Supports Groq API.
 """
 
 import os
+import re
+import copy
+import asyncio
 import logging
 import random
-from typing import List, Optional
+from typing import Callable, List, Optional
 import time
 
+import numpy as np
+
 import config
+from src.utils.llm_cache import get_llm_cache
+from src.utils.metrics import count
+from src.utils.text_synth import get_text_synthesizer
 
 logger = logging.getLogger(__name__)
 
 # Try to import groq
 try:
-    from groq import Groq
+    import httpx
+    from groq import AsyncGroq
     GROQ_AVAILABLE = True
 except ImportError:
     GROQ_AVAILABLE = False
@@ -23,23 +32,69 @@ except ImportError:
 
 
 class LLMClient:
-    """Client for LLM-based text generation."""
+    """
+    Client for LLM-based text generation.
+    
+    Synchronous front end for the generators: every request goes through
+    this process's AsyncLLMClient, so it is rate limited, retried and (for
+    several prompts at once) sent concurrently.
+    """
     
     def __init__(self):
         self.enabled = config.ENABLE_LLM
-        self.client = None
+        self.cache = get_llm_cache()
+        self._samples = {}
+        self._rng = None
+        # Event loop and AsyncLLMClient of the current process, shared with
+        # forks; rebuilt in pool workers (see _runtime_for_process)
+        self._runtime = {}
         
         if self.enabled and GROQ_AVAILABLE and config.GROQ_API_KEY:
-            try:
-                self.client = Groq(api_key=config.GROQ_API_KEY)
+            if self._runtime_for_process()[1].client is not None:
                 logger.info("Groq client initialized successfully")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Groq client: {e}")
+            else:
                 self.enabled = False
         else:
             self.enabled = False
             logger.info("LLM disabled or not configured. Using fallback generation.")
     
+    def fork(self) -> "LLMClient":
+        """
+        Client sharing this one's connection but with its own cache sample
+        counters, so each generator's cache keys depend only on its own
+        request order.
+        """
+        forked = copy.copy(self)
+        forked._samples = {}
+        return forked
+    
+    def _runtime_for_process(self):
+        """(event loop, AsyncLLMClient) of this process, created on first use."""
+        runtime = self._runtime
+        if runtime.get("pid") != os.getpid():
+            # A forked worker must not reuse the parent's loop or connections
+            runtime.clear()
+            runtime.update(
+                pid=os.getpid(),
+                loop=asyncio.new_event_loop(),
+                client=AsyncLLMClient(fallback=self._fallback_generate),
+            )
+        return runtime["loop"], runtime["client"]
+    
+    def _request_many(
+        self,
+        prompts: List[str],
+        max_tokens: int = None,
+        temperature: float = None
+    ) -> List[Optional[str]]:
+        """Cached or generated text per prompt; None where the request failed (or the LLM is off)."""
+        if not prompts:
+            return []
+        loop, client = self._runtime_for_process()
+        return loop.run_until_complete(
+            client.generate_many(prompts, max_tokens, temperature, samples=self._samples, fallback=False)
+        )
+    
     def generate(
         self, 
         prompt: str, 
@@ -55,161 +110,344 @@ class LLMClient:
             temperature: Sampling temperature
             
         Returns:
-            Generated text string
+            Generated text string (fallback text if the request failed)
         """
-        if not self.enabled or not self.client:
-            return self._fallback_generate(prompt)
-        
-        max_tokens = max_tokens or config.LLM_MAX_TOKENS
-        temperature = temperature or config.LLM_TEMPERATURE
-        
-        try:
-            response = self.client.chat.completions.create(
-                model=config.GROQ_MODEL,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=temperature
-            )
-            return response.choices[0].message.content.strip()
-        except Exception as e:
-            logger.warning(f"LLM generation failed: {e}. Using fallback.")
-            return self._fallback_generate(prompt)
+        return self.generate_batch([prompt], max_tokens, temperature)[0]
     
     def generate_batch(
         self, 
         prompts: List[str], 
-        delay: float = 0.5
+        max_tokens: int = None,
+        temperature: float = None
     ) -> List[str]:
         """
-        Generate text for multiple prompts with rate limiting.
+        Generate text for multiple prompts concurrently.
+        
+        Requests go through AsyncLLMClient, bounded by LLM_MAX_CONCURRENCY
+        and the requests/tokens-per-minute buckets.
         
         Args:
             prompts: List of prompts
-            delay: Delay between requests in seconds
+            max_tokens: Maximum tokens per response
+            temperature: Sampling temperature
             
         Returns:
-            List of generated texts
+            List of generated texts, in the same order as prompts
+            (fallback text where a request failed)
         """
-        results = []
-        for i, prompt in enumerate(prompts):
-            result = self.generate(prompt)
-            results.append(result)
-            if i < len(prompts) - 1:
-                time.sleep(delay)
-        return results
+        texts = self._request_many(prompts, max_tokens, temperature)
+        return [text if text is not None else self._fallback_generate(prompt) for prompt, text in zip(prompts, texts)]
+    
+    def generate_items(
+        self,
+        render: Callable[[int, int], str],
+        count: int,
+        max_tokens: int = None,
+        temperature: float = None
+    ) -> List[str]:
+        """
+        Generate `count` list items, several per request.
+        
+        The items are split into requests of up to LLM_ITEMS_PER_REQUEST,
+        sent concurrently; items missing from short responses are
+        re-requested together in further concurrent rounds.
+        
+        Args:
+            render: render(offset, n) -> prompt asking for items offset..offset+n-1
+            count: Number of items wanted
+            max_tokens: Token budget per item (scaled by the items requested)
+            temperature: Sampling temperature
+            
+        Returns:
+            Exactly `count` items. A failed request has already been
+            retried by AsyncLLMClient and isn't sent again; short responses
+            are re-requested for their missing items up to MAX_RETRIES
+            times. Anything still missing is filled from the fallback.
+        """
+        per_item = max_tokens or config.LLM_MAX_TOKENS
+        size = max(config.LLM_ITEMS_PER_REQUEST, 1)
+        # One item list per request, filled in order from its offset
+        chunks = {offset: [] for offset in range(0, count, size)}
+        
+        def missing(offset):
+            return min(size, count - offset) - len(chunks[offset])
+        
+        pending = list(chunks)
+        for _ in range(config.MAX_RETRIES + 1):
+            if not pending:
+                break
+            prompts = [render(offset + len(chunks[offset]), missing(offset)) for offset in pending]
+            # Requests of one round share the largest token budget
+            budget = per_item * max(missing(offset) for offset in pending)
+            texts = self._request_many(prompts, max_tokens=budget, temperature=temperature)
+            for offset, text in zip(pending, texts):
+                if text is not None:
+                    chunks[offset].extend(parse_list_items(text)[:missing(offset)])
+            pending = [offset for offset, text in zip(pending, texts) if text is not None and missing(offset) > 0]
+        
+        items: List[str] = []
+        for offset, chunk in chunks.items():
+            items.extend(chunk)
+            while len(items) < min(offset + size, count):
+                items.append(self._fallback_generate(render(len(items), 1)))
+        return items
     
     def _fallback_generate(self, prompt: str) -> str:
         """Generate fallback text when LLM is not available."""
-        # Parse prompt to understand context
+        if self._rng is None:
+            self._rng = np.random.default_rng(random.getrandbits(64))
+        synthesizer = get_text_synthesizer()
         prompt_lower = prompt.lower()
         
-        if "task name" in prompt_lower or "task title" in prompt_lower:
-            return self._generate_fallback_task_name(prompt)
-        elif "description" in prompt_lower:
-            return self._generate_fallback_description(prompt)
+        if "description" in prompt_lower:
+            return synthesizer.descriptions(self._rng, 1)[0]
         elif "comment" in prompt_lower:
-            return self._generate_fallback_comment()
+            return synthesizer.comments(self._rng, 1)[0]
+        elif "task" in prompt_lower:
+            team_type = next(
+                (team for team in ("marketing", "operations") if team in prompt_lower), "product"
+            )
+            return synthesizer.task_names(self._rng, 1, team_type)[0]
         else:
             return "Generated content placeholder"
+
+
+# "1. ", "1) ", "Task 3: " and "- ", "* ", "• " style list markers
+_NUMBERED_MARKER = re.compile(r"^\s*(?:task\s*)?\d+\s*[.):]\s+", re.IGNORECASE)
+_BULLET_MARKER = re.compile(r"^\s*[-*•]\s+")
+_SEGMENT_SEPARATOR = re.compile(r"\s+[-–—]\s+")
+
+
+def _clean_item(item: str) -> str:
+    item = item.strip().strip('"\'').replace("**", "").strip()
+    # "[Component] - [Action] - [Detail]" -> "[Component] Action Detail"
+    segments = [segment.strip(" []") for segment in _SEGMENT_SEPARATOR.split(item)]
+    if len(segments) >= 2 and all(segments) and "\n" not in item:
+        return f"[{segments[0]}] {' '.join(segments[1:])}"
+    return item
+
+
+def parse_list_items(text: str) -> List[str]:
+    """
+    Split an LLM list response into items.
     
-    def _generate_fallback_task_name(self, prompt: str) -> str:
-        """Generate fallback task name."""
-        engineering_tasks = [
-            "Implement user authentication flow",
-            "Fix database connection pooling issue",
-            "Add unit tests for payment module",
-            "Refactor API error handling",
-            "Update dependency versions",
-            "Optimize database queries for dashboard",
-            "Add logging to background workers",
-            "Fix race condition in checkout process",
-            "Implement rate limiting for API",
-            "Add caching layer for user sessions",
-            "Review and update API documentation",
-            "Fix memory leak in image processing",
-            "Implement webhook retry mechanism",
-            "Add monitoring alerts for critical paths",
-            "Migrate legacy code to new framework"
-        ]
-        
-        marketing_tasks = [
-            "Create Q3 campaign assets",
-            "Update landing page copy",
-            "Design email newsletter template",
-            "Analyze competitor pricing strategies",
-            "Write blog post on industry trends",
-            "Schedule social media content",
-            "Review ad campaign performance",
-            "Create customer case study",
-            "Update brand guidelines document",
-            "Plan webinar content and slides"
-        ]
-        
-        operations_tasks = [
-            "Process monthly invoices",
-            "Update vendor contracts",
-            "Review compliance documentation",
-            "Conduct security audit review",
-            "Update employee handbook",
-            "Process customer refund requests",
-            "Prepare quarterly report",
-            "Coordinate team training session",
-            "Review and approve expenses",
-            "Update internal wiki documentation"
-        ]
-        
-        if "engineering" in prompt.lower() or "technical" in prompt.lower():
-            return random.choice(engineering_tasks)
-        elif "marketing" in prompt.lower():
-            return random.choice(marketing_tasks)
-        elif "operations" in prompt.lower():
-            return random.choice(operations_tasks)
-        else:
-            all_tasks = engineering_tasks + marketing_tasks + operations_tasks
-            return random.choice(all_tasks)
-    
-    def _generate_fallback_description(self, prompt: str) -> str:
-        """Generate fallback task description."""
-        descriptions = [
-            "",  # 20% empty
-            "",
-            "This task needs to be completed by end of sprint.",
-            "Follow up on the previous discussion and implement changes.",
-            "Review the requirements document before starting.",
-            "Coordinate with the team lead for clarifications.",
-            """This is a detailed task that requires:
-- Review of existing implementation
-- Analysis of edge cases
-- Unit test coverage
-- Documentation updates""",
-            "See attached specifications for details. Reach out if any questions.",
-            "Priority task for this sprint. Block time on calendar.",
-            "Dependency on API team. Check status before starting."
-        ]
-        return random.choice(descriptions)
-    
-    def _generate_fallback_comment(self) -> str:
-        """Generate fallback comment."""
-        comments = [
-            "Started working on this.",
-            "Made good progress today. Should be done by tomorrow.",
-            "Blocked on external dependency. Following up.",
-            "Completed the initial implementation. Ready for review.",
-            "Found some edge cases that need discussion.",
-            "Updated the approach based on feedback.",
-            "@team - please review when you get a chance",
-            "This is taking longer than expected due to complexity.",
-            "Done! Moving to the next task.",
-            "Need clarification on the requirements.",
-            "Pushed initial changes. Will continue tomorrow.",
-            "Had to refactor some existing code first.",
-            "All tests passing now.",
-            "Deployed to staging for testing.",
-            "Fixed the issues from code review."
-        ]
-        return random.choice(comments)
+    Handles numbered ("1." / "1)"), bulleted ("-", "*", "•") and plain
+    one-per-line output, as well as the "[Component] - [Action] - [Detail]"
+    format the task prompts ask for. Once any line is numbered or bulleted,
+    unmarked lines are kept only as a continuation of the item above them
+    (indented lines, and nested bullets in a numbered list); the rest is
+    preamble ("Here are 5 tasks") or trailing chatter and is dropped.
+    In plain output, lines ending in ":" are dropped as preamble.
+    """
+    lines = [line.rstrip() for line in text.strip().splitlines() if line.strip()]
+    if any(_NUMBERED_MARKER.match(line) for line in lines):
+        item_marker = _NUMBERED_MARKER
+    elif any(_BULLET_MARKER.match(line) for line in lines):
+        item_marker = _BULLET_MARKER
+    else:
+        return [_clean_item(line) for line in lines if not line.endswith(":")]
+    
+    items: List[str] = []
+    for line in lines:
+        marker = item_marker.match(line)
+        if marker:
+            items.append(line[marker.end():])
+        elif items and (line[0].isspace() or (item_marker is _NUMBERED_MARKER and _BULLET_MARKER.match(line))):
+            items[-1] += "\n" + line.strip()
+    return [_clean_item(item) for item in items if item.strip()]
+
+
+def estimate_tokens(prompt: str, max_tokens: int) -> int:
+    """Rough request cost for the token bucket: ~4 characters per prompt token."""
+    return len(prompt) // 4 + max_tokens
+
+
+class TokenBucket:
+    """
+    Asyncio token bucket refilled continuously at `per_minute` units/minute.
+    
+    Waiters queue on a lock, so requests are admitted in arrival order.
+    The level carries over between event loops; the lock is made per loop.
+    """
+    
+    def __init__(self, per_minute: float, capacity: float = None):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity or per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    async def acquire(self, amount: float = 1):
+        """Wait until `amount` units are available, then take them."""
+        amount = min(amount, self.capacity)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._lock = loop, asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+    
+    def adjust(self, delta: float):
+        """Charge (positive) or refund (negative) units after the fact."""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class AsyncLLMClient:
+    """
+    Concurrent LLM client with bounded in-flight requests and rate limiting.
+    
+    Every request takes one unit from the requests-per-minute bucket and its
+    estimated token cost from the tokens-per-minute bucket; the estimate is
+    corrected with the provider's reported usage once the response arrives.
+    The buckets last as long as the client, so limits hold across calls.
+    Each process has its own client (LLMClient makes one per pool worker),
+    so with several workers the provider sees up to that many times the
+    configured limits.
+    """
+    
+    def __init__(
+        self,
+        max_concurrency: int = None,
+        requests_per_minute: float = None,
+        tokens_per_minute: float = None,
+        max_retries: int = None,
+        fallback=None
+    ):
+        self.max_concurrency = max_concurrency or config.LLM_MAX_CONCURRENCY
+        self.requests_per_minute = requests_per_minute or config.LLM_REQUESTS_PER_MINUTE
+        self.tokens_per_minute = tokens_per_minute or config.LLM_TOKENS_PER_MINUTE
+        self.max_retries = config.MAX_RETRIES if max_retries is None else max_retries
+        self.fallback = fallback or get_llm_client()._fallback_generate
+        self.cache = get_llm_cache()
+        self._samples = {}
+        self.client = None
+        self._requests = TokenBucket(self.requests_per_minute)
+        self._tokens = TokenBucket(self.tokens_per_minute)
+        self._slots = None
+        self._loop = None
+        
+        if config.ENABLE_LLM and GROQ_AVAILABLE and config.GROQ_API_KEY:
+            try:
+                # Retries are ours (with retry-after and bucket accounting), not the SDK's;
+                # the connection pool is sized to the in-flight request limit
+                self.client = AsyncGroq(
+                    api_key=config.GROQ_API_KEY,
+                    base_url=config.GROQ_BASE_URL,
+                    max_retries=0,
+                    http_client=httpx.AsyncClient(
+                        limits=httpx.Limits(max_connections=self.max_concurrency)
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Failed to initialize async Groq client: {e}")
+    
+    async def _complete(self, prompt: str, max_tokens: int, temperature: float):
+        """Returns (text, True) from the provider or (None, False) once retries run out."""
+        # What the bucket actually takes (acquire caps it at the capacity)
+        estimate = min(estimate_tokens(prompt, max_tokens), self._tokens.capacity)
+        
+        for attempt in range(self.max_retries + 1):
+            await self._requests.acquire(1)
+            await self._tokens.acquire(estimate)
+            try:
+                count("llm_calls")
+                async with self._slots:
+                    response = await self.client.chat.completions.create(
+                        model=config.LLM_MODEL,
+                        messages=[{"role": "user", "content": prompt}],
+                        max_tokens=max_tokens,
+                        temperature=temperature
+                    )
+                text = response.choices[0].message.content
+                if text is None:
+                    raise ValueError("LLM response has no content")
+            except Exception as e:
+                # The attempt is over; give its token estimate back to the bucket
+                self._tokens.adjust(-estimate)
+                if attempt == self.max_retries:
+                    logger.warning(f"LLM generation failed after {attempt + 1} attempts: {e}")
+                    break
+                retry_after = getattr(getattr(e, "response", None), "headers", {}).get("retry-after")
+                delay = float(retry_after) if retry_after else config.LLM_RETRY_BACKOFF * 2 ** attempt
+                await asyncio.sleep(delay)
+                continue
+            
+            usage = getattr(response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self._tokens.adjust(usage.total_tokens - estimate)
+            return text.strip(), True
+        
+        return None, False
+    
+    async def generate(self, prompt: str, max_tokens: int = None, temperature: float = None) -> str:
+        """Generate text for one prompt (rate limited)."""
+        return (await self.generate_many([prompt], max_tokens, temperature))[0]
+    
+    async def generate_many(
+        self,
+        prompts: List[str],
+        max_tokens: int = None,
+        temperature: float = None,
+        samples: dict = None,
+        fallback: bool = True
+    ) -> List[Optional[str]]:
+        """
+        Generate text for many prompts concurrently.
+        
+        Args:
+            samples: Cache sample counters to key responses with (default
+                this client's own; see LLMClient.fork)
+            fallback: Fill failed requests with fallback text; if False
+                they come back as None
+        
+        Returns:
+            Generated texts in the same order as prompts
+        """
+        max_tokens = max_tokens or config.LLM_MAX_TOKENS
+        temperature = config.LLM_TEMPERATURE if temperature is None else temperature
+        samples = self._samples if samples is None else samples
+        
+        # Serve what we can from the cache; only misses go to the provider
+        results: List[Optional[str]] = [None] * len(prompts)
+        keys: List[Optional[str]] = [None] * len(prompts)
+        if self.cache is not None:
+            for i, prompt in enumerate(prompts):
+                keys[i] = self.cache.key_for(samples, config.LLM_MODEL, prompt, temperature, max_tokens)
+                results[i] = self.cache.get(keys[i])
+        misses = [i for i, result in enumerate(results) if result is None]
+        
+        if self.client is None:
+            for i in misses:
+                results[i] = self.fallback(prompts[i]) if fallback else None
+            return results
+        
+        # The semaphore is bound to the running event loop
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._slots = loop, asyncio.Semaphore(self.max_concurrency)
+        
+        generated = await asyncio.gather(*(
+            self._complete(prompts[i], max_tokens, temperature) for i in misses
+        ))
+        for i, (text, from_llm) in zip(misses, generated):
+            if from_llm:
+                results[i] = text
+                if keys[i] is not None:
+                    self.cache.put(keys[i], text)
+            elif fallback:
+                results[i] = self.fallback(prompts[i])
+        return results
 
 
 # Singleton instance
@@ -221,4 +459,10 @@ def get_llm_client() -> LLMClient:
     global _llm_client
     if _llm_client is None:
         _llm_client = LLMClient()
-    return _llm_client
\ No newline at end of file
+    return _llm_client
+
+
+def reset_llm_client():
+    """Drop the singleton, so the next get_llm_client() picks up changed LLM settings."""
+    global _llm_client
+    _llm_client = None
\ No newline at end of file
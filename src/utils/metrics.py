@@ -0,0 +1,138 @@
+"""
+Run instrumentation: process-wide counters and the per-stage generation report.
+
+Counters (LLM calls, cache hits, ...) are plain per-process tallies;
+map_shards ships each pool worker's deltas back to the parent, so the
+parent's COUNTERS cover the whole run.
+"""
+
+import json
+import logging
+import os
+import resource
+import time
+import tracemalloc
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import config
+
+logger = logging.getLogger(__name__)
+
+COUNTERS: Counter = Counter()
+
+# Counters reported per stage
+REPORTED_COUNTERS = ("llm_calls", "llm_cache_hits", "llm_cache_misses")
+
+
+def count(name: str, n: int = 1):
+    COUNTERS[name] += n
+
+
+def merge_counters(delta: Dict[str, int]):
+    """Add counter deltas reported by a worker process."""
+    COUNTERS.update(delta)
+
+
+def call_counted(func: Callable[[Any], Any], item: Any) -> Tuple[Any, Dict[str, int]]:
+    """Run func(item) and return its result with the counter changes it made."""
+    before = COUNTERS.copy()
+    result = func(item)
+    delta = COUNTERS.copy()
+    delta.subtract(before)
+    return result, {name: n for name, n in delta.items() if n}
+
+
+def _rss_peak_mb() -> float:
+    """High-water mark of this process's resident set size so far."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+def _cpu_seconds() -> float:
+    """CPU time of this process plus its reaped children (pool workers)."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+class GenerationReport:
+    """
+    Per-stage timings and resource use for one generation run.
+
+    Each stage() block records wall and CPU time, rows written
+    (DatabaseManager.total_changes, background writers included), the RSS
+    high-water mark and (with trace_memory) tracemalloc peak of this
+    process, LLM counters and growth of the database's used pages.
+    """
+
+    def __init__(self, db_manager, trace_memory: bool = None):
+        self.db = db_manager
+        self.trace_memory = config.REPORT_TRACE_MEMORY if trace_memory is None else trace_memory
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.stages: List[Dict[str, Any]] = []
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def _db_size(self) -> int:
+        """Bytes in use by the database (the file itself may hold free pages)."""
+        conn = self.db.conn
+        pages = conn.execute("PRAGMA page_count").fetchone()[0] - conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return pages * conn.execute("PRAGMA page_size").fetchone()[0]
+
+    @contextmanager
+    def stage(self, name: str):
+        """Instrument the enclosed block as stage `name`."""
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        counters_before = COUNTERS.copy()
+        changes_before = self.db.total_changes
+        size_before = self._db_size()
+        cpu_before = _cpu_seconds()
+        wall_before = time.perf_counter()
+
+        yield
+
+        wall = time.perf_counter() - wall_before
+        rows = self.db.total_changes - changes_before
+        record = {
+            'stage': name,
+            'wall_s': round(wall, 3),
+            'cpu_s': round(_cpu_seconds() - cpu_before, 3),
+            'rows_written': rows,
+            'rows_per_s': round(rows / wall, 1) if wall > 0 else 0.0,
+            'py_peak_mb': round(tracemalloc.get_traced_memory()[1] / 2**20, 2) if self.trace_memory else None,
+            'rss_peak_mb': round(_rss_peak_mb(), 1),
+            'db_growth_bytes': self._db_size() - size_before,
+        }
+        for counter in REPORTED_COUNTERS:
+            record[counter] = COUNTERS[counter] - counters_before[counter]
+        self.stages.append(record)
+        logger.debug(f"Stage {name}: {record}")
+
+    def totals(self) -> Dict[str, Any]:
+        summed = ('wall_s', 'cpu_s', 'rows_written', 'db_growth_bytes') + REPORTED_COUNTERS
+        totals = {key: sum(stage[key] for stage in self.stages) for key in summed}
+        totals['wall_s'] = round(totals['wall_s'], 3)
+        totals['cpu_s'] = round(totals['cpu_s'], 3)
+        totals['rows_per_s'] = round(totals['rows_written'] / totals['wall_s'], 1) if totals['wall_s'] else 0.0
+        peaks = [stage['py_peak_mb'] for stage in self.stages if stage['py_peak_mb'] is not None]
+        totals['py_peak_mb'] = max(peaks) if peaks else None
+        totals['rss_peak_mb'] = max((stage['rss_peak_mb'] for stage in self.stages), default=0.0)
+        return totals
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started_at': self.started_at,
+            'db_path': str(self.db.db_path),
+            'stages': self.stages,
+            'totals': self.totals(),
+        }
+
+    def write(self, path: Path = None) -> Path:
+        """Write the report as JSON (default REPORT_PATH)."""
+        path = Path(path or config.REPORT_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.to_dict(), indent=2))
+        return path
@@ -0,0 +1,336 @@
+"""
+Local Groq-compatible mock server for offline LLM throughput testing.
+
+Speaks the chat-completions shape LLMClient/AsyncLLMClient use
+(POST /openai/v1/chat/completions) and answers with canned content sized to
+what the prompt asks for, after a simulated delay. Latency distribution,
+generation speed and 429/5xx injection are configurable, so concurrency,
+rate limiting, retries and caching can be tuned without a live service.
+
+Usage:
+    python -m src.utils.mock_llm_server --port 8765 --latency lognormal --latency-ms 300
+    GROQ_BASE_URL=http://127.0.0.1:8765 ENABLE_LLM=true python src/main.py
+
+See src/benchmark_llm.py for the benchmark driver.
+"""
+
+import argparse
+import json
+import logging
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+COMPLETIONS_PATH = "/openai/v1/chat/completions"
+
+# Prompts ask for "a list of 5 ..." or "each of these 5 tasks"
+_COUNT_RE = re.compile(r"(?:list of|these)\s+(\d+)\b", re.IGNORECASE)
+
+_COMPONENTS = ["Auth", "Billing", "API", "Dashboard", "Search", "Notifications", "Onboarding", "Reporting"]
+_ACTIONS = ["Implement", "Fix", "Refactor", "Design", "Test", "Document", "Migrate", "Review"]
+_DETAILS = [
+    "token refresh logic", "pagination edge cases", "retry handling", "empty state copy",
+    "CSV export", "permission checks", "rate limit headers", "audit logging",
+]
+_COMMENTS = [
+    "Started on this, will share a draft by tomorrow.",
+    "Blocked on the API contract, following up with the platform team.",
+    "PR is up and ready for review.",
+    "Can we clarify the acceptance criteria before I continue?",
+    "Done, moving on to the follow-up task.",
+]
+
+
+class LatencyModel:
+    """Per-request delay: fixed, uniform or lognormal around a median."""
+
+    KINDS = ("fixed", "uniform", "lognormal")
+
+    def __init__(self, kind: str = "lognormal", median_ms: float = 250.0, spread: float = 0.5):
+        """
+        Args:
+            kind: One of KINDS
+            median_ms: Median time to first token, in milliseconds
+            spread: uniform: +/- fraction of the median; lognormal: sigma
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown latency distribution: {kind}")
+        self.kind = kind
+        self.median_ms = median_ms
+        self.spread = spread
+
+    def sample(self, rng: random.Random) -> float:
+        """Delay in seconds."""
+        if self.kind == "fixed":
+            ms = self.median_ms
+        elif self.kind == "uniform":
+            ms = self.median_ms * rng.uniform(1 - self.spread, 1 + self.spread)
+        else:
+            ms = self.median_ms * math.exp(rng.gauss(0, self.spread))
+        return max(ms, 0.0) / 1000
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100); 0.0 for no values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class MockLLMServer:
+    """Threaded HTTP server answering chat completions with canned content."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: LatencyModel = None,
+        tokens_per_second: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        server_error_rate: float = 0.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one; see .url)
+            latency: Time-to-first-token model
+            tokens_per_second: Simulated generation speed (0 = instant)
+            rate_limit_rate: Fraction of requests answered 429 with retry-after
+            server_error_rate: Fraction of requests answered 500/503
+            retry_after: retry-after header value for 429s, in seconds
+            seed: Seed for latency, error and content draws
+        """
+        self.latency = latency or LatencyModel()
+        self.tokens_per_second = tokens_per_second
+        self.rate_limit_rate = rate_limit_rate
+        self.server_error_rate = server_error_rate
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._records: List[tuple] = []
+        self._thread: Optional[threading.Thread] = None
+
+        self.httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self.httpd.daemon_threads = True
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockLLMServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Mock LLM server listening on {self.url}")
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ----------------------
+    # Request handling
+    # ----------------------
+
+    def _draw(self, func, *args):
+        with self._lock:
+            return func(*args)
+
+    def handle(self, payload: Dict) -> tuple:
+        """Returns (status, headers, body) for one chat-completions request."""
+        roll = self._draw(self._rng.random)
+        if roll < self.rate_limit_rate:
+            error = {"error": {"message": "Rate limit reached", "type": "rate_limit_exceeded"}}
+            return 429, {"retry-after": str(self.retry_after)}, error
+        if roll < self.rate_limit_rate + self.server_error_rate:
+            status = self._draw(self._rng.choice, (500, 503))
+            return status, {}, {"error": {"message": "Mock upstream error", "type": "server_error"}}
+
+        prompt = payload["messages"][-1]["content"]
+        max_tokens = int(payload.get("max_tokens") or 1024)
+        content = self._draw(self._canned_response, prompt)
+
+        completion_tokens = max(len(content) // 4, 1)
+        finish_reason = "stop"
+        if completion_tokens > max_tokens:
+            content = content[:max_tokens * 4]
+            completion_tokens = max_tokens
+            finish_reason = "length"
+
+        delay = self._draw(self.latency.sample, self._rng)
+        if self.tokens_per_second > 0:
+            delay += completion_tokens / self.tokens_per_second
+        time.sleep(delay)
+
+        prompt_tokens = max(len(prompt) // 4, 1)
+        body = {
+            "id": f"chatcmpl-mock-{self._draw(self._rng.getrandbits, 48):012x}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": payload.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": finish_reason,
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+        return 200, {}, body
+
+    def _canned_response(self, prompt: str) -> str:
+        """Content shaped like what the prompt asks for (caller holds the lock)."""
+        rng = self._rng
+        match = _COUNT_RE.search(prompt)
+        count = int(match.group(1)) if match else 1
+        lowered = prompt.lower()
+
+        if "description" in lowered:
+            items = [
+                f"Context: needed for the upcoming release. Acceptance criteria: "
+                f"{rng.choice(_DETAILS)} is covered by tests and reviewed."
+                for _ in range(count)
+            ]
+        elif "comment" in lowered:
+            items = [rng.choice(_COMMENTS) for _ in range(count)]
+        else:
+            items = [
+                f"{rng.choice(_COMPONENTS)} - {rng.choice(_ACTIONS)} - {rng.choice(_DETAILS)}"
+                for _ in range(count)
+            ]
+
+        if "numbered list" in lowered:
+            return "\n".join(f"{i + 1}. {item}" for i, item in enumerate(items))
+        return "\n".join(items)
+
+    # ----------------------
+    # Stats
+    # ----------------------
+
+    def record(self, status: int, seconds: float):
+        with self._lock:
+            self._records.append((status, seconds))
+
+    def reset_stats(self):
+        with self._lock:
+            self._records.clear()
+
+    def stats(self) -> Dict:
+        """Request count, status breakdown and p50/p99 latency (ms) since the last reset."""
+        with self._lock:
+            records = list(self._records)
+        latencies = [seconds * 1000 for _, seconds in records]
+        statuses: Dict[int, int] = {}
+        for status, _ in records:
+            statuses[status] = statuses.get(status, 0) + 1
+        return {
+            "requests": len(records),
+            "statuses": statuses,
+            "p50_ms": percentile(latencies, 50),
+            "p99_ms": percentile(latencies, 99),
+        }
+
+
+def _make_handler(server: MockLLMServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            started = time.perf_counter()
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError:
+                payload = None
+
+            if self.path.rstrip("/") != COMPLETIONS_PATH:
+                status, headers, body = 404, {}, {"error": {"message": f"Unknown path {self.path}"}}
+            elif not payload or not payload.get("messages"):
+                status, headers, body = 400, {}, {"error": {"message": "messages is required"}}
+            else:
+                status, headers, body = server.handle(payload)
+
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+            server.record(status, time.perf_counter() - started)
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return Handler
+
+
+def add_server_arguments(parser: argparse.ArgumentParser):
+    """Mock server options, shared with the benchmark script."""
+    parser.add_argument('--latency', choices=LatencyModel.KINDS, default='lognormal',
+                        help="Time-to-first-token distribution")
+    parser.add_argument('--latency-ms', type=float, default=250.0, help="Median latency in ms")
+    parser.add_argument('--latency-spread', type=float, default=0.5,
+                        help="uniform: +/- fraction of the median; lognormal: sigma")
+    parser.add_argument('--tokens-per-second', type=float, default=0.0,
+                        help="Simulated generation speed (0 = instant)")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="Fraction of 429 responses")
+    parser.add_argument('--server-error-rate', type=float, default=0.0, help="Fraction of 500/503 responses")
+    parser.add_argument('--retry-after', type=float, default=1.0, help="retry-after seconds on 429s")
+    parser.add_argument('--seed', type=int, default=0)
+
+
+def server_from_args(args, host: str = "127.0.0.1", port: int = 0) -> MockLLMServer:
+    return MockLLMServer(
+        host=host,
+        port=port,
+        latency=LatencyModel(args.latency, args.latency_ms, args.latency_spread),
+        tokens_per_second=args.tokens_per_second,
+        rate_limit_rate=args.rate_limit_rate,
+        server_error_rate=args.server_error_rate,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local Groq-compatible mock LLM server.")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8765)
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    server = server_from_args(args, args.host, args.port)
+    logger.info(f"Mock LLM server listening on {server.url} (set GROQ_BASE_URL={server.url})")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
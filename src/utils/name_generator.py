@@ -1,24 +1,180 @@
-import pandas as pd
+"""
+Person names weighted by census frequency.
+
+first_names.csv / last_names.csv hold a `name` column and optionally a
+frequency column (count, frequency, prop100k, percent or weight; rows
+without one weigh the same). Each list becomes an alias table, built
+once (Vose's method) so every draw is O(1) however many names there are.
+The built tables are cached in NAME_CACHE_PATH as plain .npz arrays and
+reused while the CSVs are unchanged, so later starts skip CSV parsing.
+"""
+
+import csv
+import logging
+import os
 import random
-from config import BASE_DIR
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Frequency columns recognised in the name CSVs, in order of preference
+WEIGHT_COLUMNS = ("count", "frequency", "prop100k", "percent", "weight")
+
+# Used when the CSVs are missing or empty (1990 census, % of population)
+FALLBACK_FIRST_NAMES = {
+    "James": 3.318, "Mary": 2.629, "John": 3.271, "Patricia": 1.073, "Robert": 3.143, "Jennifer": 0.932,
+}
+FALLBACK_LAST_NAMES = {
+    "Smith": 1.006, "Johnson": 0.810, "Williams": 0.699, "Brown": 0.621, "Jones": 0.621, "Garcia": 0.254,
+}
+
+# Bump when the cache layout changes
+_CACHE_VERSION = 1
+
+
+class AliasTable:
+    """Weighted sampler with O(1) draws (Walker/Vose alias method)."""
+
+    __slots__ = ("values", "prob", "alias")
+
+    def __init__(self, values: np.ndarray, prob: np.ndarray, alias: np.ndarray):
+        self.values = values
+        self.prob = prob
+        self.alias = alias
+
+    @classmethod
+    def build(cls, values: Sequence[str], weights: Sequence[float]) -> "AliasTable":
+        n = len(values)
+        total = float(np.sum(weights))
+        scaled = [weight * n / total for weight in weights]
+        prob = np.ones(n)
+        alias = np.arange(n, dtype=np.int32)
+
+        small = [i for i in range(n) if scaled[i] < 1.0]
+        large = [i for i in range(n) if scaled[i] >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] -= 1.0 - scaled[s]
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Whatever is left has probability 1 up to rounding
+
+        return cls(np.array(values, dtype=object), prob, alias)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """n values drawn with a NumPy generator."""
+        column = rng.integers(0, len(self.values), n)
+        keep = rng.random(n) < self.prob[column]
+        return self.values[np.where(keep, column, self.alias[column])]
+
+    def draw(self, rng=random) -> str:
+        """One value drawn with a stdlib Random."""
+        column = int(rng.random() * len(self.values))
+        return self.values[column if rng.random() < self.prob[column] else self.alias[column]]
+
+
+def _read_names(path: Path) -> Tuple[List[str], List[float]]:
+    """Names and weights from a census CSV (empty lists if missing or empty)."""
+    weights = {}
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or "name" not in reader.fieldnames:
+                return [], []
+            weight_column = next((c for c in WEIGHT_COLUMNS if c in reader.fieldnames), None)
+            for row in reader:
+                name = row["name"].strip()
+                if not name:
+                    continue
+                # Census files are upper case; the same name may appear per sex
+                name = name.title() if name.isupper() else name
+                weight = float(row[weight_column] or 0) if weight_column else 1.0
+                weights[name] = weights.get(name, 0.0) + weight
+    except (FileNotFoundError, ValueError) as e:
+        logger.warning(f"Could not read names from {path.name}: {e}")
+        return [], []
+    names = [name for name, weight in weights.items() if weight > 0]
+    return names, [weights[name] for name in names]
+
+
+def _pack(values: np.ndarray) -> np.ndarray:
+    return np.frombuffer("\n".join(values).encode("utf-8"), dtype=np.uint8)
+
+
+def _unpack(blob: np.ndarray) -> np.ndarray:
+    return np.array(blob.tobytes().decode("utf-8").split("\n"), dtype=object)
+
 
 class NameGenerator:
-    def __init__(self):
-        self.first_names = []
-        self.last_names = []
-        self._load_data()
+    def __init__(self, data_dir: Path = None, cache_path: Path = None):
+        """
+        Args:
+            data_dir: Directory with first_names.csv and last_names.csv
+            cache_path: Alias table cache (default NAME_CACHE_PATH)
+        """
+        data_dir = Path(data_dir or config.BASE_DIR / "data")
+        self.cache_path = Path(cache_path or config.NAME_CACHE_PATH)
+        self.sources = (data_dir / "first_names.csv", data_dir / "last_names.csv")
+        self.first_names, self.last_names = self._load_tables()
+
+    def _signature(self) -> np.ndarray:
+        """Identifies the CSV contents the cache was built from."""
+        stamp = [_CACHE_VERSION]
+        for path in self.sources:
+            stat = path.stat() if path.exists() else None
+            stamp += [stat.st_size, stat.st_mtime_ns] if stat else [-1, -1]
+        return np.array(stamp, dtype=np.int64)
 
-    def _load_data(self):
-        # Load from CSVs in /data directory
+    def _load_tables(self) -> Tuple[AliasTable, AliasTable]:
+        signature = self._signature()
         try:
-            df_first = pd.read_csv(BASE_DIR / "data" / "first_names.csv")
-            df_last = pd.read_csv(BASE_DIR / "data" / "last_names.csv")
-            self.first_names = df_first['name'].tolist()
-            self.last_names = df_last['name'].tolist()
-        except Exception:
-            # Fallback if files missing
-            self.first_names = ["James", "Mary", "John", "Patricia", "Robert", "Jennifer"]
-            self.last_names = ["Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia"]
-
-    def generate_full_name(self):
-        return f"{random.choice(self.first_names)} {random.choice(self.last_names)}"
\ No newline at end of file
+            with np.load(self.cache_path, allow_pickle=False) as cached:
+                if np.array_equal(cached["signature"], signature):
+                    return tuple(
+                        AliasTable(_unpack(cached[f"{kind}_values"]), cached[f"{kind}_prob"], cached[f"{kind}_alias"])
+                        for kind in ("first", "last")
+                    )
+        except (OSError, KeyError, ValueError):
+            pass
+
+        tables = []
+        for path, fallback in zip(self.sources, (FALLBACK_FIRST_NAMES, FALLBACK_LAST_NAMES)):
+            names, weights = _read_names(path)
+            if not names:
+                # Fallback if files missing
+                names, weights = list(fallback), list(fallback.values())
+            tables.append(AliasTable.build(names, weights))
+
+        self._save_tables(signature, *tables)
+        return tuple(tables)
+
+    def _save_tables(self, signature: np.ndarray, first: AliasTable, last: AliasTable):
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        partial = self.cache_path.with_suffix(f".{os.getpid()}.partial.npz")
+        np.savez(
+            partial, signature=signature,
+            first_values=_pack(first.values), first_prob=first.prob, first_alias=first.alias,
+            last_values=_pack(last.values), last_prob=last.prob, last_alias=last.alias,
+        )
+        partial.replace(self.cache_path)
+        logger.debug(f"Cached name tables ({len(first)} first, {len(last)} last names)")
+
+    def generate_full_name(self, rng=random) -> str:
+        return f"{self.first_names.draw(rng)} {self.last_names.draw(rng)}"
+
+    def generate_names(self, n: int, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """First and last names of n people, as object arrays."""
+        return self.first_names.sample(rng, n), self.last_names.sample(rng, n)
+
+    def generate_full_names(self, n: int, rng: np.random.Generator) -> np.ndarray:
+        first, last = self.generate_names(n, rng)
+        return first + " " + last
@@ -0,0 +1,135 @@
+"""
+Deterministic process-pool helpers for per-project generation.
+
+Every shard of work (a project within a stage) draws from its own RNG stream
+derived from config.RANDOM_SEED and a stable key, so results don't depend on
+which process ran the shard or how many workers there were.
+"""
+
+import random
+import tracemalloc
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import Any, Callable, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+import config
+from src.utils.metrics import call_counted, merge_counters
+
+
+# Read-only data shared with every shard (assignee pools, reference time, ...),
+# installed once per worker process by map_shards' initializer.
+_WORKER_CONTEXT = {}
+
+
+def init_worker_context(context: dict):
+    """Process-pool initializer that installs the shared worker context."""
+    global _WORKER_CONTEXT
+    _WORKER_CONTEXT = context
+
+
+def _init_pool_worker(context: dict):
+    init_worker_context(context)
+    # Forked workers inherit the parent's tracing; only the parent reports peaks
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+def worker_context() -> dict:
+    return _WORKER_CONTEXT
+
+
+def _key_to_ints(key: Tuple[Any, ...]) -> Tuple[int, ...]:
+    """Map a key of strings/ints to ints stable across processes and runs."""
+    return tuple(
+        part if isinstance(part, int) else zlib.crc32(str(part).encode("utf-8"))
+        for part in key
+    )
+
+
+def derive_seed_sequence(*key) -> np.random.SeedSequence:
+    """SeedSequence for a key such as ("tasks", project_index)."""
+    return np.random.SeedSequence(config.RANDOM_SEED, spawn_key=_key_to_ints(key))
+
+
+def derive_rng(*key) -> np.random.Generator:
+    """Independent NumPy generator for a key such as ("tasks", project_index)."""
+    return np.random.default_rng(derive_seed_sequence(*key))
+
+
+def derive_random(*key) -> random.Random:
+    """Independent stdlib Random for a key, for code built on random.choice."""
+    return random.Random(int(derive_seed_sequence(*key).generate_state(2, np.uint64)[0]))
+
+
+@contextmanager
+def worker_pool(workers: int = 1, context: Optional[dict] = None) -> Iterator[Optional[ProcessPoolExecutor]]:
+    """
+    Process pool for map_shards, started before the block runs.
+
+    Workers are forked up front (the pool otherwise forks on first
+    submit), so callers can open one before starting threads such as a
+    BackgroundWriter: a process forked while a thread is mid-write copies
+    the locks that thread holds. Yields None when workers <= 1.
+    """
+    if workers <= 1:
+        yield None
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_pool_worker, initargs=(context or {},)
+    ) as pool:
+        pool.submit(int).result()
+        yield pool
+
+
+def map_shards(
+    func: Callable[[Any], Any],
+    items: Iterable[Any],
+    workers: int = 1,
+    context: Optional[dict] = None,
+    chunksize: int = 4,
+    pool: Optional[ProcessPoolExecutor] = None,
+) -> Iterator[Any]:
+    """
+    Apply func to each item, in a process pool when workers > 1.
+
+    Results are yielded in input order so a single writer in the parent
+    process inserts rows in the same order regardless of worker count.
+    With workers <= 1 everything runs in-process. `context` is made
+    available to func through worker_context().
+
+    At most workers * chunksize items are in flight, so a lazy `items`
+    stream is pulled only as fast as results are consumed (unlike
+    Executor.map, which submits the whole input up front). Counters
+    (src.utils.metrics) incremented in workers are merged into this process.
+    A pool from worker_pool (made with the same workers and context) is
+    used as is; otherwise one is made for the call.
+    """
+    if pool is None and workers > 1:
+        with worker_pool(workers, context) as pool:
+            yield from map_shards(func, items, workers, context, chunksize, pool)
+        return
+    if pool is None:
+        init_worker_context(context or {})
+        yield from map(func, items)
+        return
+
+    def collect(future):
+        result, counters = future.result()
+        merge_counters(counters)
+        return result
+
+    window = workers * chunksize
+    counted = partial(call_counted, func)
+    pending = deque()
+    for item in items:
+        pending.append(pool.submit(counted, item))
+        if len(pending) >= window:
+            yield collect(pending.popleft())
+    while pending:
+        yield collect(pending.popleft())
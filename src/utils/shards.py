@@ -0,0 +1,117 @@
+"""
+Sharded output: per-team SQLite files and the ATTACH-based merge.
+
+Every shard is a complete database with the schema.sql layout. Rows that
+every shard generates identically (organization, teams, users, seed
+initiatives/workstreams, tags) are merged with INSERT OR IGNORE; rows owned
+by a shard's projects must not collide and are checked before being copied.
+"""
+
+import logging
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Tables whose rows belong to exactly one shard (they hang off projects)
+SHARDED_TABLES = (
+    "projects", "sections", "tasks", "subtasks", "comments",
+    "custom_field_definitions", "custom_field_values", "task_tags",
+)
+
+
+class ShardMergeError(Exception):
+    """Raised when shards can't be merged (key collisions, missing tables)."""
+
+
+def shard_path(team_id: str) -> Path:
+    """Output file for a team shard, e.g. output/shards/team_pd.sqlite."""
+    return config.SHARD_DIR / f"{team_id}.sqlite"
+
+
+def _primary_key(db_manager, schema: str, table: str) -> str:
+    rows = db_manager.fetch_all(f"PRAGMA {schema}.table_info({table})")
+    return next(row["name"] for row in rows if row["pk"] == 1)
+
+
+def _tables(db_manager, schema: str) -> List[str]:
+    """
+    Tables in creation order, so parents are copied before children.
+
+    Bookkeeping tables (leading underscore, e.g. _checkpoints) describe one
+    run's file and are never merged.
+    """
+    return [
+        row["name"] for row in db_manager.fetch_all(
+            f"SELECT name FROM {schema}.sqlite_master "
+            f"WHERE type = 'table' AND name NOT LIKE 'sqlite_%' AND name NOT LIKE '\\_%' ESCAPE '\\' "
+            f"ORDER BY rowid"
+        )
+    ]
+
+
+def merge_shards(db_manager, shard_paths: Sequence[str]) -> Dict[str, int]:
+    """
+    Copy every shard into the database behind db_manager.
+
+    The target must already have the schema's tables. Each shard is
+    ATTACHed and copied table by table with INSERT ... SELECT inside one
+    transaction per shard.
+
+    Args:
+        db_manager: DatabaseManager for the merged output
+        shard_paths: Shard SQLite files
+
+    Returns:
+        Rows copied per table
+
+    Raises:
+        ShardMergeError: If a sharded table's primary key already exists
+            in the target
+    """
+    target_tables = _tables(db_manager, "main")
+    copied = {table: 0 for table in target_tables}
+
+    for path in shard_paths:
+        if not Path(path).exists():
+            raise ShardMergeError(f"Shard not found: {path}")
+
+        db_manager.commit()
+        db_manager.execute("ATTACH DATABASE ? AS shard", (str(path),))
+        try:
+            shard_tables = set(_tables(db_manager, "shard"))
+            with db_manager.transaction():
+                for table in target_tables:
+                    if table not in shard_tables:
+                        raise ShardMergeError(f"{path} has no table {table}")
+
+                    columns = ", ".join(
+                        row["name"] for row in db_manager.fetch_all(f"PRAGMA main.table_info({table})")
+                    )
+
+                    if table in SHARDED_TABLES:
+                        key = _primary_key(db_manager, "main", table)
+                        collisions = db_manager.fetch_one(
+                            f"SELECT COUNT(*) FROM shard.{table} "
+                            f"WHERE {key} IN (SELECT {key} FROM main.{table})"
+                        )[0]
+                        if collisions:
+                            raise ShardMergeError(
+                                f"{collisions} duplicate {table}.{key} values in {path}"
+                            )
+                        verb = "INSERT"
+                    else:
+                        verb = "INSERT OR IGNORE"
+
+                    cursor = db_manager.execute(
+                        f"{verb} INTO main.{table} ({columns}) SELECT {columns} FROM shard.{table}"
+                    )
+                    copied[table] += cursor.rowcount
+        finally:
+            db_manager.execute("DETACH DATABASE shard")
+
+        logger.info(f"Merged shard {path}")
+
+    return copied
@@ -0,0 +1,139 @@
+"""
+Content-addressed cache of stage outputs across runs.
+
+A stage's key hashes everything its output depends on: the config values
+it declares, the keys of its upstream stages (so a change propagates
+downstream), RANDOM_SEED and a fingerprint of the generator code, prompts
+and data files. A finished stage's tables are snapshotted into
+STAGE_CACHE_DIR/<stage>-<key>.sqlite; a later run with the same key copies
+them back with INSERT ... SELECT instead of regenerating them.
+
+Changing COMMENT_PROBABILITY, say, changes only the comments key, so users,
+projects, tasks and subtasks are restored and just the comments stage runs.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Sequence
+
+import config
+
+logger = logging.getLogger(__name__)
+
+# Files whose contents can change any stage's output
+_CODE_GLOBS = ("src/**/*.py", "prompts/*", "data/*", "schema.sql")
+
+_code_fingerprint = None
+
+
+def code_fingerprint() -> str:
+    """Hash of the generator code, prompts and data files (computed once per process)."""
+    global _code_fingerprint
+    if _code_fingerprint is None:
+        digest = hashlib.sha256()
+        paths = sorted({path for pattern in _CODE_GLOBS for path in config.BASE_DIR.glob(pattern) if path.is_file()})
+        for path in paths:
+            digest.update(str(path.relative_to(config.BASE_DIR)).encode("utf-8"))
+            digest.update(path.read_bytes())
+        _code_fingerprint = digest.hexdigest()
+    return _code_fingerprint
+
+
+class StageCache:
+    """Snapshot files of stage tables, keyed by the stage's inputs."""
+
+    # Sentinel returned by restore() on a miss (None is a valid payload)
+    MISS = object()
+
+    def __init__(self, db_manager, cache_dir: str = None, keep: int = None):
+        """
+        Args:
+            db_manager: DatabaseManager of the database being generated
+            cache_dir: Snapshot directory (default STAGE_CACHE_DIR)
+            keep: Snapshots kept per stage, most recently used first
+        """
+        self.db = db_manager
+        self.cache_dir = Path(cache_dir or config.STAGE_CACHE_DIR)
+        self.keep = keep or config.STAGE_CACHE_KEEP
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(stage: str, config_keys: Iterable[str], upstream_keys: Sequence[str], extra: Any = None) -> str:
+        """Key for a stage given its declared config keys and upstream stage keys."""
+        inputs = {
+            "stage": stage,
+            "config": {name: getattr(config, name) for name in config_keys},
+            "upstream": list(upstream_keys),
+            "seed": config.RANDOM_SEED,
+            "code": code_fingerprint(),
+            "extra": extra,
+        }
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / f"{stage}-{key[:24]}.sqlite"
+
+    def restore(self, stage: str, key: str, tables: Sequence[str]) -> Any:
+        """
+        Copy a snapshot's rows into the (empty) stage tables.
+
+        Returns:
+            The stage's payload, or MISS when there is no snapshot for key
+        """
+        path = self._path(stage, key)
+        if not path.exists():
+            return self.MISS
+
+        self.db.commit()  # ATTACH isn't allowed inside a transaction
+        self.db.execute("ATTACH DATABASE ? AS snapshot", (str(path),))
+        try:
+            with self.db.transaction():
+                for table in tables:
+                    self.db.execute(f"INSERT INTO main.{table} SELECT * FROM snapshot.{table} ORDER BY rowid")
+            row = self.db.fetch_one("SELECT payload FROM snapshot._payload")
+        finally:
+            self.db.execute("DETACH DATABASE snapshot")
+
+        os.utime(path)  # most recently used survives pruning
+        logger.debug(f"Restored {stage} from {path.name}")
+        return json.loads(row[0]) if row and row[0] is not None else None
+
+    def save(self, stage: str, key: str, tables: Sequence[str], payload: Any = None):
+        """Snapshot the stage tables (written to a temp file, then renamed into place)."""
+        path = self._path(stage, key)
+        partial = path.with_suffix(".partial")
+        partial.unlink(missing_ok=True)
+
+        self.db.commit()
+        self.db.execute("ATTACH DATABASE ? AS snapshot", (str(partial),))
+        try:
+            with self.db.transaction():
+                for table in tables:
+                    self.db.execute(f"CREATE TABLE snapshot.{table} AS SELECT * FROM main.{table} ORDER BY rowid")
+                self.db.execute("CREATE TABLE snapshot._payload (payload TEXT)")
+                self.db.execute(
+                    "INSERT INTO snapshot._payload VALUES (?)",
+                    (json.dumps(payload) if payload is not None else None,)
+                )
+        finally:
+            self.db.execute("DETACH DATABASE snapshot")
+
+        os.replace(partial, path)
+        self._prune(stage)
+
+    def _prune(self, stage: str):
+        snapshots = sorted(self.cache_dir.glob(f"{stage}-*.sqlite"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in snapshots[self.keep:]:
+            stale.unlink(missing_ok=True)
+            logger.debug(f"Pruned stage snapshot {stale.name}")
+
+
+def get_stage_cache(db_manager) -> Optional[StageCache]:
+    """StageCache for db_manager, or None when STAGE_CACHE_ENABLED is off."""
+    if not config.STAGE_CACHE_ENABLED:
+        return None
+    return StageCache(db_manager)
@@ -0,0 +1,333 @@
+"""
+Offline text synthesizer for task names, descriptions and comments.
+
+A template grammar compiled once per process from the Asana task templates
+(asana_templates.TASK_TEMPLATES), YC feature names (yc_companies) and the
+prompt files' Format/Example lines. Patterns are parsed into literal/slot
+parts up front, so a batch of thousands of items costs a few NumPy draws
+and elementwise concatenation over object arrays, with no per-item prompt
+parsing.
+"""
+
+import re
+import string
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import BASE_DIR
+from src.scrappers.asana_templates import TASK_TEMPLATES
+from src.scrappers.yc_companies import get_company_names, get_feature_names
+
+# Prompt file -> team type whose task grammar it extends
+TASK_PROMPT_TEAMS = {
+    'tasks_engineering': 'product',
+    'tasks_marketing': 'marketing',
+    'tasks_operations': 'operations',
+}
+
+# Slots used by TASK_TEMPLATES patterns -> TASK_TEMPLATES vocabulary keys
+TEMPLATE_SLOTS = {
+    'component': 'components',
+    'action': 'actions',
+    'campaign': 'campaigns',
+    'deliverable': 'deliverables',
+    'process_name': 'processes',
+    'area': 'areas',
+}
+
+# Vocabulary for slots the templates reference but don't define
+SLOT_VOCABULARY = {
+    'detail': [
+        "token refresh logic", "pagination", "error handling", "retry logic", "rate limits",
+        "input validation", "empty states", "timezone handling", "bulk actions", "audit trail",
+        "permission checks", "webhook signatures", "query performance", "cache invalidation",
+        "CSV export", "feature flag", "loading states", "SSO login", "usage metering",
+        "background jobs", "connection pooling", "schema migration", "search ranking",
+    ],
+    'bug_description': [
+        "duplicate emails on signup", "timeout on large exports", "race condition in checkout",
+        "memory leak in image processing", "stale data after logout", "broken pagination on mobile",
+        "wrong currency in invoices", "session expires too early", "missing rows in CSV export",
+        "500 on empty search query", "webhook retries never stop", "dark mode contrast issues",
+    ],
+    'target': ["Postgres 16", "the new API gateway", "Kubernetes", "React 18", "Python 3.12", "the v2 schema"],
+    'content_type': ["blog post", "email", "case study", "webinar deck", "social thread", "newsletter", "one-pager"],
+    'channel': ["LinkedIn", "Twitter", "the blog", "email", "YouTube", "partner newsletter", "Product Hunt"],
+    'asset': ["banner", "landing page", "pitch deck", "product screenshots", "demo video", "ad creatives"],
+    'topic': [
+        "customer onboarding", "security best practices", "our Q3 roadmap", "AI workflows",
+        "cost optimization", "team productivity", "data governance",
+    ],
+    'date': ["Monday", "next week", "launch day", "end of month", "Q3 kickoff", "the webinar"],
+    'metric': ["CTR", "conversion", "MQL", "open rate", "pipeline", "CAC", "engagement"],
+    'document': ["onboarding", "expense policy", "incident runbook", "vendor", "security", "PTO policy"],
+    'request_type': ["access", "hardware", "refund", "vendor", "contract review", "software license"],
+    'issue_type': ["billing", "VPN", "payroll", "laptop", "SSO", "badge access"],
+    'feature': get_feature_names(),
+    'vendor': get_company_names(),
+    # Operations prompt format "[Process] - [Action]"
+    'process': [
+        "Vendor Onboarding", "Budget Review", "Access Audit", "Incident Response",
+        "Employee Offboarding", "Procurement", "Payroll", "Contract Renewal",
+    ],
+    'ops_action': [
+        "Review legal contract template", "Collect sign-offs", "Update tracking sheet",
+        "Schedule kickoff", "Reconcile invoices", "Archive records", "Send reminders",
+    ],
+}
+
+# Patterns added to each team's TASK_TEMPLATES patterns
+EXTRA_TASK_PATTERNS = {
+    'product': [
+        "Fix: {bug_description} in {component}",
+        "Spike: {detail} for {feature}",
+        "{feature}: {action} {detail}",
+    ],
+    'marketing': [
+        "Draft {content_type} on {topic}",
+        "[{campaign}] {content_type} for {channel}",
+        "Report on {metric} for {campaign}",
+        "Brief agency on {asset} for {campaign}",
+    ],
+    'operations': [
+        "{ops_action} for {process}",
+        "Renew {vendor} contract",
+        "Review {vendor} invoice with {area}",
+        "Update {document} policy for {area}",
+        "Resolve {issue_type} ticket from {area}",
+        "Schedule {process_name} with {area}",
+    ],
+}
+
+# Task names that read as whole phrases (kept from the original fallback lists)
+FIXED_TASK_NAMES = {
+    'product': [
+        "Implement user authentication flow", "Fix database connection pooling issue",
+        "Add unit tests for payment module", "Refactor API error handling",
+        "Optimize database queries for dashboard", "Implement webhook retry mechanism",
+        "Add monitoring alerts for critical paths", "Migrate legacy code to new framework",
+    ],
+    'marketing': [
+        "Create Q3 campaign assets", "Update landing page copy", "Analyze competitor pricing strategies",
+        "Plan webinar content and slides", "Update brand guidelines document",
+    ],
+    'operations': [
+        "Process monthly invoices", "Prepare quarterly report", "Coordinate team training session",
+        "Review and approve expenses", "Update internal wiki documentation",
+    ],
+}
+
+DESCRIPTION_CONTEXT = [
+    "Follow-up from the {feature} review.",
+    "Customers have asked for this in recent support tickets.",
+    "Needed before the {date} milestone.",
+    "Part of the ongoing {feature} work.",
+    "Raised during sprint planning.",
+    "Flagged in the last {topic} sync.",
+    "Blocking the {feature} rollout.",
+    "Small cleanup item we keep deferring.",
+]
+DESCRIPTION_CRITERIA = [
+    "Done when {detail} is covered by tests.",
+    "Acceptance: changes are reviewed and deployed to staging.",
+    "Done when the {document} docs are updated.",
+    "Acceptance: no regressions in {metric} reporting.",
+    "Done when QA signs off on {detail}.",
+    "Acceptance: stakeholders approve the final version.",
+]
+DESCRIPTION_NOTES = [
+    "See the spec in the project brief.",
+    "Coordinate with the {area} team before starting.",
+    "Dependency on the API team; check status first.",
+    "Reach out if anything is unclear.",
+    "Keep the scope small; follow-ups go in a separate task.",
+]
+DESCRIPTION_BULLETS = [
+    "Review the existing implementation", "Cover edge cases around {detail}",
+    "Add unit test coverage", "Update documentation", "Get sign-off from {area}",
+    "Check impact on {feature}", "Share a summary in the channel",
+]
+
+COMMENT_OPEN = [
+    "Started working on this.", "Picked this up today.", "Made good progress on {detail}.",
+    "Blocked on an external dependency, following up.", "Found some edge cases around {detail} that need discussion.",
+    "Pushed initial changes, will continue tomorrow.", "Need clarification on the requirements.",
+    "Had to refactor some of the {feature} code first.", "This is taking longer than expected.",
+    "@team please review when you get a chance.", "Updated the approach based on feedback.",
+    "Should be done by {date}.", "Sync with {area} scheduled for {date}.",
+]
+COMMENT_FOLLOW_UP = [
+    "Will update here by {date}.", "Looping in {area} for visibility.", "Notes are in the {document} doc.",
+    "Might affect {feature}, keeping an eye on it.", "ETA {date}.", "Let me know if {detail} needs more work.",
+]
+COMMENT_DONE = [
+    "Done! Moving to the next task.", "Completed and deployed to staging.", "All tests passing now.",
+    "Fixed the issues from review.", "Shipped, closing this out.", "Wrapped up; notes are in the doc.",
+    "Merged. Thanks for the quick review!",
+]
+
+# Share of descriptions that are empty / short (1-3 sentences) / detailed with bullets
+DESCRIPTION_SHAPES = (0.2, 0.5, 0.3)
+
+_FORMAT_RE = re.compile(r"^Format:\s*(.+)$", re.MULTILINE)
+_EXAMPLE_RE = re.compile(r"^Example:\s*(.+)$", re.MULTILINE)
+_SEGMENT_RE = re.compile(r"\s+-\s+")
+
+
+class _Pattern:
+    """A template string parsed once into (literal, slot) parts."""
+
+    def __init__(self, text: str):
+        self.text = text
+        self.parts = [(literal, field) for literal, field, _, _ in string.Formatter().parse(text)]
+
+    def fill(self, rng: np.random.Generator, n: int, vocab: Dict[str, np.ndarray]) -> np.ndarray:
+        out = np.full(n, "", dtype=object)
+        for literal, field in self.parts:
+            if literal:
+                out = out + literal
+            if field:
+                words = vocab[field]
+                out = out + words[rng.integers(0, len(words), n)]
+        return out
+
+
+class Grammar:
+    """Uniform choice among patterns, each filled from the shared vocabulary."""
+
+    def __init__(self, patterns: Sequence[str], vocab: Dict[str, np.ndarray]):
+        self.patterns = [_Pattern(p) for p in patterns]
+        missing = {f for p in self.patterns for _, f in p.parts if f and f not in vocab}
+        if missing:
+            raise KeyError(f"No vocabulary for slots: {sorted(missing)}")
+        self.vocab = vocab
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        choice = rng.integers(0, len(self.patterns), n)
+        out = np.empty(n, dtype=object)
+        for i, pattern in enumerate(self.patterns):
+            mask = choice == i
+            count = int(mask.sum())
+            if count:
+                out[mask] = pattern.fill(rng, count, self.vocab)
+        return out
+
+
+def _prompt_grammar(path: Path, vocab: Dict[str, List[str]]) -> List[str]:
+    """
+    Extra name patterns from a task prompt file.
+
+    The Format line ("[Component] - [Action] - [Detail]") becomes a
+    "[{component}] {action} {detail}" pattern; an Example line with the same
+    number of segments adds its segments to those slots' vocabularies.
+    """
+    if not path.exists():
+        return []
+    text = path.read_text()
+    format_match = _FORMAT_RE.search(text)
+    if not format_match:
+        return []
+
+    slots = [s.strip(" []").lower().replace(" ", "_") for s in _SEGMENT_RE.split(format_match.group(1))]
+    # The operations format reuses "action" for whole phrases; keep them apart
+    slots = ['ops_action' if s == 'action' and 'process' in slots else s for s in slots]
+    if not all(slot in vocab for slot in slots):
+        return []
+
+    example = _EXAMPLE_RE.search(text)
+    if example:
+        segments = _SEGMENT_RE.split(example.group(1).strip())
+        if len(segments) == len(slots):
+            for slot, segment in zip(slots, segments):
+                if segment not in vocab[slot]:
+                    vocab[slot].append(segment)
+
+    return [f"[{{{slots[0]}}}] " + " ".join(f"{{{slot}}}" for slot in slots[1:])]
+
+
+class TextSynthesizer:
+    """Batch generator for task names, descriptions and comments."""
+
+    def __init__(self, prompts_dir: Path = None):
+        prompts_dir = Path(prompts_dir or BASE_DIR / "prompts")
+
+        words: Dict[str, List[str]] = {slot: list(values) for slot, values in SLOT_VOCABULARY.items()}
+        for templates in TASK_TEMPLATES.values():
+            for slot, key in TEMPLATE_SLOTS.items():
+                words.setdefault(slot, [])
+                words[slot].extend(v for v in templates.get(key, []) if v not in words[slot])
+
+        patterns = {
+            team: list(templates['patterns']) + EXTRA_TASK_PATTERNS.get(team, [])
+            for team, templates in TASK_TEMPLATES.items()
+        }
+        for prompt_name, team in TASK_PROMPT_TEAMS.items():
+            patterns[team].extend(_prompt_grammar(prompts_dir / f"{prompt_name}.txt", words))
+
+        self.vocab = {slot: np.array(values, dtype=object) for slot, values in words.items()}
+        self.task_grammars = {team: Grammar(p, self.vocab) for team, p in patterns.items()}
+        self.fixed_names = {team: np.array(names, dtype=object) for team, names in FIXED_TASK_NAMES.items()}
+
+        self.context = Grammar(DESCRIPTION_CONTEXT, self.vocab)
+        self.criteria = Grammar(DESCRIPTION_CRITERIA, self.vocab)
+        self.notes = Grammar(DESCRIPTION_NOTES, self.vocab)
+        self.bullets = Grammar(DESCRIPTION_BULLETS, self.vocab)
+        self.comment_open = Grammar(COMMENT_OPEN, self.vocab)
+        self.comment_follow_up = Grammar(COMMENT_FOLLOW_UP, self.vocab)
+        self.comment_done = Grammar(COMMENT_DONE, self.vocab)
+
+    def task_names(self, rng: np.random.Generator, n: int, team_type: str = 'product') -> List[str]:
+        """n task names in the style of the team's templates."""
+        grammar = self.task_grammars.get(team_type, self.task_grammars['product'])
+        names = grammar.sample(rng, n)
+        fixed = self.fixed_names.get(team_type, self.fixed_names['product'])
+        use_fixed = rng.random(n) < 0.1
+        names[use_fixed] = fixed[rng.integers(0, len(fixed), int(use_fixed.sum()))]
+        return names.tolist()
+
+    def descriptions(self, rng: np.random.Generator, n: int) -> List[str]:
+        """
+        n descriptions: DESCRIPTION_SHAPES split between empty, 1-3 sentence
+        and detailed (context, criteria bullets and a note) descriptions.
+        """
+        shape = rng.choice(3, size=n, p=DESCRIPTION_SHAPES)
+        sentences = rng.integers(1, 4, n)
+
+        out = np.full(n, "", dtype=object)
+        short = shape == 1
+        out[short] = self.context.sample(rng, int(short.sum()))
+        for extra, grammar in ((2, self.criteria), (3, self.notes)):
+            mask = short & (sentences >= extra)
+            out[mask] = out[mask] + " " + grammar.sample(rng, int(mask.sum()))
+
+        detailed = shape == 2
+        k = int(detailed.sum())
+        out[detailed] = (
+            self.context.sample(rng, k) + "\n\nAcceptance criteria:\n- "
+            + self.bullets.sample(rng, k) + "\n- " + self.bullets.sample(rng, k)
+            + "\n\n" + self.notes.sample(rng, k)
+        )
+        return out.tolist()
+
+    def comments(self, rng: np.random.Generator, n: int, completed: Optional[np.ndarray] = None) -> List[str]:
+        """n comments; completed tasks (if given) mostly get wrap-up comments."""
+        out = self.comment_open.sample(rng, n)
+        follow_up = rng.random(n) < 0.4
+        out[follow_up] = out[follow_up] + " " + self.comment_follow_up.sample(rng, int(follow_up.sum()))
+        if completed is not None:
+            done = np.asarray(completed, dtype=bool) & (rng.random(n) < 0.7)
+            out[done] = self.comment_done.sample(rng, int(done.sum()))
+        return out.tolist()
+
+
+# Per-process singleton; compiling the grammar is the only setup cost
+_synthesizer = None
+
+
+def get_text_synthesizer() -> TextSynthesizer:
+    global _synthesizer
+    if _synthesizer is None:
+        _synthesizer = TextSynthesizer()
+    return _synthesizer
@@ -1,18 +1,131 @@
 """
 Data validation utilities for ensuring data consistency.
+
+Integrity checks are declared per table in INTEGRITY_CHECKS and fused
+into one aggregated scan per table: every check becomes a COUNT and a
+sample-ID column of the same SELECT, and referenced rows are looked up
+through primary-key LEFT JOINs. Up to SAMPLE_IDS offending IDs are
+fetched only for checks that fail.
 """
 
 import logging
 from typing import Dict, List, Any
 from datetime import datetime
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# Offending IDs reported per failed check
+SAMPLE_IDS = 5
+
+# table -> id column, LEFT JOINs (alias -> (table, key, row column)) and
+# checks (name -> (SQL condition that marks a bad row, description));
+# the checked table is aliased r
+INTEGRITY_CHECKS = {
+    "tasks": {
+        "id": "task_id",
+        "joins": {
+            "p": ("projects", "project_id", "project_id"),
+            "s": ("sections", "section_id", "section_id"),
+            "u": ("users", "user_id", "assignee_id"),
+        },
+        "checks": {
+            "completed_before_created": (
+                "r.completed_at < r.created_at", "with completed_at before created_at"),
+            "completed_at_when_open": (
+                "r.completed = 0 AND r.completed_at IS NOT NULL", "incomplete but with completed_at set"),
+            "completed_without_timestamp": (
+                "r.completed = 1 AND r.completed_at IS NULL", "completed but without completed_at"),
+            "due_before_created": (
+                "r.due_date < date(r.created_at)", "due before the day they were created"),
+            "created_before_project": (
+                "r.created_at < p.created_at", "created before their project"),
+            "invalid_project": (
+                "p.project_id IS NULL", "with invalid project_id"),
+            "invalid_section": (
+                "r.section_id IS NOT NULL AND s.section_id IS NULL", "with invalid section_id"),
+            "section_other_project": (
+                "s.project_id != r.project_id", "in sections from different projects"),
+            "invalid_assignee": (
+                "r.assignee_id IS NOT NULL AND u.user_id IS NULL", "with invalid assignee_id"),
+        },
+    },
+    "subtasks": {
+        "id": "subtask_id",
+        "joins": {
+            "t": ("tasks", "task_id", "parent_task_id"),
+            "u": ("users", "user_id", "assignee_id"),
+        },
+        "checks": {
+            "completed_before_created": (
+                "r.completed_at < r.created_at", "with completed_at before created_at"),
+            "completed_at_when_open": (
+                "r.completed = 0 AND r.completed_at IS NOT NULL", "incomplete but with completed_at set"),
+            "created_before_parent": (
+                "r.created_at < t.created_at", "created before their parent task"),
+            "completed_after_parent": (
+                "t.completed = 1 AND r.completed_at > t.completed_at", "completed after their parent task"),
+            "invalid_parent": (
+                "t.task_id IS NULL", "with invalid parent_task_id"),
+            "invalid_assignee": (
+                "r.assignee_id IS NOT NULL AND u.user_id IS NULL", "with invalid assignee_id"),
+        },
+    },
+    "comments": {
+        "id": "comment_id",
+        "joins": {
+            "t": ("tasks", "task_id", "task_id"),
+            "u": ("users", "user_id", "author_id"),
+        },
+        "checks": {
+            "before_task_created": (
+                "r.created_at < t.created_at", "posted before their task was created"),
+            "after_task_completed": (
+                "t.completed = 1 AND r.created_at > t.completed_at", "posted after their task was completed"),
+            "invalid_task": (
+                "t.task_id IS NULL", "with invalid task_id"),
+            "invalid_author": (
+                "u.user_id IS NULL", "with invalid author_id"),
+        },
+    },
+    "custom_field_values": {
+        "id": "value_id",
+        "joins": {
+            "t": ("tasks", "task_id", "task_id"),
+            "f": ("custom_field_definitions", "field_id", "field_id"),
+        },
+        "checks": {
+            "invalid_task": (
+                "t.task_id IS NULL", "with invalid task_id"),
+            "invalid_field": (
+                "f.field_id IS NULL", "with invalid field_id"),
+            "field_other_project": (
+                "f.project_id != t.project_id", "for fields of a different project than their task"),
+        },
+    },
+    "task_tags": {
+        "id": "task_tag_id",
+        "joins": {
+            "t": ("tasks", "task_id", "task_id"),
+            "g": ("tags", "tag_id", "tag_id"),
+        },
+        "checks": {
+            "invalid_task": (
+                "t.task_id IS NULL", "with invalid task_id"),
+            "invalid_tag": (
+                "g.tag_id IS NULL", "with invalid tag_id"),
+        },
+    },
+}
+
 
 def validate_database(db_manager) -> Dict[str, int]:
     """
     Validate database integrity and return record counts.
     
+    Counts come from the generation stats when the database has them.
+    
     Args:
         db_manager: DatabaseManager instance
         
@@ -40,73 +153,120 @@ def validate_database(db_manager) -> Dict[str, int]:
     counts = {}
     for table in tables:
         try:
-            count = db_manager.get_count(table)
+            count = db_manager.row_count(table)
             counts[table] = count
         except Exception as e:
             logger.warning(f"Error counting {table}: {e}")
             counts[table] = 0
     
     # Run integrity checks
-    _check_temporal_consistency(db_manager)
-    _check_referential_integrity(db_manager)
+    for table, result in check_integrity(db_manager).items():
+        for name, failure in result["failures"].items():
+            description = INTEGRITY_CHECKS[table]["checks"][name][1]
+            logger.warning(
+                f"Found {failure['count']} {table} {description} "
+                f"(e.g. {', '.join(map(str, failure['samples']))})"
+            )
     
     return counts
 
 
-def _check_temporal_consistency(db_manager):
-    """Check that temporal relationships are valid."""
-    # Tasks: completed_at must be after created_at
-    db_manager.execute("""
-        SELECT COUNT(*) FROM tasks 
-        WHERE completed_at IS NOT NULL 
-        AND completed_at < created_at
-    """)
-    invalid_count = db_manager.fetchone()[0]
-    if invalid_count > 0:
-        logger.warning(f"Found {invalid_count} tasks with completed_at before created_at")
-    
-    # Tasks: completed_at should only exist if completed = 1
-    db_manager.execute("""
-        SELECT COUNT(*) FROM tasks 
-        WHERE completed = 0 
-        AND completed_at IS NOT NULL
-    """)
-    invalid_count = db_manager.fetchone()[0]
-    if invalid_count > 0:
-        logger.warning(f"Found {invalid_count} incomplete tasks with completed_at set")
-
-
-def _check_referential_integrity(db_manager):
-    """Check that foreign key relationships are valid."""
-    # Tasks must reference valid projects
-    db_manager.execute("""
-        SELECT COUNT(*) FROM tasks t
-        LEFT JOIN projects p ON t.project_id = p.project_id
-        WHERE t.project_id IS NOT NULL AND p.project_id IS NULL
-    """)
-    invalid_count = db_manager.fetchone()[0]
-    if invalid_count > 0:
-        logger.warning(f"Found {invalid_count} tasks with invalid project_id")
-    
-    # Tasks must reference valid sections (if set)
-    db_manager.execute("""
-        SELECT COUNT(*) FROM tasks t
-        LEFT JOIN sections s ON t.section_id = s.section_id
-        WHERE t.section_id IS NOT NULL AND s.section_id IS NULL
-    """)
-    invalid_count = db_manager.fetchone()[0]
-    if invalid_count > 0:
-        logger.warning(f"Found {invalid_count} tasks with invalid section_id")
-    
-    # Task sections must belong to same project
-    db_manager.execute("""
-        SELECT COUNT(*) FROM tasks t
-        JOIN sections s ON t.section_id = s.section_id
-        WHERE t.project_id != s.project_id
-    """)
-    invalid_count = db_manager.fetchone()[0]
-    if invalid_count > 0:
-        logger.warning(f"Found {invalid_count} tasks in sections from different projects")
+def _from_clause(table: str, spec: Dict[str, Any]) -> str:
+    joins = "".join(
+        f" LEFT JOIN {joined} {alias} ON {alias}.{key} = r.{column}"
+        for alias, (joined, key, column) in spec["joins"].items()
+    )
+    return f"FROM {table} r{joins}"
+
+
+def _check_query(table: str, spec: Dict[str, Any]) -> str:
+    """One aggregated SELECT evaluating every check of a table."""
+    columns = ["COUNT(*)"]
+    for condition, _ in spec["checks"].values():
+        columns.append(f"COUNT(CASE WHEN {condition} THEN 1 END)")
+        columns.append(f"MIN(CASE WHEN {condition} THEN r.{spec['id']} END)")
+    return f"SELECT {', '.join(columns)} {_from_clause(table, spec)}"
+
+
+def check_integrity(db_manager, tables=None) -> Dict[str, Dict[str, Any]]:
+    """
+    Run INTEGRITY_CHECKS with one scan per table.
+    
+    Args:
+        db_manager: DatabaseManager instance
+        tables: Tables to check (default all in INTEGRITY_CHECKS)
+        
+    Returns:
+        {table: {'rows': n, 'failures': {check: {'count': n, 'samples': [ids]}}}};
+        passing checks are omitted from 'failures'
+    """
+    results = {}
+    for table in tables or INTEGRITY_CHECKS:
+        spec = INTEGRITY_CHECKS[table]
+        row = db_manager.fetch_one(_check_query(table, spec))
+        failures = {}
+        for i, (name, (condition, _)) in enumerate(spec["checks"].items()):
+            count, first = row[1 + 2 * i], row[2 + 2 * i]
+            if not count:
+                continue
+            samples = [first]
+            if count > 1:
+                samples = [r[0] for r in db_manager.fetch_all(
+                    f"SELECT r.{spec['id']} {_from_clause(table, spec)} "
+                    f"WHERE {condition} ORDER BY r.{spec['id']} LIMIT {SAMPLE_IDS}"
+                )]
+            failures[name] = {"count": count, "samples": samples}
+        results[table] = {"rows": row[0], "failures": failures}
+    return results
+
+
+def validate_tasks(batch) -> Dict[str, Dict[str, Any]]:
+    """
+    Row checks of validate_task over a columnar TaskBatch, with no per-row parsing.
+    
+    Dates are compared as datetime64 arrays; checks whose columns the batch
+    lacks (e.g. 'name' before text is filled in) are skipped.
+    
+    Returns:
+        {check: {'count': n, 'rows': indices, 'samples': [task_ids]}} for
+        failing checks only (empty if the batch is valid)
+    """
+    n = len(batch)
+    checks = {}
+    
+    def missing(name):
+        values = batch[name]
+        if values.dtype == object:
+            return np.fromiter((not value for value in values.tolist()), dtype=bool, count=n)
+        return np.zeros(n, dtype=bool)
+    
+    if "task_id" in batch:
+        checks["task_id_required"] = missing("task_id")
+    if "name" in batch:
+        checks["name_required"] = missing("name")
+    
+    if "completed_at" in batch:
+        completed_at = batch["completed_at"]
+        has_completed_at = ~np.isnat(completed_at)
+        if "created_at" in batch:
+            checks["completed_before_created"] = has_completed_at & (completed_at < batch["created_at"])
+        if "completed" in batch:
+            completed = batch["completed"].astype(bool)
+            checks["completed_without_timestamp"] = completed & ~has_completed_at
+            checks["completed_at_when_open"] = ~completed & has_completed_at
+    
+    if "due_date" in batch and "created_at" in batch:
+        due = batch["due_date"]
+        checks["due_before_created"] = ~np.isnat(due) & (due < batch["created_at"].astype("datetime64[D]"))
+    
+    failures = {}
+    task_ids = batch["task_id"] if "task_id" in batch else None
+    for name, bad in checks.items():
+        rows = np.flatnonzero(bad)
+        if len(rows):
+            samples = task_ids[rows[:SAMPLE_IDS]].tolist() if task_ids is not None else []
+            failures[name] = {"count": len(rows), "rows": rows, "samples": samples}
+    return failures
 
 
 def validate_task(task: Dict[str, Any]) -> List[str]:
@@ -0,0 +1,6 @@
+import sys
+from pathlib import Path
+
+# Tests import config and src.* from the project root, as main.py does
+project_root = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(project_root))
@@ -0,0 +1,126 @@
+import pytest
+
+import config
+from src.utils.llm_utils import LLMClient, parse_list_items
+
+
+# ----------------------
+# parse_list_items
+# ----------------------
+
+def test_numbered_list():
+    text = "1. Write the spec\n2) Review the draft\nTask 3: Ship it"
+    assert parse_list_items(text) == ["Write the spec", "Review the draft", "Ship it"]
+
+
+def test_bulleted_list():
+    text = "- Write the spec\n* Review the draft\n• Ship it"
+    assert parse_list_items(text) == ["Write the spec", "Review the draft", "Ship it"]
+
+
+def test_plain_lines_drop_colon_preamble():
+    text = "Here are 2 tasks:\nWrite the spec\nReview the draft"
+    assert parse_list_items(text) == ["Write the spec", "Review the draft"]
+
+
+def test_component_action_detail_format():
+    text = "[Auth] - [Implement] - [JWT Token Refresh Logic]\nBilling - Fix - Invoice rounding"
+    assert parse_list_items(text) == [
+        "[Auth] Implement JWT Token Refresh Logic",
+        "[Billing] Fix Invoice rounding",
+    ]
+
+
+def test_numbered_component_format():
+    assert parse_list_items("1. Search - Add - Fuzzy matching") == ["[Search] Add Fuzzy matching"]
+
+
+@pytest.mark.parametrize("text", [
+    "Sure! Here are the tasks you asked for\n1. Write the spec\n2. Review the draft",
+    "Here are 2 tasks:\n- Write the spec\n- Review the draft",
+    "1. Write the spec\n2. Review the draft\n\nLet me know if you need more!",
+    "- Write the spec\n- Review the draft\nHope this helps",
+])
+def test_preamble_and_chatter_dropped(text):
+    assert parse_list_items(text) == ["Write the spec", "Review the draft"]
+
+
+def test_continuation_lines():
+    text = (
+        "1. Write the spec\n"
+        "   Cover the error cases too.\n"
+        "- Link the design doc\n"
+        "2. Review the draft"
+    )
+    assert parse_list_items(text) == [
+        "Write the spec\nCover the error cases too.\n- Link the design doc",
+        "Review the draft",
+    ]
+
+
+def test_empty_response():
+    assert parse_list_items("") == []
+    assert parse_list_items("\n  \n") == []
+
+
+# ----------------------
+# LLMClient.generate_items
+# ----------------------
+
+@pytest.fixture
+def client(monkeypatch):
+    """Offline LLMClient whose requests are answered by `client.responses`."""
+    monkeypatch.setattr(config, "ENABLE_LLM", False)
+    monkeypatch.setattr(config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(config, "LLM_ITEMS_PER_REQUEST", 3)
+    monkeypatch.setattr(config, "MAX_RETRIES", 2)
+
+    client = LLMClient()
+    client.requests = []
+    client.responses = {}
+
+    def request_many(prompts, max_tokens=None, temperature=None):
+        client.requests.append((prompts, max_tokens))
+        return [client.responses.get(prompt) for prompt in prompts]
+
+    monkeypatch.setattr(client, "_request_many", request_many)
+    monkeypatch.setattr(client, "_fallback_generate", lambda prompt: f"fallback for {prompt}")
+    return client
+
+
+def render(offset, n):
+    return f"items {offset}+{n}"
+
+
+def test_generate_items_chunks_requests(client):
+    client.responses = {
+        "items 0+3": "1. a\n2. b\n3. c",
+        "items 3+2": "1. d\n2. e",
+    }
+    assert client.generate_items(render, 5, max_tokens=10) == ["a", "b", "c", "d", "e"]
+    assert client.requests == [(["items 0+3", "items 3+2"], 30)]
+
+
+def test_generate_items_rerequests_missing_items(client):
+    client.responses = {
+        "items 0+3": "1. a",
+        "items 3+2": "1. d\n2. e\n3. extra",
+        "items 1+2": "1. b\n2. c",
+    }
+    assert client.generate_items(render, 5, max_tokens=10) == ["a", "b", "c", "d", "e"]
+    # Only the short chunk is re-requested, for its two missing items
+    assert client.requests == [(["items 0+3", "items 3+2"], 30), (["items 1+2"], 20)]
+
+
+def test_generate_items_failed_request_not_resent(client):
+    client.responses = {"items 3+2": "1. d\n2. e"}
+    items = client.generate_items(render, 5, max_tokens=10)
+    assert items == ["fallback for items 0+1", "fallback for items 1+1", "fallback for items 2+1", "d", "e"]
+    assert len(client.requests) == 1
+
+
+def test_generate_items_gives_up_after_max_retries(client):
+    client.responses = {"items 0+2": ""}
+    items = client.generate_items(render, 2, max_tokens=10)
+    assert items == ["fallback for items 0+1", "fallback for items 1+1"]
+    assert len(client.requests) == config.MAX_RETRIES + 1
@@ -0,0 +1,10 @@
+import config
+from src.utils.import_profile import startup_ms
+
+
+def test_startup_within_budget():
+    startup = startup_ms()
+    assert startup <= config.STARTUP_BUDGET_MS, (
+        f"import src.main took {startup:.1f} ms (budget {config.STARTUP_BUDGET_MS:.0f} ms); "
+        f"see main.py --import-profile"
+    )
@@ -0,0 +1,135 @@
+import pytest
+
+import config
+from src.models.batch import TaskBatch
+from src.utils.db_utils import DatabaseManager
+from src.utils.stream_validation import (
+    BloomFilter, ExactKeySet, StreamValidationError, StreamValidator,
+)
+
+TASK_IDS = [f"task-{i}" for i in range(2000)]
+UNKNOWN_IDS = [f"missing-{i}" for i in range(500)]
+COMMENT_COLUMNS = ("comment_id", "task_id", "author_id")
+
+
+@pytest.fixture
+def db(tmp_path):
+    """Database holding the keys validated batches refer to."""
+    db = DatabaseManager(str(tmp_path / "keys.sqlite"))
+    db.execute_script("""
+        CREATE TABLE users (user_id TEXT PRIMARY KEY);
+        CREATE TABLE projects (project_id TEXT PRIMARY KEY);
+        CREATE TABLE sections (section_id TEXT PRIMARY KEY, project_id TEXT);
+        CREATE TABLE tasks (task_id TEXT PRIMARY KEY);
+    """)
+    db.insert_many("users", ("user_id",), [(f"user-{i}",) for i in range(10)])
+    db.insert_many("projects", ("project_id",), [("project-0",), ("project-1",)])
+    db.insert_many("sections", ("section_id", "project_id"), [("section-0", "project-0"), ("section-1", "project-1")])
+    db.insert_many("tasks", ("task_id",), [(task_id,) for task_id in TASK_IDS])
+    yield db
+    db.close()
+
+
+def validator(db, monkeypatch, bloom, mode="repair"):
+    """StreamValidator holding tasks as a Bloom filter or an exact set."""
+    monkeypatch.setattr(config, "STREAM_VALIDATION_EXACT_LIMIT", 0 if bloom else 10**9)
+    monkeypatch.setattr(config, "STREAM_VALIDATION_BLOOM_ERROR", 1e-6)
+    return StreamValidator(db, mode=mode)
+
+
+# ----------------------
+# Key sets
+# ----------------------
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(len(TASK_IDS), 0.01)
+    bloom.add(TASK_IDS[:1000])
+    bloom.add(TASK_IDS[1000:])
+    assert bloom.contains(TASK_IDS).all()
+
+
+def test_bloom_filter_false_positive_rate():
+    bloom = BloomFilter(len(TASK_IDS), 0.01)
+    bloom.add(TASK_IDS)
+    others = [f"other-{i}" for i in range(20000)]
+    assert bloom.contains(others).mean() < 0.03
+
+
+def test_exact_and_bloom_key_sets_agree(db, monkeypatch):
+    keys = TASK_IDS + UNKNOWN_IDS
+    exact = validator(db, monkeypatch, bloom=False)
+    exact_found = exact._contains("tasks", keys)
+    bloom = validator(db, monkeypatch, bloom=True)
+    bloom_found = bloom._contains("tasks", keys)
+
+    assert isinstance(exact.key_sets["tasks"], ExactKeySet)
+    assert isinstance(bloom.key_sets["tasks"], BloomFilter)
+    assert exact_found.tolist() == [True] * len(TASK_IDS) + [False] * len(UNKNOWN_IDS)
+    assert bloom_found.tolist() == exact_found.tolist()
+
+
+def test_registered_keys_are_found(db, monkeypatch):
+    for bloom in (False, True):
+        checker = validator(db, monkeypatch, bloom=bloom)
+        checker._key_set("tasks")
+        checker.register("tasks", ["task-new"])
+        assert checker._contains("tasks", ["task-new"]).all()
+
+
+def test_lookup_without_preload(db):
+    checker = StreamValidator(db, mode="repair", preload=False)
+    found = checker._contains("tasks", ["task-5", "missing-0", "task-1999"])
+    assert found.tolist() == [True, False, True]
+    assert "task-5" in checker.key_sets["tasks"].keys
+
+
+# ----------------------
+# Repair and fail modes
+# ----------------------
+
+@pytest.mark.parametrize("bloom", [False, True])
+def test_repair_drops_exactly_the_bad_rows(db, monkeypatch, bloom):
+    rows = [
+        ("comment-0", "task-0", "user-0"),
+        ("comment-1", "missing-0", "user-1"),   # unknown task
+        ("comment-2", "task-2", "user-99"),     # unknown author
+        ("comment-3", None, "user-3"),          # required task missing
+        ("comment-4", "task-1999", "user-9"),
+    ]
+    checker = validator(db, monkeypatch, bloom=bloom)
+    kept = checker.check("comments", COMMENT_COLUMNS, rows)
+
+    assert kept == [rows[0], rows[4]]
+    assert checker.repairs == {"comments.invalid_task": 2, "comments.invalid_author": 1}
+
+
+def test_repair_clears_nullable_keys_and_drops_required(db, monkeypatch):
+    batch = TaskBatch.from_columns(
+        task_id=["task-a", "task-b", "task-c", "task-d", ""],
+        name=["A", "B", "C", "D", "E"],
+        project_id=["project-0", "project-9", "project-0", "project-1", "project-0"],
+        section_id=["section-0", "section-0", "section-9", "section-0", "section-0"],
+        assignee_id=["user-0", "user-1", "user-99", None, "user-2"],
+    )
+    checker = validator(db, monkeypatch, bloom=False)
+    repaired = checker.check("tasks", list(batch.columns), batch)
+
+    # task-b has no such project and the last row no ID: both dropped
+    assert repaired["task_id"].tolist() == ["task-a", "task-c", "task-d"]
+    # task-c's unknown section and assignee are cleared; task-d's section
+    # belongs to another project
+    assert repaired["section_id"].tolist() == ["section-0", None, None]
+    assert repaired["assignee_id"].tolist() == ["user-0", None, None]
+
+
+def test_valid_batch_passes_unchanged(db, monkeypatch):
+    rows = [("comment-0", "task-0", "user-0"), ("comment-1", "task-1", "user-1")]
+    checker = validator(db, monkeypatch, bloom=True, mode="fail")
+    assert checker.check("comments", COMMENT_COLUMNS, rows) == rows
+    assert checker.summary() is None
+
+
+def test_fail_mode_raises(db, monkeypatch):
+    checker = validator(db, monkeypatch, bloom=False, mode="fail")
+    with pytest.raises(StreamValidationError, match="invalid_task"):
+        checker.check("comments", COMMENT_COLUMNS, [("comment-0", "missing-0", "user-0")])